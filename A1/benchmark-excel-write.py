@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+import excel_writer
+
+# ----------------------------------------
+# EXCEL WRITE BENCHMARK
+# ----------------------------------------
+#
+#   python benchmark-excel-write.py [rows]
+#
+# Runs every installed backend on the same synthetic two-column table. The
+# per-cell baselines (the old write pattern) are timed on a slice and
+# extrapolated to the full row count, since per-cell COM takes minutes.
+
+PER_CELL_SAMPLE_ROWS = 2000
+
+
+def make_rows(rows, seed=42):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        ("".join(rng.choices(letters, k=rng.randint(5, 18))).title(),
+         "".join(rng.choices(letters, k=rng.randint(4, 14))).title())
+        for _ in range(rows)
+    ]
+
+
+def bench_writer(backend, rows, path):
+    start = time.perf_counter()
+    with excel_writer.open_writer(backend, visible=False) as writer:
+        writer.write_table(["State", "Capital"], rows)
+        writer.save(path)
+    return time.perf_counter() - start
+
+
+def bench_com_per_cell(rows, path):
+    excel = excel_writer.win32.Dispatch("Excel.Application")
+    excel.Visible = False
+    excel.DisplayAlerts = False
+    workbook = excel.Workbooks.Add()
+    sheet = workbook.ActiveSheet
+
+    start = time.perf_counter()
+    sheet.Cells(1, 1).Value = "State"
+    sheet.Cells(1, 2).Value = "Capital"
+    for row, (state, capital) in enumerate(rows, start=2):
+        sheet.Cells(row, 1).Value = state
+        sheet.Cells(row, 2).Value = capital
+    workbook.SaveAs(path)
+    elapsed = time.perf_counter() - start
+
+    workbook.Close(SaveChanges=False)
+    excel.Quit()
+    return elapsed
+
+
+def bench_openpyxl_per_cell(rows, path):
+    from openpyxl import Workbook
+
+    start = time.perf_counter()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.cell(1, 1).value = "State"
+    sheet.cell(1, 2).value = "Capital"
+    for row, (state, capital) in enumerate(rows, start=2):
+        sheet.cell(row, 1).value = state
+        sheet.cell(row, 2).value = capital
+    workbook.save(path)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(total)
+    backends = excel_writer.available_backends()
+    if not backends:
+        print("No Excel backend installed (need pywin32 or openpyxl)")
+        sys.exit(1)
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for backend in backends:
+            path = os.path.join(folder, f"{backend}.xlsx")
+            results.append((f"{backend} (bulk)", bench_writer(backend, rows, path), total))
+
+        sample = rows[:min(total, PER_CELL_SAMPLE_ROWS)]
+        if "com" in backends:
+            elapsed = bench_com_per_cell(sample, os.path.join(folder, "com-cells.xlsx"))
+            results.append(("com (per cell)", elapsed * total / len(sample), len(sample)))
+        if "openpyxl" in backends:
+            elapsed = bench_openpyxl_per_cell(rows, os.path.join(folder, "openpyxl-cells.xlsx"))
+            results.append(("openpyxl (per cell)", elapsed, total))
+
+    print(f"Writing {total:,} rows x 2 columns\n")
+    print(f"{'backend':<24}{'seconds':>10}{'rows/s':>12}  note")
+    for label, elapsed, measured in results:
+        note = "" if measured == total else f"extrapolated from {measured:,} rows"
+        print(f"{label:<24}{elapsed:>10.2f}{total / elapsed:>12,.0f}  {note}")
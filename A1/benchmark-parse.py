@@ -0,0 +1,75 @@
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import wiki_cache
+
+# ----------------------------------------
+# PARSE BENCHMARK FOR THE STATES/CAPITALS PAGE
+# ----------------------------------------
+#
+# Save a copy of the article first, e.g.
+#   curl -A "Mozilla/5.0" -o capitals.html \
+#     https://en.wikipedia.org/wiki/List_of_state_and_union_territory_capitals_in_India
+#   python benchmark-parse.py capitals.html
+
+
+def rows_from_table(table):
+    data = []
+    for row in table.find_all("tr")[1:]:
+        cols = row.find_all("td")
+        if len(cols) < 2:
+            continue
+        data.append((cols[0].get_text(strip=True), cols[1].get_text(strip=True).split("[")[0]))
+    return data
+
+
+def full_soup(html):
+    """The original approach: build the whole document, then find the table"""
+    return rows_from_table(BeautifulSoup(html, "html.parser").find("table", class_="wikitable"))
+
+
+def first_table(parser):
+    def parse(html):
+        table_html = wiki_cache.extract_first_table_html(html, "wikitable")
+        return rows_from_table(BeautifulSoup(table_html, parser).find("table"))
+    return parse
+
+
+def measure(parse, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = parse(html)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark-parse.py <saved_page.html> [repeat]")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        html = f.read()
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    candidates = [("full soup, html.parser", full_soup), ("first table, html.parser", first_table("html.parser"))]
+    if wiki_cache.HTML_PARSER == "lxml":
+        candidates.append(("first table, lxml", first_table("lxml")))
+
+    print(f"Page size: {len(html) / 1024:.0f} KiB, {repeat} runs each\n")
+    print(f"{'method':<28}{'time':>12}{'peak memory':>14}")
+
+    baseline = None
+    for label, parse in candidates:
+        result, elapsed, peak = measure(parse, html, repeat)
+        baseline = baseline if baseline is not None else result
+        same = "" if result == baseline else "  (rows differ!)"
+        print(f"{label:<28}{elapsed * 1000:>10.1f}ms{peak / 1024 ** 2:>11.2f} MiB{same}")
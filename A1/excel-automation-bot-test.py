@@ -1,19 +1,7 @@
-import win32com.client as win32
+from excel_writer import open_writer
 import os
 
 def create_excel_with_states():
-    # Start Excel application
-    excel = win32.Dispatch("Excel.Application")
-    excel.Visible = True   # Opens MS Excel visibly
-
-    # Create a new workbook
-    workbook = excel.Workbooks.Add()
-    sheet = workbook.ActiveSheet
-
-    # Add headers
-    sheet.Cells(1, 1).Value = "State"
-    sheet.Cells(1, 2).Value = "Capital"
-
     # Indian states and capitals
     states_and_capitals = [
         ("Andhra Pradesh", "Amaravati"),
@@ -46,19 +34,11 @@ def create_excel_with_states():
         ("West Bengal", "Kolkata")
     ]
 
-    # Write data into Excel
-    row = 2
-    for state, capital in states_and_capitals:
-        sheet.Cells(row, 1).Value = state
-        sheet.Cells(row, 2).Value = capital
-        row += 1
-
-    # Auto-fit columns
-    sheet.Columns("A:B").AutoFit()
-
-    # Save the file
+    # Write headers and data in one block, then save
     file_path = os.path.join(os.getcwd(), "Indian_States_and_Capitals.xlsx")
-    workbook.SaveAs(file_path)
+    with open_writer(visible=True) as writer:   # Opens MS Excel visibly when available
+        writer.write_table(["State", "Capital"], states_and_capitals)
+        writer.save(file_path)
 
     print("Excel automation completed successfully.")
 
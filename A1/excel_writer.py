@@ -0,0 +1,185 @@
+"""
+Table writers for the Excel automation bot
+
+Both backends take a header row plus an iterable of row tuples:
+
+    with open_writer() as writer:
+        writer.write_table(["State", "Capital"], rows)
+        writer.save("Indian_States_and_Capitals.xlsx")
+
+ComExcelWriter drives a real Excel through COM. It assigns whole 2-D blocks
+to a Range (one round trip per block instead of one per cell) with screen
+updating, events and automatic calculation switched off while writing.
+OpenpyxlWriter streams rows into a write-only workbook and needs no Excel,
+so the bot also runs headless on Linux.
+"""
+import os
+from itertools import chain, islice
+
+try:
+    import win32com.client as win32
+except ImportError:
+    win32 = None
+
+XL_MAXIMIZED = -4137
+XL_CALCULATION_AUTOMATIC = -4105
+XL_CALCULATION_MANUAL = -4135
+
+# Rows per Range assignment; bounds the size of each marshalled COM array
+COM_BLOCK_ROWS = int(os.getenv("EXCEL_COM_BLOCK_ROWS", "10000"))
+
+# Rows looked at to size columns when autofitting a streamed table
+AUTOFIT_SAMPLE_ROWS = 1000
+
+
+def available_backends():
+    backends = []
+    if win32 is not None:
+        backends.append("com")
+    try:
+        import openpyxl  # noqa: F401
+        backends.append("openpyxl")
+    except ImportError:
+        pass
+    return backends
+
+
+def open_writer(backend=None, **options):
+    """
+    Writer for `backend` ("com" or "openpyxl")
+
+    Defaults to EXCEL_BACKEND from the environment, else COM when pywin32 is
+    installed, else openpyxl.
+    """
+    backend = backend or os.getenv("EXCEL_BACKEND") or ("com" if win32 is not None else "openpyxl")
+    if backend == "com":
+        return ComExcelWriter(**options)
+    if backend == "openpyxl":
+        return OpenpyxlWriter(**options)
+    raise ValueError(f"Unknown Excel backend: {backend}")
+
+
+def _iter_blocks(rows, size):
+    rows = iter(rows)
+    while True:
+        block = list(islice(rows, size))
+        if not block:
+            return
+        yield block
+
+
+def _column_letter(index):
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class ComExcelWriter:
+    def __init__(self, visible=True, maximize=True, block_rows=COM_BLOCK_ROWS):
+        if win32 is None:
+            raise RuntimeError("pywin32 is not installed; use the openpyxl backend")
+
+        self.block_rows = block_rows
+        self.excel = win32.Dispatch("Excel.Application")
+        self.excel.Visible = visible
+        self.excel.DisplayAlerts = False
+        if visible and maximize:
+            self.excel.WindowState = XL_MAXIMIZED
+        self.quit_on_close = not visible
+
+        self.workbook = self.excel.Workbooks.Add()
+        self.sheet = self.workbook.ActiveSheet
+
+        # Calculation can only be changed once a workbook is open
+        self._saved_state = (self.excel.ScreenUpdating, self.excel.EnableEvents, self.excel.Calculation)
+        self.excel.ScreenUpdating = False
+        self.excel.EnableEvents = False
+        self.excel.Calculation = XL_CALCULATION_MANUAL
+
+    def write_block(self, first_row, block):
+        """Assign a list of equal-length row tuples starting at `first_row`, column A"""
+        if not block:
+            return
+        sheet = self.sheet
+        last_row = first_row + len(block) - 1
+        target = sheet.Range(sheet.Cells(first_row, 1), sheet.Cells(last_row, len(block[0])))
+        target.Value = [tuple(row) for row in block]
+
+    def write_table(self, headers, rows, autofit=True):
+        self.write_block(1, [tuple(headers)])
+
+        next_row = 2
+        for block in _iter_blocks(rows, self.block_rows):
+            self.write_block(next_row, block)
+            next_row += len(block)
+
+        if autofit:
+            self.sheet.Columns(f"A:{_column_letter(len(headers))}").AutoFit()
+        return next_row - 2
+
+    def save(self, path):
+        self.workbook.SaveAs(os.path.abspath(path))
+
+    def close(self):
+        screen_updating, enable_events, calculation = self._saved_state
+        self.excel.Calculation = calculation
+        self.excel.EnableEvents = enable_events
+        self.excel.ScreenUpdating = screen_updating
+        if self.quit_on_close:
+            self.workbook.Close(SaveChanges=False)
+            self.excel.Quit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OpenpyxlWriter:
+    def __init__(self, sheet_title="Sheet1", **_):
+        from openpyxl import Workbook
+
+        # write_only streams rows to disk instead of keeping a cell object per value
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(sheet_title)
+
+    def write_table(self, headers, rows, autofit=True):
+        rows = iter(rows)
+        if autofit:
+            # Column widths must be set before the first row is written, so
+            # size them from a sample and put the sample back in front
+            sample = list(islice(rows, AUTOFIT_SAMPLE_ROWS))
+            for index, width in enumerate(self._column_widths(headers, sample), start=1):
+                self.sheet.column_dimensions[_column_letter(index)].width = width
+            rows = chain(sample, rows)
+
+        self.sheet.append(list(headers))
+        count = 0
+        for row in rows:
+            self.sheet.append(row)
+            count += 1
+        return count
+
+    @staticmethod
+    def _column_widths(headers, sample):
+        widths = [len(str(header)) for header in headers]
+        for row in sample:
+            for index, value in enumerate(row[:len(widths)]):
+                widths[index] = max(widths[index], len(str(value)))
+        return [width + 2 for width in widths]
+
+    def save(self, path):
+        self.workbook.save(path)
+
+    def close(self):
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,294 @@
+"""
+Concurrent scraper for Wikipedia-style list pages
+
+Each page/table is described by a TableSpec (URL, table selector, column
+mapping, cleanup rules). TableScraper fetches many specs at once on a thread
+pool that shares one HTTP connection pool, throttles requests per host, and
+yields each table's rows as soon as it is parsed. Pages go through the
+wiki_cache HTTP and parse caches, so unchanged pages cost a 304 and no parse.
+
+    scraper = TableScraper(max_workers=8, per_host_rate=2)
+    for spec, df in scraper.iter_dataframes(load_specs("tables.json")):
+        upload_dataframe_to_postgres(df, spec.table_name, conn_params)
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wiki_cache import fetch_html, cached_parse, parse_first_table
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# ----------------------------------------
+# CLEANUP RULES
+# ----------------------------------------
+
+CLEANUP_RULES = {
+    "strip": lambda value: value.strip(),
+    "strip_footnotes": lambda value: value.split("[")[0],  # "Bengaluru[12]" -> "Bengaluru"
+    "collapse_whitespace": lambda value: " ".join(value.split()),
+    "remove_commas": lambda value: value.replace(",", ""),
+}
+
+
+class TableSpec:
+    """
+    Declarative description of one table to scrape
+
+    columns      {output_name: cell_index} within each data row
+    table_class  class the <table> must carry; table_index picks the nth match
+    cleanup      rule names applied to every column, or {output_name: [rules]}
+    skip_rows    leading rows to drop (header)
+    cell_tags    cell tags counted when indexing; add "th" for row headers
+    table_name   destination table for upload_dataframe_to_postgres
+    """
+
+    def __init__(self, name, url, columns, table_class="wikitable", table_index=0,
+                 cleanup=("strip_footnotes", "strip"), skip_rows=1, cell_tags=("td",),
+                 table_name=None):
+        unknown = set(_iter_rule_names(cleanup)) - set(CLEANUP_RULES)
+        if unknown:
+            raise ValueError(f"Unknown cleanup rule(s) for {name}: {', '.join(sorted(unknown))}")
+
+        self.name = name
+        self.url = url
+        self.columns = dict(columns)
+        self.table_class = table_class
+        self.table_index = table_index
+        self.cleanup = cleanup
+        self.skip_rows = skip_rows
+        self.cell_tags = list(cell_tags)
+        self.table_name = table_name or name
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def rules_for(self, column):
+        if isinstance(self.cleanup, dict):
+            names = self.cleanup.get(column, ())
+        else:
+            names = self.cleanup
+        return [CLEANUP_RULES[name] for name in names]
+
+    def fingerprint(self):
+        """Hash of the parse settings; part of the parse-cache key"""
+        settings = [self.columns, self.table_class, self.table_index, self.cleanup,
+                    self.skip_rows, self.cell_tags]
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _iter_rule_names(cleanup):
+    if isinstance(cleanup, dict):
+        for names in cleanup.values():
+            yield from names
+    else:
+        yield from cleanup
+
+
+def load_specs(path):
+    """Read a JSON list of spec dicts (TableSpec keyword arguments)"""
+    with open(path, encoding="utf-8") as f:
+        return [TableSpec.from_dict(item) for item in json.load(f)]
+
+
+def parse_table(html, spec):
+    """Rows of `spec` found in `html`, as tuples in spec.columns order"""
+    table = parse_first_table(html, spec.table_class, spec.table_index)
+    if table is None:
+        raise ValueError(f"{spec.name}: no table with class '{spec.table_class}' "
+                         f"(index {spec.table_index}) on {spec.url}")
+
+    wanted = list(spec.columns.items())
+    rules = {column: spec.rules_for(column) for column, _ in wanted}
+    min_cells = max(index for _, index in wanted) + 1
+
+    data = []
+    for row in table.find_all("tr")[spec.skip_rows:]:
+        cells = row.find_all(spec.cell_tags)
+        if len(cells) < min_cells:
+            continue
+
+        values = []
+        for column, index in wanted:
+            value = cells[index].get_text(strip=True)
+            for rule in rules[column]:
+                value = rule(value)
+            values.append(value)
+        data.append(tuple(values))
+
+    return data
+
+
+# ----------------------------------------
+# RATE LIMITING
+# ----------------------------------------
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1 / rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        # Sleep outside the lock so other hosts are not held up
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ----------------------------------------
+# SCRAPER
+# ----------------------------------------
+
+class TableScraper:
+    def __init__(self, max_workers=8, per_host_rate=2.0, headers=None, timeout=10, session=None):
+        self.max_workers = max_workers
+        self.headers = headers or DEFAULT_HEADERS
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(per_host_rate)
+        self.session = session or self._create_session()
+        self.failed = []  # (spec, exception) from the last scrape()
+
+    def _create_session(self):
+        session = requests.Session()
+        # One keep-alive pool shared by every worker thread
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def fetch(self, url):
+        self.limiter.wait(url)
+        return fetch_html(url, headers=self.headers, timeout=self.timeout, session=self.session)
+
+    def _scrape_page(self, url, specs):
+        html = self.fetch(url)
+        results = []
+        for spec in specs:
+            try:
+                rows = cached_parse(html, lambda page: parse_table(page, spec), version=spec.fingerprint())
+                results.append((spec, rows, None))
+            except Exception as e:
+                results.append((spec, None, e))
+        return results
+
+    def scrape(self, specs):
+        """
+        Yield (spec, rows) for each spec as soon as its page is parsed
+
+        Specs sharing a URL are served by a single download. Failures are
+        printed and collected in self.failed instead of stopping the run.
+        """
+        by_url = {}
+        for spec in specs:
+            by_url.setdefault(spec.url, []).append(spec)
+
+        self.failed = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._scrape_page, url, page_specs): page_specs
+                       for url, page_specs in by_url.items()}
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [(spec, None, e) for spec in futures[future]]
+
+                for spec, rows, error in results:
+                    if error is not None:
+                        print(f"Failed to scrape {spec.name}: {error}")
+                        self.failed.append((spec, error))
+                        continue
+                    yield spec, rows
+
+    def iter_dataframes(self, specs):
+        """Like scrape(), but yields (spec, DataFrame) ready for upload_dataframe_to_postgres"""
+        import pandas as pd
+
+        for spec, rows in self.scrape(specs):
+            yield spec, pd.DataFrame(rows, columns=list(spec.columns))
+
+    def close(self):
+        self.session.close()
+
+
+def scrape_table(spec, **scraper_options):
+    """Scrape a single spec and return its rows"""
+    scraper = TableScraper(max_workers=1, **scraper_options)
+    try:
+        for _, rows in scraper.scrape([spec]):
+            return rows
+        raise scraper.failed[0][1]
+    finally:
+        scraper.close()
+
+
+# ----------------------------------------
+# KNOWN TABLES
+# ----------------------------------------
+
+STATES_AND_CAPITALS = TableSpec(
+    name="states_and_capitals",
+    url="https://en.wikipedia.org/wiki/List_of_state_and_union_territory_capitals_in_India",
+    columns={"state": 0, "capital": 1},
+    cleanup={"state": [], "capital": ["strip_footnotes", "strip"]},
+)
+
+
+def _load_db_connect():
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "A2", "db-connect.py")
+    spec = importlib.util.spec_from_file_location("db_connect", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    # python table_scraper.py [specs.json] [--upload]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    specs = load_specs(args[0]) if args else [STATES_AND_CAPITALS]
+
+    upload = None
+    conn_params = None
+    if "--upload" in sys.argv:
+        upload = _load_db_connect().upload_dataframe_to_postgres
+        conn_params = {
+            "dbname": os.getenv("DB_NAME", "automation_db"),
+            "user": os.getenv("DB_USER", "postgres"),
+            "password": os.getenv("DB_PASSWORD", "2606"),
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": os.getenv("DB_PORT", "5432")
+        }
+
+    scraper = TableScraper(
+        max_workers=int(os.getenv("SCRAPER_WORKERS", "8")),
+        per_host_rate=float(os.getenv("SCRAPER_HOST_RATE", "2"))
+    )
+    start = time.perf_counter()
+    try:
+        for spec, df in scraper.iter_dataframes(specs):
+            print(f"{spec.name}: {len(df)} rows")
+            if upload:
+                upload(df, spec.table_name, conn_params)
+    finally:
+        scraper.close()
+
+    print(f"Scraped {len(specs) - len(scraper.failed)}/{len(specs)} tables "
+          f"in {time.perf_counter() - start:.2f}s")
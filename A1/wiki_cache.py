@@ -0,0 +1,138 @@
+"""
+Caching helpers for the Wikipedia scrapers
+
+fetch_html() keeps a local HTTP cache and revalidates it with
+If-None-Match / If-Modified-Since, so an unchanged article costs a 304
+instead of a full download. cached_parse() stores parsed results on disk
+keyed by a hash of the page content, so an unchanged page is not parsed
+again. parse_first_table() builds a soup for the first matching table only,
+using lxml when it is installed.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+
+import requests
+from bs4 import BeautifulSoup
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def _cache_path(kind, key):
+    folder = os.path.join(CACHE_DIR, kind)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, hashlib.sha256(key.encode()).hexdigest())
+
+
+def _write_atomic(path, text):
+    # Unique temp name: concurrent scrapers may write the same entry
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def fetch_html(url, headers=None, timeout=10, session=None):
+    """
+    GET a page through the local HTTP cache
+
+    The cached body is revalidated with its ETag / Last-Modified; on 304 it
+    is returned without downloading the page again.
+    """
+    path = _cache_path("http", url)
+    cached = None
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    request_headers = dict(headers or {})
+    if cached:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        return cached["body"]
+    response.raise_for_status()
+
+    _write_atomic(path, json.dumps({
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "body": response.text
+    }))
+    return response.text
+
+
+def cached_parse(html, parse, version="1"):
+    """
+    Return parse(html), reusing an on-disk result for identical content
+
+    The key combines the content hash with the parser's name and `version`;
+    bump `version` whenever the parse rules change. Results must be JSON
+    serializable; lists of tuples come back as lists of tuples.
+    """
+    key = f"{parse.__module__}.{parse.__qualname__}:{version}:" + hashlib.sha256(html.encode()).hexdigest()
+    path = _cache_path("parsed", key)
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [tuple(row) for row in json.load(f)]
+    except (OSError, ValueError):
+        pass
+
+    result = parse(html)
+    _write_atomic(path, json.dumps(result))
+    return result
+
+
+_TABLE_TAG = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+
+
+def extract_first_table_html(html, class_name="wikitable", index=0):
+    """
+    Slice out the markup of the first <table> whose class contains `class_name`
+
+    `index` picks a later matching table instead (0 = first); tables nested
+    inside an earlier match are not counted. Nested tables are balanced by
+    counting open/close tags. Returns None if there is no such table.
+    """
+    opener = re.compile(
+        r"<table\b[^>]*\bclass\s*=\s*[\"'][^\"']*\b" + re.escape(class_name) + r"\b",
+        re.IGNORECASE
+    )
+    position = 0
+    for _ in range(index + 1):
+        match = opener.search(html, position)
+        if not match:
+            return None
+
+        depth = 0
+        end = len(html)  # unterminated table: parse what is there
+        for tag in _TABLE_TAG.finditer(html, match.start()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                end = tag.end()
+                break
+        position = end
+
+    return html[match.start():end]
+
+
+def parse_first_table(html, class_name="wikitable", index=0):
+    """BeautifulSoup <table> for the first matching table, parsing nothing else"""
+    table_html = extract_first_table_html(html, class_name, index)
+    if table_html is None:
+        return None
+    return BeautifulSoup(table_html, HTML_PARSER).find("table")
@@ -1,11 +1,25 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 import os
+import importlib.util
+import threading
+import time
+import hashlib
+from collections import OrderedDict
 from dotenv import load_dotenv
 import jwt
 from functools import wraps
 from datetime import datetime, timedelta
+from request_metrics import RequestMetrics
+from search_index import SearchIndex
+from ifsc_snapshot import SnapshotReader
+
+# Import the index helpers from db-connect.py
+spec = importlib.util.spec_from_file_location("db_connect", os.path.join(os.path.dirname(__file__), "db-connect.py"))
+db_connect = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(db_connect)
 
 # Load environment variables
 load_dotenv()
@@ -25,19 +39,698 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5432")
 }
 
+# Connection pool sizing (read from the same .env as DB_CONFIG)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_HEALTHCHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTHCHECK_INTERVAL", "30"))
+
+# Lookup cache configuration (IFSC_CACHE_SIZE=0 disables the cache)
+IFSC_CACHE_SIZE = int(os.getenv("IFSC_CACHE_SIZE", "10000"))
+IFSC_CACHE_TTL = float(os.getenv("IFSC_CACHE_TTL", "300"))
+IFSC_CACHE_NEGATIVE_TTL = float(os.getenv("IFSC_CACHE_NEGATIVE_TTL", "60"))
+IFSC_CACHE_VERSION_CHECK_INTERVAL = float(os.getenv("IFSC_CACHE_VERSION_CHECK_INTERVAL", "5"))
+
+# Verified-token cache (TOKEN_CACHE_SIZE=0 verifies every request with jwt.decode)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Request metrics (GET /metrics); SLOW_REQUEST_MS=0 disables the slow-request log
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+# LOOKUP_MODE=snapshot answers bank-details lookups from the memory-mapped
+# snapshot written by fetch-bank-data.py (no database round trip); "db" queries Postgres
+LOOKUP_MODE = os.getenv("LOOKUP_MODE", "db")
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ifsc_codes.snap"))
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "2"))
+
+# Search endpoint (page size; the index is rebuilt when the data version changes)
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+SEARCH_INDEX_CHECK_INTERVAL = float(os.getenv("SEARCH_INDEX_CHECK_INTERVAL", "5"))
+
+# Batch lookup configuration
+IFSC_BATCH_MAX_SIZE = int(os.getenv("IFSC_BATCH_MAX_SIZE", "10000"))
+IFSC_BATCH_CHUNK_SIZE = int(os.getenv("IFSC_BATCH_CHUNK_SIZE", "500"))
+IFSC_BATCH_STREAM_THRESHOLD = int(os.getenv("IFSC_BATCH_STREAM_THRESHOLD", "1000"))
+
 TABLE_NAME = "ifsc_codes"
+VERSION_TABLE = "table_versions"  # bumped by db-connect.py whenever rows are loaded
+
+# Bookkeeping columns added by the loader that are not part of the API response
+HIDDEN_COLUMNS = {db_connect.FINGERPRINT_COLUMN}
+
+# Per-endpoint latency histograms (total, auth, db_connect, query, serialize)
+metrics = RequestMetrics(SLOW_REQUEST_MS)
+if METRICS_ENABLED:
+    metrics.install(app)
+
+
+class DatabasePool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections
+
+    Callers block for up to `timeout` seconds when all `maxconn` connections
+    are checked out. Connections that have been idle longer than
+    `healthcheck_interval` are pinged with SELECT 1 before being handed out,
+    and broken connections are discarded and replaced.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, healthcheck_interval, **conn_params):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self.conn_params = conn_params
+
+        self._pool = None  # created lazily so importing the app needs no database
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(self.minconn, self.maxconn, **self.conn_params)
+            return self._pool
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.healthcheck_interval:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Check out a healthy connection, waiting for a free slot if needed"""
+        start = time.perf_counter()
+
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise TimeoutError(f"No database connection available after {self.timeout}s")
+
+        waited = time.perf_counter() - start
+
+        try:
+            pool = self._get_pool()
+            conn = pool.getconn()
+            if not self._is_healthy(conn):
+                self._last_used.pop(id(conn), None)
+                pool.putconn(conn, close=True)
+                with self._lock:
+                    self._discarded += 1
+                conn = pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            if waited > 0.001:
+                self._waits += 1
+
+        return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool, discarding it if it is broken"""
+        try:
+            close = close or conn.closed != 0
+            if not close:
+                try:
+                    # Never hand a connection with an open or failed transaction to the next request
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+
+            if close:
+                self._last_used.pop(id(conn), None)
+                with self._lock:
+                    self._discarded += 1
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+
+            self._get_pool().putconn(conn, close=close)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def close(self):
+        """Close every pooled connection; the next getconn() opens a new pool"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            self._last_used.clear()
+
+    def stats(self):
+        """Return a snapshot of pool usage counters"""
+        with self._lock:
+            # ThreadedConnectionPool keeps idle connections in its _pool list
+            idle = len(self._pool._pool) if self._pool is not None else 0
+            return {
+                "min_size": self.minconn,
+                "max_size": self.maxconn,
+                "in_use": self._in_use,
+                "idle": idle,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "total_wait_ms": round(self._total_wait * 1000, 3),
+                "avg_wait_ms": round(self._total_wait * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3)
+            }
+
+
+db_pool = DatabasePool(
+    DB_POOL_MIN,
+    DB_POOL_MAX,
+    DB_POOL_TIMEOUT,
+    DB_POOL_HEALTHCHECK_INTERVAL,
+    **DB_CONFIG
+)
+
+
+class LookupCache:
+    """
+    Bounded LRU cache with per-entry TTL and negative caching
+
+    A cached value of None records a lookup that found nothing (a 404) and
+    expires after `negative_ttl` instead of `ttl`. Entries are tagged with the
+    data version they were read under, so a version bump drops everything and
+    results of lookups that straddled the bump are not stored.
+    """
+
+    MISSING = object()
+
+    def __init__(self, maxsize, ttl, negative_ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._generation = 0
+
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        """Return the cached value (possibly None) or LookupCache.MISSING"""
+        if self.maxsize <= 0:
+            return self.MISSING
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return self.MISSING
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                self._misses += 1
+                return self.MISSING
+
+            self._entries.move_to_end(key)
+            if value is None:
+                self._negative_hits += 1
+            else:
+                self._hits += 1
+            return value
+
+    def set(self, key, value, generation):
+        """Store a lookup result read while the cache was at `generation`"""
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            if generation != self._generation:
+                return  # data was reloaded while this lookup was running
+
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    def set_version(self, version):
+        """Record the current data version, clearing the cache if it changed"""
+        with self._lock:
+            if version == self._version:
+                return
+            changed = self._version is not None
+            self._version = version
+        if changed:
+            self.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                "max_size": self.maxsize,
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "negative_ttl_seconds": self.negative_ttl,
+                "data_version": self._version,
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._negative_hits) / lookups, 4) if lookups else 0.0,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+
+ifsc_cache = LookupCache(IFSC_CACHE_SIZE, IFSC_CACHE_TTL, IFSC_CACHE_NEGATIVE_TTL)
+_last_version_check = 0.0
+
+# Mapped lazily on first lookup; swapped when the export replaces the file
+snapshot_reader = SnapshotReader(SNAPSHOT_PATH, SNAPSHOT_CHECK_INTERVAL)
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of tokens that already passed jwt.decode
+
+    Entries are keyed by a SHA-256 digest of the token (the token itself is
+    not kept) and expire at the token's own `exp` claim; tokens without
+    `exp` are never cached. Also keeps the auth-time counters reported by
+    /api/auth-stats.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+        self._auth_requests = 0
+        self._auth_failures = 0
+        self._auth_seconds = 0.0
+        self._auth_max_seconds = 0.0
+
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest):
+        """Return the cached claims, or None if the token must be verified"""
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                self._expired += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return claims
+
+    def set(self, digest, claims):
+        if self.maxsize <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+
+        with self._lock:
+            self._entries[digest] = (claims, claims["exp"])
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def record_auth(self, seconds, ok):
+        with self._lock:
+            self._auth_requests += 1
+            self._auth_failures += not ok
+            self._auth_seconds += seconds
+            self._auth_max_seconds = max(self._auth_max_seconds, seconds)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "max_size": self.maxsize,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "auth_requests": self._auth_requests,
+                "auth_failures": self._auth_failures,
+                "auth_seconds_total": round(self._auth_seconds, 6),
+                "auth_avg_us": round(self._auth_seconds / self._auth_requests * 1e6, 2) if self._auth_requests else 0.0,
+                "auth_max_us": round(self._auth_max_seconds * 1e6, 2)
+            }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+def verify_token(token):
+    """
+    Return the claims of a valid token, using the verified-token cache
+
+    Raises the jwt exceptions of jwt.decode for invalid or expired tokens.
+    """
+    digest = token_cache.digest(token)
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        token_cache.set(digest, claims)
+    return claims
+
+
+def rotate_jwt_secret(new_secret=None):
+    """
+    Key-rotation hook: switch the signing key (if given) and drop every
+    cached verification, so tokens signed with the old key are re-checked
+    """
+    global JWT_SECRET_KEY
+    if new_secret is not None:
+        JWT_SECRET_KEY = new_secret
+    token_cache.clear()
 
 
 def get_db_connection():
-    """Create and return a database connection"""
+    """Check out a database connection from the pool"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
+        with metrics.phase("db_connect"):
+            return db_pool.getconn()
     except Exception as e:
         print(f"Database connection error: {e}")
         return None
 
 
+def release_db_connection(conn, close=False):
+    """Return a connection obtained from get_db_connection() to the pool"""
+    try:
+        db_pool.putconn(conn, close=close)
+    except Exception as e:
+        print(f"Error returning connection to pool: {e}")
+
+
+def row_to_dict(row):
+    """Convert a result row to a response dict without loader bookkeeping columns"""
+    return {key: value for key, value in row.items() if key not in HIDDEN_COLUMNS}
+
+
+def read_table_version():
+    """Current data version of TABLE_NAME (0 if never bumped), or None if the database is unreachable"""
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    version = 0
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f'SELECT "version" FROM "{VERSION_TABLE}" WHERE "table_name" = %s',
+                (TABLE_NAME,)
+            )
+            row = cursor.fetchone()
+            if row:
+                version = row[0]
+    except psycopg2.Error:
+        pass  # version table not created yet, treat as version 0
+    finally:
+        release_db_connection(conn)
+
+    return version
+
+
+def sync_cache_version():
+    """
+    Poll the data version written by db-connect.py (at most once per
+    IFSC_CACHE_VERSION_CHECK_INTERVAL) and invalidate the cache on reload
+    """
+    global _last_version_check
+
+    if LOOKUP_MODE == "snapshot":
+        # The snapshot carries the data version it was exported at
+        if IFSC_CACHE_SIZE > 0:
+            snapshot = snapshot_reader.current()
+            ifsc_cache.set_version((snapshot.version, snapshot.metadata.get("exported_at")))
+        return
+
+    now = time.monotonic()
+    if IFSC_CACHE_SIZE <= 0 or now - _last_version_check < IFSC_CACHE_VERSION_CHECK_INTERVAL:
+        return
+    _last_version_check = now
+
+    version = read_table_version()
+    if version is not None:
+        ifsc_cache.set_version(version)
+
+
+def verify_lookup_plan():
+    """
+    Fail loudly if the bank-details lookup would run as a sequential scan
+
+    Raises RuntimeError when ifsc_codes has no index usable for
+    WHERE "BANK" = %s AND "IFSC" = %s. Skipped if the database is unreachable.
+    """
+    conn = get_db_connection()
+    if not conn:
+        print("Skipping lookup plan check: database unavailable")
+        return
+
+    try:
+        with conn.cursor() as cursor:
+            db_connect.verify_index_scan(cursor, TABLE_NAME, ("BANK", "IFSC"))
+    finally:
+        release_db_connection(conn)
+
+    print(f"Lookup plan check passed: {TABLE_NAME}(BANK, IFSC) is served by an index")
+
+
+search_index = None
+_search_index_lock = threading.Lock()
+_search_index_rebuilding = False
+_last_search_check = 0.0
+
+
+def build_search_index(version):
+    """Read the whole table into a new SearchIndex tagged with `version`"""
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f'SELECT * FROM "{TABLE_NAME}"')
+            names = [column.name for column in cursor.description]
+            rows = cursor.fetchall()
+    finally:
+        release_db_connection(conn)
+
+    keep = [i for i, name in enumerate(names) if name not in HIDDEN_COLUMNS]
+    columns = [names[i] for i in keep]
+    if len(keep) < len(names):
+        rows = [tuple(row[i] for i in keep) for row in rows]
+
+    start = time.perf_counter()
+    index = SearchIndex.from_rows(columns, rows, version)
+    print(f"Search index built: {len(index)} rows, version {version}, {time.perf_counter() - start:.2f}s")
+    return index
+
+
+def _rebuild_search_index(version):
+    global search_index, _search_index_rebuilding
+    try:
+        search_index = build_search_index(version)
+    except Exception as e:
+        print(f"Search index rebuild failed, keeping version {search_index.version}: {e}")
+    finally:
+        _search_index_rebuilding = False
+
+
+def get_search_index():
+    """
+    Return the current SearchIndex, checking the data version at most once
+    per SEARCH_INDEX_CHECK_INTERVAL
+
+    The first call builds the index synchronously. After a reload the old
+    index keeps serving while a new one is built in a background thread and
+    swapped in. Raises RuntimeError if the first build cannot reach the database.
+    """
+    global search_index, _search_index_rebuilding, _last_search_check
+
+    now = time.monotonic()
+    if search_index is not None and now - _last_search_check < SEARCH_INDEX_CHECK_INTERVAL:
+        return search_index
+    _last_search_check = now
+
+    version = read_table_version()
+    if search_index is None:
+        with _search_index_lock:
+            if search_index is None:
+                search_index = build_search_index(version)
+    elif version is not None and version != search_index.version:
+        with _search_index_lock:
+            if _search_index_rebuilding:
+                return search_index
+            _search_index_rebuilding = True
+        threading.Thread(target=_rebuild_search_index, args=(version,), daemon=True).start()
+
+    return search_index
+
+
+def fetch_bank_details_batch(keys):
+    """
+    Look up many (bank_name, ifsc) pairs with a single set-based query
+
+    Returns a dict mapping each key that exists in the table to its row.
+    Raises RuntimeError if no connection is available.
+    """
+    if LOOKUP_MODE == "snapshot":
+        with metrics.phase("query"):
+            snapshot = snapshot_reader.current()
+            rows = {key: snapshot.lookup(*key) for key in keys}
+        return {key: row for key, row in rows.items() if row is not None}
+
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+
+    try:
+        with metrics.phase("query"), conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            query = f'''
+                SELECT DISTINCT ON ("BANK", "IFSC") * FROM "{TABLE_NAME}"
+                WHERE ("BANK", "IFSC") IN (
+                    SELECT * FROM unnest(%s::text[], %s::text[])
+                )
+            '''
+
+            cursor.execute(query, ([k[0] for k in keys], [k[1] for k in keys]))
+            rows = cursor.fetchall()
+    finally:
+        release_db_connection(conn)
+
+    with metrics.phase("serialize"):
+        return {(row["BANK"], row["IFSC"]): row_to_dict(row) for row in rows}
+
+
+def iter_batch_results(items):
+    """
+    Yield one result per requested item, in request order
+
+    Items are resolved chunk by chunk: cached pairs are answered directly and
+    the remaining unique pairs of each chunk go to Postgres in one query.
+    """
+    sync_cache_version()
+
+    for start in range(0, len(items), IFSC_BATCH_CHUNK_SIZE):
+        chunk = items[start:start + IFSC_BATCH_CHUNK_SIZE]
+        generation = ifsc_cache.generation
+
+        resolved = {}
+        for key in chunk:
+            if key not in resolved:
+                cached = ifsc_cache.get(key)
+                if cached is not LookupCache.MISSING:
+                    resolved[key] = cached
+
+        missing = [key for key in dict.fromkeys(chunk) if key not in resolved]
+        if missing:
+            found = fetch_bank_details_batch(missing)
+            for key in missing:
+                resolved[key] = found.get(key)
+                ifsc_cache.set(key, resolved[key], generation)
+
+        for offset, key in enumerate(chunk):
+            result = {
+                "index": start + offset,
+                "bank_name": key[0],
+                "ifsc": key[1],
+                "found": resolved[key] is not None
+            }
+            if resolved[key] is not None:
+                result["data"] = resolved[key]
+            yield result
+
+
+def stream_batch_results(items):
+    """
+    Serialize iter_batch_results() as one JSON document, chunk by chunk
+
+    "success" comes after "results", once the outcome is known. Headers are
+    already sent when a lookup fails mid-stream, so the failure is reported
+    inside the document as "success": false with a trailing "error".
+    """
+    yield f'{{"count": {len(items)}, "results": ['
+
+    try:
+        for i, result in enumerate(iter_batch_results(items)):
+            yield ("," if i else "") + app.json.dumps(result)
+    except Exception as e:
+        error = str(e) if isinstance(e, RuntimeError) else f"Database query error: {str(e)}"
+        yield "], " + app.json.dumps({"success": False, "error": error})[1:]
+        return
+    yield '], "success": true}'
+
+
 def token_required(f):
     """
     Decorator to protect routes with JWT authentication
@@ -65,20 +758,26 @@ def token_required(f):
                 "message": "Please provide a valid JWT token in Authorization header"
             }), 401
         
+        auth_start = time.perf_counter()
         try:
-            # Verify and decode the token
-            data = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-            request.current_user = data
+            # Verify and decode the token (cached until its exp)
+            data = verify_token(token)
+            request.current_user = dict(data)
         except jwt.ExpiredSignatureError:
+            token_cache.record_auth(time.perf_counter() - auth_start, ok=False)
             return jsonify({
                 "error": "Token has expired",
                 "message": "Please login again to get a new token"
             }), 401
         except jwt.InvalidTokenError:
+            token_cache.record_auth(time.perf_counter() - auth_start, ok=False)
             return jsonify({
                 "error": "Invalid token",
                 "message": "The provided token is invalid"
             }), 401
+        auth_seconds = time.perf_counter() - auth_start
+        token_cache.record_auth(auth_seconds, ok=True)
+        metrics.record_phase("auth", auth_seconds)
         
         return f(*args, **kwargs)
     
@@ -176,48 +875,252 @@ def get_bank_details():
             }
         }), 400
     
-    # Connect to database
-    conn = get_db_connection()
-    if not conn:
+    if LOOKUP_MODE == "snapshot":
+        # A lookup in the mapped snapshot costs about as much as a cache hit, so the cache is bypassed
+        try:
+            with metrics.phase("query"):
+                result = snapshot_reader.current().lookup(bank_name, ifsc)
+        except Exception as e:
+            return jsonify({
+                "error": f"Snapshot lookup error: {str(e)}"
+            }), 500
+    else:
+        # Serve repeated lookups from the in-process cache
+        sync_cache_version()
+        cache_key = (bank_name, ifsc)
+        result = ifsc_cache.get(cache_key)
+
+        if result is LookupCache.MISSING:
+            generation = ifsc_cache.generation
+
+            # Connect to database
+            conn = get_db_connection()
+            if not conn:
+                return jsonify({
+                    "error": "Database connection failed"
+                }), 500
+
+            try:
+                # Query the database using RealDictCursor to get results as dictionaries
+                with metrics.phase("query"), conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    query = f'''
+                        SELECT * FROM "{TABLE_NAME}"
+                        WHERE "BANK" = %s AND "IFSC" = %s
+                    '''
+
+                    cursor.execute(query, (bank_name, ifsc))
+                    row = cursor.fetchone()
+
+            except Exception as e:
+                return jsonify({
+                    "error": f"Database query error: {str(e)}"
+                }), 500
+            finally:
+                # Always hand the connection back, even on query errors
+                release_db_connection(conn)
+
+            with metrics.phase("serialize"):
+                result = row_to_dict(row) if row else None
+            ifsc_cache.set(cache_key, result, generation)
+    
+    # Check if record was found
+    if result:
+        with metrics.phase("serialize"):
+            response = jsonify({
+                "success": True,
+                "data": result
+            })
+        return response, 200
+    else:
         return jsonify({
-            "error": "Database connection failed"
-        }), 500
+            "success": False,
+            "message": "No record found for the given bank name and IFSC code"
+        }), 404
+
+
+@app.route('/api/bank-details/batch', methods=['POST'])
+@token_required
+def get_bank_details_batch():
+    """
+    Get bank details for many Bank name / IFSC code pairs in one request
     
-    try:
-        # Query the database using RealDictCursor to get results as dictionaries
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = f'''
-            SELECT * FROM "{TABLE_NAME}"
-            WHERE "BANK" = %s AND "IFSC" = %s
-        '''
-        
-        cursor.execute(query, (bank_name, ifsc))
-        result = cursor.fetchone()
+    Request Body (JSON):
+        {
+            "items": [
+                {"bank_name": "ABHYUDAYA COOPERATIVE BANK LIMITED", "ifsc": "ABHY0063001"},
+                {"bank_name": "ABHYUDAYA COOPERATIVE BANK LIMITED", "ifsc": "ABHY0063002"}
+            ],
+            "stream": false
+        }
         
-        cursor.close()
-        conn.close()
+    Returns:
+        JSON object with one result per item, in request order. Batches larger
+        than IFSC_BATCH_STREAM_THRESHOLD (or "stream": true) are streamed.
+    """
+    example = {
+        "items": [
+            {"bank_name": "ABHYUDAYA COOPERATIVE BANK LIMITED", "ifsc": "ABHY0063001"}
+        ]
+    }
+
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list) or not data['items']:
+        return jsonify({
+            "error": "Request body must be JSON with a non-empty 'items' list",
+            "example": example
+        }), 400
+    
+    if len(data['items']) > IFSC_BATCH_MAX_SIZE:
+        return jsonify({
+            "error": f"Batch too large: {len(data['items'])} items (maximum {IFSC_BATCH_MAX_SIZE})"
+        }), 400
+    
+    items = []
+    for index, item in enumerate(data['items']):
+        bank_name = item.get('bank_name') if isinstance(item, dict) else None
+        ifsc = item.get('ifsc') if isinstance(item, dict) else None
         
-        # Check if record was found
-        if result:
+        if not isinstance(bank_name, str) or not isinstance(ifsc, str) or not bank_name or not ifsc:
             return jsonify({
-                "success": True,
-                "data": dict(result)
-            }), 200
-        else:
-            return jsonify({
-                "success": False,
-                "message": "No record found for the given bank name and IFSC code"
-            }), 404
-            
+                "error": f"Item {index}: both 'bank_name' and 'ifsc' fields are required",
+                "example": example
+            }), 400
+        
+        items.append((bank_name, ifsc))
+    
+    stream = data.get('stream', False)
+    if not isinstance(stream, bool):
+        return jsonify({
+            "error": "'stream' must be true or false",
+            "example": example
+        }), 400
+    
+    if stream or len(items) > IFSC_BATCH_STREAM_THRESHOLD:
+        return Response(
+            stream_with_context(stream_batch_results(items)),
+            mimetype="application/json"
+        )
+    
+    try:
+        results = list(iter_batch_results(items))
+    except RuntimeError as e:
+        return jsonify({
+            "error": str(e)
+        }), 500
     except Exception as e:
-        if conn:
-            conn.close()
         return jsonify({
             "error": f"Database query error: {str(e)}"
         }), 500
+    
+    with metrics.phase("serialize"):
+        response = jsonify({
+            "success": True,
+            "count": len(results),
+            "results": results
+        })
+    return response, 200
+
+
+@app.route('/api/search', methods=['GET'])
+@token_required
+def search_bank_details():
+    """
+    Autocomplete search over IFSC codes, banks, branches and locations
+
+    Query parameters (at least one criterion is required):
+        ifsc    IFSC prefix, e.g. SBIN00
+        bank    Bank name prefix (case-insensitive)
+        branch  Branch name prefix (case-insensitive)
+        fuzzy   true: match bank/branch by trigram similarity instead of prefix
+        state   State (exact, case-insensitive)
+        city    City, matched against CITY1 and CITY2 (exact, case-insensitive)
+        limit   Page size (default SEARCH_DEFAULT_LIMIT, at most SEARCH_MAX_LIMIT)
+        after   next_cursor of the previous page
+
+    Returns:
+        JSON object with matching rows in IFSC order and the cursor of the next page
+    """
+    criteria = {name: request.args.get(name, "").strip() for name in ("ifsc", "bank", "branch", "state", "city")}
+    if not any(criteria.values()):
+        return jsonify({
+            "error": "At least one of 'ifsc', 'bank', 'branch', 'state' or 'city' is required",
+            "example": "/api/search?bank=state bank&city=pune&limit=20"
+        }), 400
+
+    try:
+        limit = int(request.args.get("limit", SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= SEARCH_MAX_LIMIT:
+        return jsonify({
+            "error": f"'limit' must be an integer between 1 and {SEARCH_MAX_LIMIT}"
+        }), 400
+
+    fuzzy = request.args.get("fuzzy", "").lower() in ("1", "true", "yes")
+
+    try:
+        with metrics.phase("query"):
+            index = get_search_index()
+            rows, next_cursor = index.search(fuzzy=fuzzy, after=request.args.get("after"), limit=limit, **criteria)
+    except Exception as e:
+        return jsonify({
+            "error": f"Search error: {str(e)}"
+        }), 500
+
+    with metrics.phase("serialize"):
+        response = jsonify({
+            "success": True,
+            "count": len(rows),
+            "data": [dict(zip(index.columns, row)) for row in rows],
+            "next_cursor": next_cursor
+        })
+    return response, 200
+
+
+@app.route('/api/pool-stats', methods=['GET'])
+@token_required
+def get_pool_stats():
+    """
+    Report database connection pool usage (in-use, idle, wait times)
+    
+    Returns:
+        JSON object with pool statistics
+    """
+    return jsonify({
+        "success": True,
+        "data": db_pool.stats()
+    }), 200
 
 
+@app.route('/api/cache-stats', methods=['GET'])
+@token_required
+def get_cache_stats():
+    """
+    Report lookup cache hit/miss counters
+    
+    Returns:
+        JSON object with cache statistics
+    """
+    return jsonify({
+        "success": True,
+        "data": ifsc_cache.stats()
+    }), 200
+
+
+@app.route('/api/auth-stats', methods=['GET'])
+@token_required
+def get_auth_stats():
+    """
+    Report verified-token cache counters and time spent authenticating
+    
+    Returns:
+        JSON object with auth statistics
+    """
+    return jsonify({
+        "success": True,
+        "data": token_cache.stats()
+    }), 200
 
 
 
@@ -225,10 +1128,26 @@ if __name__ == '__main__':
     print("Starting Bank Details API server...")
     print(f"Database: {DB_CONFIG['dbname']} on {DB_CONFIG['host']}:{DB_CONFIG['port']}")
     print(f"Table: {TABLE_NAME}")
+    print(f"Connection pool: min={DB_POOL_MIN}, max={DB_POOL_MAX}, timeout={DB_POOL_TIMEOUT}s")
+    print(f"Lookup cache: size={IFSC_CACHE_SIZE}, ttl={IFSC_CACHE_TTL}s, negative ttl={IFSC_CACHE_NEGATIVE_TTL}s")
+    print(f"Verified-token cache: size={TOKEN_CACHE_SIZE}")
+    print(f"Lookup mode: {LOOKUP_MODE}" + (f" ({SNAPSHOT_PATH})" if LOOKUP_MODE == "snapshot" else ""))
     print("\nAvailable endpoints:")
     print("  POST /api/login            - Get JWT token (username/password)")
     print("  POST /api/bank-details     - Get bank details (requires JWT token)")
+    print("  POST /api/bank-details/batch - Get bank details for many IFSC codes (requires JWT token)")
+    print("  GET  /api/search           - Prefix/fuzzy search with state and city filters (requires JWT token)")
+    print("  GET  /api/pool-stats       - Connection pool statistics (requires JWT token)")
+    print("  GET  /api/cache-stats      - Lookup cache statistics (requires JWT token)")
+    print("  GET  /api/auth-stats       - Token cache and auth time statistics (requires JWT token)")
+    if METRICS_ENABLED:
+        print("  GET  /metrics              - Prometheus latency/status metrics")
     print("\nJWT Authentication enabled!")
     print("Set JWT_SECRET_KEY, API_USERNAME, and API_PASSWORD in .env file")
-    print("\nStarting server on http://localhost:5000")
+    print("\nStarting development server on http://localhost:5000")
+    print("For production, use the multi-worker WSGI entry point in wsgi.py")
+    if LOOKUP_MODE == "snapshot":
+        snapshot_reader.current()
+    else:
+        verify_lookup_plan()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+import importlib.util
+from datetime import datetime, timedelta
+
+import jwt
+
+# Import the Flask app and decorator from api.py
+spec = importlib.util.spec_from_file_location("api", os.path.join(os.path.dirname(__file__), "api.py"))
+api = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(api)
+
+
+# ----------------------------------------
+# BENCHMARK: token_required OVERHEAD
+# ----------------------------------------
+#
+# Calls a no-op view wrapped in token_required inside one request context,
+# so the numbers are the decorator's own cost (header parsing + token
+# verification), with the verified-token cache on and off.
+
+@api.token_required
+def noop_view():
+    return "ok"
+
+
+def make_token(lifetime_hours=24):
+    payload = {
+        "username": "admin",
+        "exp": datetime.utcnow() + timedelta(hours=lifetime_hours),
+        "iat": datetime.utcnow()
+    }
+    return jwt.encode(payload, api.JWT_SECRET_KEY, algorithm=api.JWT_ALGORITHM)
+
+
+def time_decorator(token, calls, cache_size):
+    api.token_cache = api.TokenCache(cache_size)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with api.app.test_request_context("/api/bank-details", method="POST", headers=headers):
+        noop_view()  # warm up (fills the cache when enabled)
+        start = time.perf_counter()
+        for _ in range(calls):
+            result = noop_view()
+        elapsed = time.perf_counter() - start
+
+    assert result == "ok", result
+    return elapsed / calls, api.token_cache.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure token_required overhead with and without the token cache")
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    token = make_token()
+    print(f"{args.calls:,} authenticated calls per run\n")
+    print(f"{'mode':<16}{'per call':>12}{'calls/s':>12}{'hit ratio':>11}")
+
+    results = {}
+    for label, size in [("jwt.decode", 0), ("cached", args.cache_size)]:
+        per_call, stats = time_decorator(token, args.calls, size)
+        results[label] = per_call
+        print(f"{label:<16}{per_call * 1e6:>10.1f}us{1 / per_call:>12,.0f}{stats['hit_ratio']:>11}")
+
+    print(f"\nCache speedup: {results['jwt.decode'] / results['cached']:.2f}x")
@@ -0,0 +1,116 @@
+import argparse
+import os
+import time
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+
+# Import the loaders from db-connect.py
+spec = importlib.util.spec_from_file_location("db_connect", os.path.join(os.path.dirname(__file__), "db-connect.py"))
+db_connect = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(db_connect)
+
+load_dotenv()
+
+DB_CONFIG = {
+    "dbname": os.getenv("DB_NAME", "automation_db"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "2606"),
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": os.getenv("DB_PORT", "5432")
+}
+
+
+# ----------------------------------------
+# BENCHMARK: COPY vs execute_values
+# ----------------------------------------
+
+def make_ifsc_frame(rows, seed=0):
+    """Synthetic frame shaped like the RBI IFSC sheet"""
+    rng = np.random.default_rng(seed)
+    banks = np.array([f"BANK {i} LIMITED" for i in range(200)])
+    bank_idx = rng.integers(0, len(banks), rows)
+
+    return pd.DataFrame({
+        "BANK": banks[bank_idx],
+        "IFSC": [f"B{b:03d}0{i:06d}" for b, i in zip(bank_idx, range(rows))],
+        "BRANCH": [f"BRANCH {i}" for i in range(rows)],
+        "ADDRESS": [f"{i} MAIN ROAD, SECTOR {i % 50}" for i in range(rows)],
+        "CITY1": rng.choice(["MUMBAI", "PUNE", "DELHI", "CHENNAI"], rows),
+        "STATE": rng.choice(["MAHARASHTRA", "DELHI", "TAMIL NADU"], rows),
+        "PHONE": rng.integers(10 ** 9, 10 ** 10, rows).astype("float64"),
+        "IMPS": rng.random(rows) > 0.5
+    })
+
+
+def time_load(df, method, table_name):
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        db_connect.create_table_from_df(cursor, table_name, df)
+        conn.commit()
+
+        start = time.perf_counter()
+        db_connect.load_dataframe(cursor, table_name, df, method)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+
+        cursor.execute(f'DROP TABLE "{table_name}"')
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    return elapsed
+
+
+def time_parallel_load(df, workers, table_name):
+    """Partitioned COPY over `workers` connections plus the atomic publish"""
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        db_connect.create_table_from_df(cursor, table_name, df)
+        conn.commit()
+
+        start = time.perf_counter()
+        db_connect.upload_dataframe_parallel(df, table_name, DB_CONFIG, workers, incremental=False)
+        elapsed = time.perf_counter() - start
+
+        cursor.execute(f'DROP TABLE "{table_name}"')
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare COPY and execute_values load throughput")
+    parser.add_argument("--rows", type=int, default=170000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="also time parallel partitioned COPY with these connection counts")
+    args = parser.parse_args()
+
+    df = make_ifsc_frame(args.rows)
+    print(f"Loading {len(df)} rows x {len(df.columns)} columns, best of {args.repeat}\n")
+
+    results = {}
+    for method in ["values", "copy"]:
+        best = min(time_load(df, method, f"bench_load_{method}") for _ in range(args.repeat))
+        results[method] = best
+        print(f"{method:<8}{best:>10.2f}s{len(df) / best:>14,.0f} rows/sec")
+
+    print(f"\nCOPY speedup: {results['values'] / results['copy']:.2f}x")
+
+    for workers in args.workers:
+        label = f"copy x{workers}"
+        best = min(time_parallel_load(df, workers, "bench_load_parallel") for _ in range(args.repeat))
+        print(f"{label:<8}{best:>10.2f}s{len(df) / best:>14,.0f} rows/sec"
+              f"  ({results['copy'] / best:.2f}x vs single COPY)")
@@ -0,0 +1,97 @@
+import argparse
+import os
+import time
+import tracemalloc
+import importlib.util
+
+import numpy as np
+import psycopg2
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(os.path.dirname(__file__), filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+db_connect = load_script("db_connect", "db-connect.py")
+bench_bulk_load = load_script("benchmark_bulk_load", "benchmark-bulk-load.py")
+DB_CONFIG = bench_bulk_load.DB_CONFIG
+
+
+# ----------------------------------------
+# BENCHMARK: merge diff vs row fingerprints
+# ----------------------------------------
+
+def make_release(base, changed, added, seed=1):
+    """Copy of `base` with `changed` rows edited and `added` rows appended"""
+    rng = np.random.default_rng(seed)
+    release = base.copy()
+    rows = rng.choice(len(release), changed, replace=False)
+    release.loc[rows, "ADDRESS"] = release.loc[rows, "ADDRESS"] + " (UPDATED)"
+
+    extra = bench_bulk_load.make_ifsc_frame(added, seed=seed)
+    extra["IFSC"] = [f"NEW0{i:07d}" for i in range(added)]
+    return db_connect.pd.concat([release, extra], ignore_index=True)
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<34}{elapsed:>9.2f}s{peak / 1024 ** 2:>12.1f} MiB")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare get_new_rows with fingerprint diffing")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--changed", type=int, default=300)
+    parser.add_argument("--added", type=int, default=300)
+    args = parser.parse_args()
+
+    table_name = "bench_incremental"
+    base = bench_bulk_load.make_ifsc_frame(args.rows)
+    release = make_release(base, args.changed, args.added)
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    try:
+        print(f"Loading {len(base)} base rows into '{table_name}'...")
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        db_connect.create_table_from_df(cursor, table_name, base)
+        db_connect.sync_by_fingerprint(cursor, table_name, base)
+        conn.commit()
+
+        print(f"\nDiffing a release with {args.changed} changed and {args.added} new rows\n")
+        print(f"{'method':<34}{'time':>10}{'peak memory':>13}")
+
+        merged = measure(
+            "get_existing_data + get_new_rows",
+            lambda: db_connect.get_new_rows(release, db_connect.get_existing_data(cursor, table_name, release))
+        )
+        new_rows, _, _ = measure(
+            "fingerprints (no key)",
+            lambda: db_connect.diff_by_fingerprint(cursor, table_name, release)
+        )
+        keyed = measure(
+            "fingerprints (key IFSC)",
+            lambda: db_connect.diff_by_fingerprint(cursor, table_name, release, ["IFSC"])
+        )
+
+        print(f"\nmerge: {len(merged)} rows to insert")
+        print(f"fingerprints: {len(new_rows)} rows to insert "
+              f"({len(keyed[0])} new + {len(keyed[1])} changed by key)")
+
+        cursor.execute(f'DROP TABLE "{table_name}"')
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
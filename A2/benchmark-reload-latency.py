@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import importlib.util
+
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+
+
+def load_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(os.path.dirname(os.path.abspath(__file__)), filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+db_connect = load_module("db_connect", "db-connect.py")
+bulk_load = load_module("benchmark_bulk_load", "benchmark-bulk-load.py")
+load_test = load_module("load_test", "load-test.py")
+
+load_dotenv()
+
+DB_CONFIG = bulk_load.DB_CONFIG
+
+
+# ----------------------------------------
+# API LATENCY DURING A RELOAD
+# ----------------------------------------
+#
+# Point api.py at a scratch database (the table is rebuilt) with the lookup
+# cache off so every request reaches Postgres:
+#
+#   IFSC_CACHE_SIZE=0 gunicorn --workers 4 -b :8000 wsgi:app
+#   python benchmark-reload-latency.py --url http://localhost:8000
+#
+# Each phase hammers /api/bank-details while a reload of the same rows plus
+# --new-rows extra ones runs in a separate process: "incremental" is the
+# in-place server-side diff, "swap" the shadow-table reload.
+
+
+def reload_frame(rows, new_rows):
+    base = bulk_load.make_ifsc_frame(rows, seed=0)
+    extra = bulk_load.make_ifsc_frame(rows + new_rows, seed=1).iloc[rows:]
+    return pd.concat([base, extra], ignore_index=True)
+
+
+def run_reload(mode, rows, new_rows, table_name):
+    """Body of the reload subprocess"""
+    df = reload_frame(rows, new_rows)
+    if mode == "swap":
+        db_connect.swap_upload_dataframe(
+            df, table_name, DB_CONFIG,
+            key_columns=["IFSC"], unique_indexes=["IFSC"], indexes=[("BANK", "IFSC")]
+        )
+    else:
+        db_connect.upload_dataframe_to_postgres(
+            df, table_name, DB_CONFIG, incremental=True, incremental_strategy="server",
+            key_columns=["IFSC"], unique_indexes=["IFSC"], indexes=[("BANK", "IFSC")]
+        )
+
+
+def seed_table(rows, table_name):
+    """Start every phase from the same base table"""
+    db_connect.swap_upload_dataframe(
+        bulk_load.make_ifsc_frame(rows, seed=0), table_name, DB_CONFIG,
+        unique_indexes=["IFSC"], indexes=[("BANK", "IFSC")], max_shrink=1.0, keep_previous=False
+    )
+
+
+def hammer(base_url, token, pairs, concurrency, until):
+    """Issue lookups from `concurrency` threads until until() is true"""
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(offset):
+        session = requests.Session()
+        i = offset
+        while not until():
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}/api/bank-details", json=pairs[i % len(pairs)],
+                                        headers=headers, timeout=30)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += not ok
+            i += concurrency
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "p50_ms": round(load_test.percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(load_test.percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(load_test.percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0
+    }
+
+
+def measure_phase(args, token, pairs, mode):
+    seed_table(args.rows, args.table)
+    if mode == "idle":
+        deadline = time.monotonic() + args.idle_seconds
+        return hammer(args.url, token, pairs, args.concurrency, lambda: time.monotonic() > deadline)
+
+    reload = subprocess.Popen([
+        sys.executable, os.path.abspath(__file__), "--reload", mode,
+        "--rows", str(args.rows), "--new-rows", str(args.new_rows), "--table", args.table
+    ], stdout=subprocess.DEVNULL)
+    start = time.perf_counter()
+    report = hammer(args.url, token, pairs, args.concurrency, lambda: reload.poll() is not None)
+    report["reload_seconds"] = round(time.perf_counter() - start, 2)
+    if reload.returncode != 0:
+        report["reload_failed"] = reload.returncode
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API lookup latency while ifsc_codes is reloaded")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=170000)
+    parser.add_argument("--new-rows", type=int, default=20000)
+    parser.add_argument("--table", default="ifsc_codes")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--idle-seconds", type=float, default=10)
+    parser.add_argument("--modes", nargs="*", default=["idle", "incremental", "swap"])
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--reload", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reload:
+        run_reload(args.reload, args.rows, args.new_rows, args.table)
+        sys.exit(0)
+
+    url = args.url.rstrip("/")
+    args.url = url
+    token = load_test.get_token(url, args.username, args.password)
+    base = bulk_load.make_ifsc_frame(args.rows, seed=0)
+    pairs = [{"bank_name": bank, "ifsc": ifsc}
+             for bank, ifsc in base[["BANK", "IFSC"]].sample(min(5000, len(base)), random_state=0).itertuples(index=False)]
+
+    reports = {}
+    for mode in args.modes:
+        print(f"\nPhase: {mode} ...")
+        reports[mode] = measure_phase(args, token, pairs, mode)
+        print(json.dumps(reports[mode], indent=2))
+
+    print(f"\n{'phase':<14}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, report in reports.items():
+        print(f"{mode:<14}{report['requests']:>10}{report['errors']:>8}{report['p50_ms']:>10}"
+              f"{report['p95_ms']:>10}{report['p99_ms']:>10}{report['max_ms']:>10}")
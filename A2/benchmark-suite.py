@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import importlib.util
+from datetime import datetime, timezone
+
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+
+from excel_ingest import default_engine, read_workbook
+from synthetic_ifsc import cached_rbi_workbook
+
+load_dotenv()
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+db_connect = load_module("db_connect", "db-connect.py")
+load_test = load_module("load_test", "load-test.py")
+
+# Server to create the throwaway database on (the .env database itself is never touched)
+ADMIN_CONFIG = {
+    "dbname": os.getenv("DB_NAME", "automation_db"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "2606"),
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": os.getenv("DB_PORT", "5432")
+}
+
+UNIQUE_INDEXES = ["IFSC"]
+INDEXES = [("BANK", "IFSC")]
+
+
+# ----------------------------------------
+# BENCHMARK SUITE: INGESTION AND LOOKUP
+# ----------------------------------------
+#
+# Runs every step on the same synthetic RBI-shaped workbook (synthetic_ifsc.py)
+# inside a database created for the run and dropped afterwards:
+#
+#   python benchmark-suite.py                         # writes benchmark-results/<commit>.json
+#   python benchmark-suite.py --compare benchmark-results/<older>.json
+#
+# Each timed step is repeated --repeat times and the fastest run is kept.
+# --compare prints old/new ratios and exits with status 1 when a step got
+# slower than --threshold.
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def best_of(repeat, fn, setup=None):
+    """Fastest of `repeat` runs of fn(); setup() runs untimed before each one"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def create_scratch_database():
+    name = f"ifsc_bench_{os.getpid()}"
+    conn = psycopg2.connect(**ADMIN_CONFIG)
+    conn.autocommit = True  # CREATE/DROP DATABASE cannot run in a transaction
+    with conn.cursor() as cursor:
+        cursor.execute(f'CREATE DATABASE "{name}"')
+    conn.close()
+    return {**ADMIN_CONFIG, "dbname": name}
+
+
+def drop_scratch_database(config):
+    conn = psycopg2.connect(**ADMIN_CONFIG)
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{config["dbname"]}"')
+    conn.close()
+
+
+def drop_table(config, table_name):
+    conn = psycopg2.connect(**config)
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+    conn.commit()
+    conn.close()
+
+
+def throughput(rows, seconds):
+    return {"seconds": round(seconds, 4), "rows": rows, "rows_per_s": round(rows / seconds) if seconds else None}
+
+
+# ---------------- steps ----------------
+
+def bench_parse(path, repeat):
+    seconds, (df, errors) = best_of(repeat, lambda: read_workbook(path))
+    if errors:
+        raise RuntimeError(f"Sheets failed to parse: {errors}")
+    return df, {**throughput(len(df), seconds), "engine": default_engine(path)}
+
+
+def bench_infer_types(df, repeat):
+    seconds, types = best_of(repeat, lambda: {col: db_connect.infer_postgres_type(df[col]) for col in df.columns})
+    return {"seconds": round(seconds, 4), "columns": len(types), "types": types}
+
+
+def bench_insert_dataframe(df, config, repeat):
+    table_name = "bench_insert"
+    conn = psycopg2.connect(**config)
+
+    def setup():
+        with conn.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            db_connect.create_table_from_df(cursor, table_name, df)
+        conn.commit()
+
+    def run():
+        with conn.cursor() as cursor:
+            db_connect.insert_dataframe(cursor, table_name, df)
+        conn.commit()
+
+    seconds, _ = best_of(repeat, run, setup)
+    conn.close()
+    drop_table(config, table_name)
+    return throughput(len(df), seconds)
+
+
+def bench_get_new_rows(df, existing_fraction, repeat):
+    existing = df.iloc[:int(len(df) * existing_fraction)]
+    seconds, new_rows = best_of(repeat, lambda: db_connect.get_new_rows(df, existing))
+    expected = len(df) - len(existing)
+    if len(new_rows) != expected:
+        raise RuntimeError(f"get_new_rows returned {len(new_rows)} rows, expected {expected}")
+    return {**throughput(len(df), seconds), "existing_rows": len(existing), "new_rows": len(new_rows)}
+
+
+def bench_upload(df, config, table_name, existing_fraction, repeat):
+    """Initial load of the older release, then an incremental reload of the full frame per strategy"""
+    older = df.iloc[:int(len(df) * existing_fraction)]
+
+    def upload(frame, **options):
+        return lambda: db_connect.upload_dataframe_to_postgres(
+            frame, table_name, config, unique_indexes=UNIQUE_INDEXES, indexes=INDEXES, key_columns=["IFSC"], **options
+        )
+
+    def reset():
+        drop_table(config, table_name)
+
+    def seed_older():
+        reset()
+        upload(older, incremental=False)()
+
+    results = {}
+    seconds, _ = best_of(repeat, upload(older, incremental=False), reset)
+    results["initial_load"] = throughput(len(older), seconds)
+    for strategy in ["client", "server"]:
+        seconds, _ = best_of(repeat, upload(df, incremental=True, incremental_strategy=strategy), seed_older)
+        results[f"incremental_{strategy}"] = {**throughput(len(df), seconds), "new_rows": len(df) - len(older)}
+    return results
+
+
+def import_api(config):
+    """Import api.py pointed at the scratch database (it reads DB_* at import time)"""
+    for key, env in [("dbname", "DB_NAME"), ("user", "DB_USER"), ("password", "DB_PASSWORD"),
+                     ("host", "DB_HOST"), ("port", "DB_PORT")]:
+        os.environ[env] = str(config[key])
+    return load_module("api", "api.py")
+
+
+def bench_api(api, df, requests, repeat):
+    """POST /api/bank-details through the Flask test client, cache off and on"""
+    client = api.app.test_client()
+    response = client.post("/api/login", json={"username": os.getenv("API_USERNAME", "admin"),
+                                               "password": os.getenv("API_PASSWORD", "password")})
+    headers = {"Authorization": f"Bearer {response.get_json()['token']}"}
+    sample = df[["BANK", "IFSC"]].sample(min(requests, len(df)), random_state=0)
+    pairs = [{"bank_name": bank, "ifsc": ifsc} for bank, ifsc in sample.itertuples(index=False)]
+
+    def run():
+        latencies = []
+        failures = 0
+        for i in range(requests):
+            start = time.perf_counter()
+            status = client.post("/api/bank-details", json=pairs[i % len(pairs)], headers=headers).status_code
+            latencies.append(time.perf_counter() - start)
+            failures += status != 200
+        return latencies, failures
+
+    results = {}
+    for label, cache_size in [("uncached", 0), ("cached", api.IFSC_CACHE_SIZE or 10000)]:
+        api.ifsc_cache = api.LookupCache(cache_size, api.IFSC_CACHE_TTL, api.IFSC_CACHE_NEGATIVE_TTL)
+        run()  # warm up: pool connections, plan cache and (when enabled) the lookup cache
+        seconds, (latencies, failures) = best_of(repeat, run)
+        latencies.sort()
+        results[label] = {
+            "seconds": round(seconds, 4),
+            "requests": requests,
+            "failures": failures,
+            "requests_per_s": round(requests / seconds),
+            "p50_ms": round(load_test.percentile(latencies, 50) * 1000, 3),
+            "p99_ms": round(load_test.percentile(latencies, 99) * 1000, 3)
+        }
+    return results
+
+
+def run_suite(args):
+    path = cached_rbi_workbook(args.data_dir, args.rows, args.sheets, args.seed)
+    results = {}
+
+    print(f"Parsing {path} ...")
+    df, results["parse_workbook"] = bench_parse(path, args.repeat)
+    print("Inferring column types ...")
+    results["infer_postgres_type"] = bench_infer_types(df, args.repeat)
+    print("Computing new rows ...")
+    results["get_new_rows"] = bench_get_new_rows(df, args.existing_fraction, args.repeat)
+
+    config = create_scratch_database()
+    api = None
+    try:
+        print(f"Scratch database {config['dbname']}")
+        print("insert_dataframe ...")
+        results["insert_dataframe"] = bench_insert_dataframe(df, config, args.repeat)
+
+        api = import_api(config)
+        print("upload_dataframe_to_postgres ...")
+        results["upload_dataframe_to_postgres"] = bench_upload(df, config, api.TABLE_NAME,
+                                                               args.existing_fraction, args.repeat)
+
+        # The API step reads the table the last upload left in place (the full frame)
+        print("/api/bank-details ...")
+        results["api_bank_details"] = bench_api(api, df, args.requests, args.repeat)
+    finally:
+        if api is not None and api.db_pool._pool is not None:
+            api.db_pool._pool.closeall()  # DROP DATABASE fails while connections are open
+        drop_scratch_database(config)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": f"{platform.machine()} x{os.cpu_count()}",
+        "rows": args.rows,
+        "sheets": args.sheets,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results
+    }
+
+
+# ---------------- comparison ----------------
+
+def timed_entries(results, prefix=""):
+    """Flatten nested results into {"step.sub": seconds}"""
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if "seconds" in value:
+            yield prefix + key, value["seconds"]
+        else:
+            yield from timed_entries(value, prefix + key + ".")
+
+
+def compare(old, new, threshold):
+    """Print old/new seconds per step; returns the steps slower than `threshold` times"""
+    if (old.get("rows"), old.get("seed")) != (new.get("rows"), new.get("seed")):
+        print(f"WARNING: different data (rows/seed {old.get('rows')}/{old.get('seed')} "
+              f"vs {new.get('rows')}/{new.get('seed')})")
+
+    old_times = dict(timed_entries(old["results"]))
+    regressions = []
+    print(f"\n{'step':<52}{old['commit']:>12}{new['commit']:>12}{'ratio':>8}")
+    for step, seconds in timed_entries(new["results"]):
+        if step not in old_times:
+            print(f"{step:<52}{'-':>12}{seconds:>11.3f}s")
+            continue
+        ratio = seconds / old_times[step] if old_times[step] else float("inf")
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(f"{step:<52}{old_times[step]:>11.3f}s{seconds:>11.3f}s{ratio:>7.2f}x{flag}")
+        if flag:
+            regressions.append(step)
+    return regressions
+
+
+def print_report(report):
+    print(f"\nCommit {report['commit']}  {report['rows']:,} rows  Python {report['python']}  pandas {report['pandas']}")
+    for step, seconds in timed_entries(report["results"]):
+        print(f"  {step:<50}{seconds:>10.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproducible ingestion and lookup benchmarks on synthetic IFSC data")
+    parser.add_argument("--rows", type=int, default=170000)
+    parser.add_argument("--sheets", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--existing-fraction", type=float, default=0.9,
+                        help="share of rows already loaded before the incremental steps")
+    parser.add_argument("--data-dir", default=os.path.join(HERE, ".cache", "benchmark-data"))
+    parser.add_argument("--output", help="results file (default benchmark-results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    output = args.output or os.path.join(HERE, "benchmark-results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} step(s) slower than {args.threshold}x: {', '.join(regressions)}")
+            sys.exit(1)
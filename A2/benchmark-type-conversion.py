@@ -0,0 +1,96 @@
+import argparse
+import os
+import json
+import time
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# Import the converters from db-connect.py
+spec = importlib.util.spec_from_file_location("db_connect", os.path.join(os.path.dirname(__file__), "db-connect.py"))
+db_connect = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(db_connect)
+
+
+# ----------------------------------------
+# BENCHMARK: PER-CELL vs COLUMN CONVERSION
+# ----------------------------------------
+
+def make_wide_frame(rows, width, seed=0):
+    """Synthetic wide frame cycling through int, float-with-NaN, text, IFSC, JSON, date and bool columns"""
+    rng = np.random.default_rng(seed)
+    makers = [
+        lambda: rng.integers(0, 10 ** 6, rows),
+        lambda: np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 1000),
+        lambda: rng.choice(["MUMBAI", "PUNE", "DELHI", "CHENNAI", None], rows),
+        lambda: [f"BANK0{i:06d}" for i in range(rows)],
+        lambda: pd.Series([{"code": i} for i in range(rows)], dtype=object),
+        lambda: pd.to_datetime(rng.integers(1.5e9, 1.7e9, rows), unit="s"),
+        lambda: rng.random(rows) > 0.5,
+    ]
+    return pd.DataFrame({f"col_{i}": makers[i % len(makers)]() for i in range(width)})
+
+
+def legacy_infer(series):
+    """The old rule: JSON only if the first non-null value is a dict/list"""
+    if pd.api.types.is_object_dtype(series.dtype):
+        sample = series.dropna().iloc[0] if not series.dropna().empty else None
+        return "JSONB" if isinstance(sample, (dict, list)) else "TEXT"
+    return db_connect.infer_postgres_type(series)
+
+
+def legacy_records(df):
+    """The old insert_dataframe conversion: a lambda per object cell, then convert_numpy_to_python per cell"""
+    df_copy = df.copy()
+    for col in df_copy.columns:
+        if df_copy[col].dtype == "object":
+            df_copy[col] = df_copy[col].apply(
+                lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x
+            )
+    return [
+        tuple(db_connect.convert_numpy_to_python(value) for value in row)
+        for row in df_copy.to_numpy()
+    ]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-cell and column-at-a-time type conversion")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=42)
+    parser.add_argument("--sample", type=int, default=db_connect.TYPE_SAMPLE_ROWS)
+    parser.add_argument("--detect-text", action="store_true", help="also time numeric/date/IFSC text detection")
+    args = parser.parse_args()
+
+    df = make_wide_frame(args.rows, args.width)
+    print(f"Frame: {args.rows:,} rows x {args.width} columns\n")
+
+    _, old_infer = timed(lambda: [legacy_infer(df[col]) for col in df.columns])
+    schema, new_infer = timed(db_connect.infer_schema, df, args.sample, args.detect_text)
+
+    old_records, old_convert = timed(legacy_records, df)
+    buffer, new_buffer = timed(db_connect.build_column_buffer, df, schema)
+    new_records, new_convert = timed(buffer.records)
+
+    if len(old_records) != len(new_records) or old_records[:100] != new_records[:100]:
+        print("WARNING: converted records differ from the per-cell path")
+
+    print(f"{'step':<34}{'per-cell':>12}{'columnar':>12}{'speedup':>10}")
+    rows = [
+        ("infer types", old_infer, new_infer),
+        ("records for execute_values", old_convert, new_buffer + new_convert),
+    ]
+    for label, old, new in rows:
+        print(f"{label:<34}{old:>11.3f}s{new:>11.3f}s{old / new:>9.1f}x")
+
+    _, csv_time = timed(buffer.to_copy_csv)
+    print(f"{'CSV for COPY (columnar)':<34}{'':>12}{csv_time:>11.3f}s")
+
+    print("\nSlowest columns to convert:")
+    db_connect.print_column_timings(buffer)
@@ -0,0 +1,229 @@
+"""
+Pool of warm, headless Chrome sessions for the scraping bots
+
+Starting Chrome dominates short scraping jobs, so sessions are kept open
+between jobs and handed out one job at a time:
+
+    pool = BrowserPool(size=2)
+    with pool.session() as session:
+        session.driver.get(url)
+        ...                      # downloads land in session.download_dir
+    pool.close()
+
+Each session has its own download directory. A session is recycled (quit
+and replaced on next use) after `max_uses` jobs, when a job raises a
+WebDriverException, or when it fails a liveness check on checkout. Images,
+stylesheets and fonts are blocked by default to cut page-load time.
+"""
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+BLOCKED_RESOURCE_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"],
+    "css": ["*.css"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf"]
+}
+
+
+class BrowserSession:
+    def __init__(self, driver, download_dir):
+        self.driver = driver
+        self.download_dir = download_dir
+        self.uses = 0
+        self.broken = False
+
+    def is_alive(self):
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+
+
+class BrowserPool:
+    """Bounded pool of reusable headless Chrome sessions"""
+
+    def __init__(self, size=2, max_uses=20, headless=True, block=("images", "css", "fonts"),
+                 download_root=None, timeout=120):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.block = tuple(block or ())
+        self._own_root = download_root is None  # only remove a directory we created
+        self.download_root = download_root or tempfile.mkdtemp(prefix="browser-pool-")
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()  # most recently used first, so warm sessions stay warm
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._next_id = 0
+        self._closed = False
+
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+
+    def _options(self, download_dir):
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1366,900")
+
+        prefs = {
+            "download.default_directory": download_dir,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "safebrowsing.enabled": True
+        }
+        if "images" in self.block:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        options.add_experimental_option("prefs", prefs)
+        return options
+
+    def _create(self):
+        with self._lock:
+            self._next_id += 1
+            session_id = self._next_id
+
+        download_dir = os.path.join(self.download_root, f"session-{session_id}")
+        os.makedirs(download_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        driver = webdriver.Chrome(service=Service(), options=self._options(download_dir))
+
+        # Headless Chrome only downloads once a download directory is set over CDP
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", {
+            "behavior": "allow",
+            "downloadPath": download_dir
+        })
+
+        blocked = [pattern for kind in self.block for pattern in BLOCKED_RESOURCE_PATTERNS.get(kind, [])]
+        if blocked:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+
+        print(f"Started browser session {session_id} in {time.perf_counter() - start:.2f}s")
+
+        session = BrowserSession(driver, download_dir)
+        with self._lock:
+            self._all.add(session)
+            self.created += 1
+        return session
+
+    def _discard(self, session):
+        session.quit()
+        shutil.rmtree(session.download_dir, ignore_errors=True)
+        with self._lock:
+            self._all.discard(session)
+
+    def _checkout(self):
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+
+            if session.is_alive():
+                return session
+
+            with self._lock:
+                self.crashed += 1
+            self._discard(session)
+
+    @contextmanager
+    def session(self):
+        """Borrow a session for one job"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No browser session available after {self.timeout}s")
+
+        session = None
+        try:
+            session = self._checkout()
+            yield session
+        except WebDriverException:
+            if session is not None:
+                session.broken = True
+            raise
+        finally:
+            if session is not None:
+                self._checkin(session)
+            self._slots.release()
+
+    def _checkin(self, session):
+        session.uses += 1
+
+        if session.broken or self._closed:
+            if session.broken:
+                with self._lock:
+                    self.crashed += 1
+            self._discard(session)
+            return
+
+        if session.uses >= self.max_uses:
+            with self._lock:
+                self.recycled += 1
+            self._discard(session)
+            return
+
+        try:
+            session.driver.get("about:blank")
+        except WebDriverException:
+            with self._lock:
+                self.crashed += 1
+            self._discard(session)
+            return
+
+        self._idle.put(session)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": len(self._all),
+                "idle": self._idle.qsize(),
+                "created": self.created,
+                "recycled": self.recycled,
+                "crashed": self.crashed
+            }
+
+    def close(self):
+        """Quit every session and remove the download directories"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            remaining = list(self._all)
+        for session in remaining:
+            self._discard(session)
+        if self._own_root:
+            shutil.rmtree(self.download_root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
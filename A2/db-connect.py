@@ -2,7 +2,13 @@ import pandas as pd
 import psycopg2
 import numpy as np
 import json
+import io
+import csv
+import hashlib
+import time
+import uuid
 from psycopg2.extras import execute_values
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
@@ -10,50 +16,171 @@ from datetime import datetime
 # TYPE INFERENCE FUNCTION
 # ----------------------------------------
 
-def infer_postgres_type(series: pd.Series):
+# Non-null values looked at per column when inferring object/text types
+TYPE_SAMPLE_ROWS = 1000
+
+IFSC_PATTERN = r"[A-Z]{4}0[A-Z0-9]{6}"
+
+# Date formats a text column must match to be detected as TIMESTAMP. Only
+# four-digit years, so version strings ("1.2.3"), fractions ("1/2") and
+# ranges ("10-12") never parse as dates.
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S",
+    "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d"
+]
+
+# Share of the sample a date format has to parse for the column to be tried as dates
+DATE_MATCH_THRESHOLD = 0.99
+
+
+class ColumnSchema:
+    """
+    Inferred Postgres type for one column plus how to convert it
+
+    kind is one of integer, float, boolean, timestamp, json, code, text.
+    parsed holds the already-converted column when a text column was
+    detected as numeric or date, so the full-column parse is done once.
+    """
+
+    def __init__(self, name, pg_type, kind, parsed=None):
+        self.name = name
+        self.pg_type = pg_type
+        self.kind = kind
+        self.parsed = parsed
+
+    def __repr__(self):
+        return f"ColumnSchema({self.name!r}, {self.pg_type!r}, {self.kind!r})"
+
+
+def _integer_pg_type(series):
+    if series.empty or (series.min() >= -2147483648 and series.max() <= 2147483647):
+        return "INTEGER"
+    return "BIGINT"
+
+
+def _sample_non_null(series, sample_size):
+    values = series.dropna()
+    if len(values) > sample_size:
+        # Spread the sample over the column instead of only its head
+        step = len(values) // sample_size
+        values = values.iloc[::step][:sample_size]
+    return values
+
+
+def _detect_text_type(series, sample, name):
+    """
+    Numeric, date or IFSC-like detection for a text column
+
+    The sample decides the candidate type (for dates: a DATE_FORMATS entry
+    that parses at least DATE_MATCH_THRESHOLD of it); the whole column is
+    then converted once (vectorized) and the candidate is dropped if any
+    value that was not null fails to convert.
+    """
+    text = sample.astype(str)
+    non_null = series.notna()
+
+    if text.str.fullmatch(IFSC_PATTERN).all():
+        max_length = series.astype(str)[non_null].str.len().max()
+        return ColumnSchema(name, "VARCHAR(11)" if max_length <= 11 else "TEXT", "code")
+
+    # Zero-padded codes (PIN, MICR, account numbers) must stay text
+    if not text.str.match(r"^-?0\d").any():
+        numbers = pd.to_numeric(sample, errors="coerce")
+        if numbers.notna().all():
+            parsed = pd.to_numeric(series, errors="coerce")
+            if not (parsed.isna() & non_null).any():
+                if (parsed.dropna() % 1 == 0).all():
+                    parsed = parsed.astype("Int64")
+                    return ColumnSchema(name, _integer_pg_type(parsed.dropna()), "integer", parsed)
+                return ColumnSchema(name, "DOUBLE PRECISION", "float", parsed)
+
+    for date_format in DATE_FORMATS:
+        if pd.to_datetime(text, format=date_format, errors="coerce").notna().mean() >= DATE_MATCH_THRESHOLD:
+            parsed = pd.to_datetime(series, format=date_format, errors="coerce")
+            if not (parsed.isna() & non_null).any():
+                return ColumnSchema(name, "TIMESTAMP", "timestamp", parsed)
+
+    return None
+
+
+def infer_column_schema(series: pd.Series, sample_size=TYPE_SAMPLE_ROWS, detect_text=False):
+    """
+    Infer the Postgres type of a column from its dtype and a sample
+
+    Object columns look at up to `sample_size` non-null values (not just the
+    first one): dict/list values make the column JSONB. With
+    detect_text=True, text columns are also checked for numbers, dates and
+    IFSC codes.
+    """
     dtype = series.dtype
+    name = series.name
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return ColumnSchema(name, "BOOLEAN", "boolean")
 
     if pd.api.types.is_integer_dtype(dtype):
         # check range for integer vs bigint
-        if series.min() >= -2147483648 and series.max() <= 2147483647:
-            return "INTEGER"
-        return "BIGINT"
+        return ColumnSchema(name, _integer_pg_type(series.dropna()), "integer")
 
-    elif pd.api.types.is_float_dtype(dtype):
-        return "DOUBLE PRECISION"
+    if pd.api.types.is_float_dtype(dtype):
+        return ColumnSchema(name, "DOUBLE PRECISION", "float")
 
-    elif pd.api.types.is_bool_dtype(dtype):
-        return "BOOLEAN"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return ColumnSchema(name, "TIMESTAMP", "timestamp")
 
-    elif pd.api.types.is_datetime64_any_dtype(dtype):
-        return "TIMESTAMP"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return ColumnSchema(name, "TEXT", "text")
 
-    elif pd.api.types.is_categorical_dtype(dtype):
-        return "TEXT"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        sample = _sample_non_null(series, sample_size)
 
-    elif pd.api.types.is_object_dtype(dtype):
-        # detect JSON
-        sample = series.dropna().iloc[0] if not series.dropna().empty else None
+        if pd.api.types.is_object_dtype(dtype) and not sample.empty:
+            is_json = sample.map(lambda x: isinstance(x, (dict, list)))
+            if is_json.any():
+                return ColumnSchema(name, "JSONB", "json")
 
-        if isinstance(sample, (dict, list)):
-            return "JSONB"
-        else:
-            return "TEXT"
+        if detect_text and not sample.empty:
+            detected = _detect_text_type(series, sample, name)
+            if detected is not None:
+                return detected
 
-    else:
-        return "TEXT"
+    return ColumnSchema(name, "TEXT", "text")
+
+
+def infer_schema(df, sample_size=TYPE_SAMPLE_ROWS, detect_text=False):
+    return [infer_column_schema(df[col], sample_size, detect_text) for col in df.columns]
+
+
+def infer_postgres_type(series: pd.Series):
+    return infer_column_schema(series).pg_type
+
+
+def detect_text_columns(df, sample_size=TYPE_SAMPLE_ROWS):
+    """
+    Apply numeric/date/IFSC detection to a frame before it is loaded
+
+    Returns (df, schema): detected numeric and date columns are replaced by
+    their converted values, so every later step (diffs, fingerprints, COPY)
+    sees the same dtypes; schema carries the detected Postgres types (e.g.
+    VARCHAR(11) for IFSC codes) for creating the table.
+    """
+    schema = infer_schema(df, sample_size, detect_text=True)
+    converted = {column.name: column.parsed for column in schema if column.parsed is not None}
+    if converted:
+        df = df.assign(**converted)
+        schema = [ColumnSchema(column.name, column.pg_type, column.kind) for column in schema]
+    return df, schema
 
 
 # ----------------------------------------
 # CREATE TABLE DYNAMICALLY
 # ----------------------------------------
 
-def create_table_from_df(cursor, table_name, df):
+def create_table_from_df(cursor, table_name, df, schema=None):
     columns = []
 
-    for col in df.columns:
-        pg_type = infer_postgres_type(df[col])
-        columns.append(f'"{col}" {pg_type}')
+    for column in schema or infer_schema(df):
+        columns.append(f'"{column.name}" {column.pg_type}')
 
     create_query = f"""
     CREATE TABLE IF NOT EXISTS "{table_name}" (
@@ -64,6 +191,91 @@ def create_table_from_df(cursor, table_name, df):
     cursor.execute(create_query)
 
 
+# Conversion kind for the Postgres types a loaded column can have (format_type spelling)
+PG_TYPE_KINDS = {
+    "smallint": "integer",
+    "integer": "integer",
+    "bigint": "integer",
+    "real": "float",
+    "double precision": "float",
+    "numeric": "float",
+    "boolean": "boolean",
+    "jsonb": "json",
+    "timestamp without time zone": "timestamp"
+}
+
+
+def table_schema(cursor, table_name):
+    """{column: ColumnSchema} of an existing table; empty if it does not exist"""
+    cursor.execute("""
+        SELECT attname, format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum;
+    """, (f'"{table_name}"',))
+    return {
+        name: ColumnSchema(name, pg_type, PG_TYPE_KINDS.get(pg_type.split("(")[0], "text"))
+        for name, pg_type in cursor.fetchall()
+    }
+
+
+def schema_for_table(cursor, table_name, df, schema=None):
+    """
+    Schema for loading `df` into `table_name`
+
+    Numeric columns follow the table's type rather than the frame's dtype:
+    blanks make pandas read an integer column as float, and COPY rejects
+    "44.0" for an INTEGER column.
+    """
+    existing = table_schema(cursor, table_name)
+    schema = schema or infer_schema(df)
+    return [
+        existing[column.name] if column.name in existing and existing[column.name].kind in ("integer", "float")
+        else column
+        for column in schema
+    ]
+
+
+def stream_table_schema(cursor, table_name, chunk):
+    """
+    (schema, created) for a table loaded chunk by chunk
+
+    An existing table keeps its column types. A new one is created from the
+    first chunk with every integer column as BIGINT, since a later chunk may
+    hold larger values than the first.
+    """
+    if table_exists(cursor, table_name):
+        return schema_for_table(cursor, table_name, chunk), False
+
+    schema = [
+        ColumnSchema(column.name, "BIGINT", "integer") if column.kind == "integer" else column
+        for column in infer_schema(chunk)
+    ]
+    create_table_from_df(cursor, table_name, chunk, schema)
+    return schema, True
+
+
+def widen_integer_columns(cursor, table_names, schema, chunk):
+    """
+    Make integer columns DOUBLE PRECISION when `chunk` brings fractions
+
+    For tables created by the current load only (an existing table's types
+    are kept, and such a chunk fails in convert_column). Returns the
+    updated schema.
+    """
+    widened = []
+    for column in schema:
+        values = chunk[column.name].dropna() if column.name in chunk.columns else None
+        if column.kind == "integer" and values is not None and pd.api.types.is_float_dtype(values.dtype) \
+                and not (values == np.floor(values)).all():
+            for name in table_names:
+                cursor.execute(f'ALTER TABLE "{name}" ALTER COLUMN "{column.name}" TYPE DOUBLE PRECISION;')
+            print(f"Column '{column.name}' holds fractions in a later chunk; widened to DOUBLE PRECISION")
+            column = ColumnSchema(column.name, "DOUBLE PRECISION", "float")
+        widened.append(column)
+    return widened
+
+
 # ----------------------------------------
 # INSERT DATA
 # ----------------------------------------
@@ -81,23 +293,13 @@ def convert_numpy_to_python(value):
         return value
 
 
-def insert_dataframe(cursor, table_name, df):
-    df_copy = df.copy()
-
-    # Convert JSON columns
-    for col in df_copy.columns:
-        if df_copy[col].dtype == "object":
-            df_copy[col] = df_copy[col].apply(
-                lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x
-            )
+def insert_dataframe(cursor, table_name, df, schema=None):
+    buffer = build_column_buffer(df, schema)
 
-    # Convert everything to native Python types
-    records = [
-        tuple(convert_numpy_to_python(value) for value in row)
-        for row in df_copy.to_numpy()
-    ]
+    # Native Python values, built column by column
+    records = buffer.records()
 
-    cols = ', '.join([f'"{col}"' for col in df_copy.columns])
+    cols = ', '.join([f'"{col}"' for col in buffer.names])
 
     insert_query = f"""
         INSERT INTO "{table_name}" ({cols})
@@ -107,6 +309,343 @@ def insert_dataframe(cursor, table_name, df):
     execute_values(cursor, insert_query, records)
 
 
+# ----------------------------------------
+# COLUMN BUFFER (VECTORIZED CONVERSION)
+# ----------------------------------------
+
+class ColumnBuffer:
+    """
+    A DataFrame converted for loading, one column at a time
+
+    frame keeps numeric/date dtypes (for the C CSV writer used by COPY) with
+    JSON already serialized; records() turns each column into native Python
+    values with NaN/NaT as None (for execute_values). timings holds the
+    seconds spent converting each column.
+    """
+
+    def __init__(self, frame, schema, timings):
+        self.frame = frame
+        self.schema = schema
+        self.names = list(frame.columns)
+        self.timings = timings
+
+    def __len__(self):
+        return len(self.frame)
+
+    def python_columns(self):
+        """Each column as an object array of Python values, NULLs as None"""
+        columns = []
+        for col in self.frame.columns:
+            series = self.frame[col]
+            values = series.to_numpy(dtype=object, copy=True)
+            missing = series.isna().to_numpy()
+            if missing.any():
+                values[missing] = None  # NaN / NaT / pd.NA -> NULL
+            columns.append(values)
+        return columns
+
+    def records(self):
+        return list(zip(*self.python_columns())) if self.names else []
+
+    def to_copy_csv(self):
+        """CSV for COPY ... (FORMAT csv): strings quoted, NULLs unquoted empty fields"""
+        text = self.frame.to_csv(
+            header=False,
+            index=False,
+            na_rep=COPY_NULL_MARKER,
+            quoting=csv.QUOTE_NONNUMERIC
+        )
+        return text.replace(f'"{COPY_NULL_MARKER}"', "")
+
+
+def convert_column(series, column):
+    """Whole-column conversion for one ColumnSchema"""
+    if column.parsed is not None:
+        return column.parsed.reindex(series.index)
+
+    if column.kind == "json":
+        # Serialize every non-null value so scalars in a JSON column stay valid JSON
+        return series.map(json.dumps, na_action="ignore").astype(object)
+
+    if column.kind == "text" and pd.api.types.is_object_dtype(series.dtype):
+        # dict/list values the type sample missed are still stored as JSON, not as their repr
+        nested = series.map(type).isin((dict, list))
+        if nested.any():
+            series = series.copy()
+            series[nested] = series[nested].map(json.dumps)
+        return series
+
+    if column.kind == "timestamp" and not pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return pd.to_datetime(series, errors="coerce")
+
+    if column.kind == "integer" and pd.api.types.is_float_dtype(series.dtype):
+        # An integer column read as float because of blanks
+        present = series.dropna()
+        if not (present == np.floor(present)).all():
+            raise ValueError(f"Column '{column.name}' holds fractions but is loaded as {column.pg_type}")
+        return series.astype("Int64")
+
+    return series
+
+
+def build_column_buffer(df, schema=None, sample_size=TYPE_SAMPLE_ROWS, detect_text=False):
+    schema = schema or infer_schema(df, sample_size, detect_text)
+    timings = {}
+    columns = {}
+
+    for column in schema:
+        start = time.perf_counter()
+        columns[column.name] = convert_column(df[column.name], column)
+        timings[column.name] = time.perf_counter() - start
+
+    frame = pd.DataFrame(columns, index=df.index) if columns else df.iloc[:, :0]
+    return ColumnBuffer(frame, schema, timings)
+
+
+def print_column_timings(buffer, top=10):
+    ranked = sorted(buffer.timings.items(), key=lambda item: item[1], reverse=True)
+    for name, seconds in ranked[:top]:
+        kind = next(column.kind for column in buffer.schema if column.name == name)
+        print(f"  {name:<24}{kind:<11}{seconds * 1000:>9.2f} ms")
+
+
+# ----------------------------------------
+# BULK LOAD WITH COPY
+# ----------------------------------------
+
+COPY_CHUNK_ROWS = 50000
+
+# NUL can never appear in a Postgres text value, so it is a safe NULL marker
+COPY_NULL_MARKER = "\x00"
+
+
+def dataframe_to_copy_csv(df, schema=None):
+    """
+    Render a DataFrame as CSV for COPY ... (FORMAT csv)
+
+    Strings are quoted so that empty strings stay empty, while NULLs are
+    written as unquoted empty fields. JSON columns are serialized, matching
+    insert_dataframe.
+    """
+    return build_column_buffer(df, schema).to_copy_csv()
+
+
+def copy_dataframe(cursor, table_name, df, chunk_size=COPY_CHUNK_ROWS, schema=None):
+    """Stream a DataFrame into a table with COPY FROM STDIN, one chunk at a time"""
+    cols = ', '.join([f'"{col}"' for col in df.columns])
+    copy_query = f'COPY "{table_name}" ({cols}) FROM STDIN WITH (FORMAT csv)'
+
+    # Resolve once so every chunk is converted the same way
+    schema = schema or schema_for_table(cursor, table_name, df)
+    for start in range(0, len(df), chunk_size):
+        buffer = io.StringIO(dataframe_to_copy_csv(df.iloc[start:start + chunk_size], schema))
+        cursor.copy_expert(copy_query, buffer)
+
+
+def load_dataframe(cursor, table_name, df, method="copy"):
+    """
+    Load rows with COPY (method="copy") or execute_values (method="values")
+
+    If COPY fails, the partial chunk is rolled back and the frame is loaded
+    with execute_values instead.
+    """
+    if method == "values":
+        insert_dataframe(cursor, table_name, df)
+        return
+
+    cursor.execute("SAVEPOINT copy_dataframe;")
+    try:
+        copy_dataframe(cursor, table_name, df)
+        cursor.execute("RELEASE SAVEPOINT copy_dataframe;")
+    except psycopg2.Error as e:
+        print(f"COPY failed ({e}), falling back to execute_values")
+        cursor.execute("ROLLBACK TO SAVEPOINT copy_dataframe;")
+        insert_dataframe(cursor, table_name, df)
+
+
+# ----------------------------------------
+# INDEX MANAGEMENT
+# ----------------------------------------
+
+def normalize_index_spec(spec):
+    """Accept "COL" or ("COL1", "COL2") and return a tuple of column names"""
+    if isinstance(spec, str):
+        return (spec,)
+    return tuple(spec)
+
+
+def index_name(table_name, columns, unique=False):
+    suffix = "key" if unique else "idx"
+    return f"{table_name}_{'_'.join(columns)}_{suffix}".lower()[:63]
+
+
+def create_indexes(cursor, table_name, unique_indexes=None, indexes=None):
+    """
+    Idempotently create unique and regular indexes, then refresh statistics
+
+    Each entry is a column name or a tuple of column names, e.g.
+    unique_indexes=["IFSC"], indexes=[("BANK", "IFSC")]. A unique index fails
+    loudly if the loaded data contains duplicates.
+    """
+    specs = [(normalize_index_spec(s), True) for s in unique_indexes or []] + \
+            [(normalize_index_spec(s), False) for s in indexes or []]
+
+    for columns, unique in specs:
+        name = index_name(table_name, columns, unique)
+        cols = ', '.join([f'"{col}"' for col in columns])
+        cursor.execute(f"""
+            CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS "{name}"
+            ON "{table_name}" ({cols});
+        """)
+
+    if specs:
+        cursor.execute(f'ANALYZE "{table_name}";')
+
+
+def find_seq_scans(plan, table_name):
+    """Return every Seq Scan node on `table_name` in an EXPLAIN (FORMAT JSON) plan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table_name:
+        found.append(plan)
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child, table_name))
+    return found
+
+
+def verify_index_scan(cursor, table_name, columns, params=None):
+    """
+    EXPLAIN an equality lookup on `columns` and raise if it needs a seq scan
+
+    Sequential scans are disabled for the check so the planner only falls
+    back to one when no usable index exists, which makes the result
+    independent of table size. The lookup is a prepared statement whose
+    parameters take each column's own type, EXPLAINed as a generic plan:
+    the plan does not depend on the values, so no literal has to be valid
+    for the column (an empty string is not an integer) and a NULL is not
+    folded into a constant-false filter. `params` gives concrete values
+    instead.
+    """
+    columns = normalize_index_spec(columns)
+    where = ' AND '.join([f'"{col}" = ${i}' for i, col in enumerate(columns, start=1)])
+    statement = f"verify_index_scan_{uuid.uuid4().hex[:8]}"
+
+    prepared = False
+    cursor.execute("SAVEPOINT verify_index_scan;")
+    try:
+        cursor.execute("SET LOCAL enable_seqscan = off;")
+        cursor.execute(f'PREPARE {statement} AS SELECT * FROM "{table_name}" WHERE {where};')
+        prepared = True
+        if params is None:
+            cursor.execute("SET LOCAL plan_cache_mode = force_generic_plan;")
+            params = (None,) * len(columns)
+        placeholders = ', '.join(['%s'] * len(columns))
+        cursor.execute(f"EXPLAIN (FORMAT JSON) EXECUTE {statement}({placeholders})", params)
+        plan = cursor.fetchone()[0][0]["Plan"]
+    finally:
+        cursor.execute("ROLLBACK TO SAVEPOINT verify_index_scan;")
+        if prepared:
+            cursor.execute(f"DEALLOCATE {statement};")  # prepared statements outlive the rollback
+
+    if find_seq_scans(plan, table_name):
+        raise RuntimeError(
+            f"Lookup on {table_name}({', '.join(columns)}) uses a sequential scan; "
+            f"create an index on these columns"
+        )
+
+
+# ----------------------------------------
+# DATA VERSIONING
+# ----------------------------------------
+
+VERSION_TABLE = "table_versions"
+
+
+def bump_table_version(cursor, table_name):
+    """Increment the data version of a table so readers (api.py) drop cached lookups"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS "{VERSION_TABLE}" (
+            "table_name" TEXT PRIMARY KEY,
+            "version" BIGINT NOT NULL,
+            "updated_at" TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    cursor.execute(f"""
+        INSERT INTO "{VERSION_TABLE}" ("table_name", "version")
+        VALUES (%s, 1)
+        ON CONFLICT ("table_name") DO UPDATE
+        SET "version" = "{VERSION_TABLE}"."version" + 1,
+            "updated_at" = NOW();
+    """, (table_name,))
+
+
+# ----------------------------------------
+# INGEST MANIFEST (CHANGE DETECTION)
+# ----------------------------------------
+
+MANIFEST_TABLE = "ingest_manifest"
+WORKBOOK_ITEM = "__workbook__"  # manifest item holding the whole-file hash
+
+
+def dataframe_content_hash(df):
+    """Stable SHA-256 of a DataFrame's column names and values"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def ensure_manifest_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS "{MANIFEST_TABLE}" (
+            "source" TEXT NOT NULL,
+            "item" TEXT NOT NULL,
+            "content_hash" TEXT NOT NULL,
+            "row_count" BIGINT,
+            "updated_at" TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY ("source", "item")
+        );
+    """)
+
+
+def load_manifest(conn_params, source):
+    """Return {item: content_hash} recorded for a source (e.g. a table name)"""
+    conn = psycopg2.connect(**conn_params)
+    try:
+        with conn.cursor() as cursor:
+            ensure_manifest_table(cursor)
+            cursor.execute(
+                f'SELECT "item", "content_hash" FROM "{MANIFEST_TABLE}" WHERE "source" = %s',
+                (source,)
+            )
+            manifest = dict(cursor.fetchall())
+        conn.commit()
+    finally:
+        conn.close()
+
+    return manifest
+
+
+def save_manifest(conn_params, source, entries):
+    """Upsert manifest entries given as {item: (content_hash, row_count)}"""
+    conn = psycopg2.connect(**conn_params)
+    try:
+        with conn.cursor() as cursor:
+            ensure_manifest_table(cursor)
+            execute_values(cursor, f"""
+                INSERT INTO "{MANIFEST_TABLE}" ("source", "item", "content_hash", "row_count")
+                VALUES %s
+                ON CONFLICT ("source", "item") DO UPDATE
+                SET "content_hash" = EXCLUDED."content_hash",
+                    "row_count" = EXCLUDED."row_count",
+                    "updated_at" = NOW();
+            """, [(source, item, content_hash, row_count)
+                  for item, (content_hash, row_count) in entries.items()])
+        conn.commit()
+    finally:
+        conn.close()
+
+
 # ----------------------------------------
 # MAIN FUNCTION
 # ----------------------------------------
@@ -152,14 +691,723 @@ def get_new_rows(df, existing_df):
     return new_rows
 
 
-def upload_dataframe_to_postgres(df, table_name, conn_params, incremental=True):
-    """Upload dataframe to PostgreSQL with optional incremental update"""
+def insert_new_rows_via_staging(cursor, table_name, df, key_columns=None):
+    """
+    Incremental insert computed inside Postgres instead of in pandas
+
+    The batch is COPYed into a temporary staging table and only rows missing
+    from the target are inserted. With key_columns, a row is new when no
+    target row has the same key (the first row per key in frame order wins,
+    by the stage's ordinal column); without
+    them, whole rows are compared with EXCEPT. Returns the inserted count.
+    """
+    stage_name = create_staging_table(cursor, table_name)
+    copy_dataframe(cursor, stage_name, df)
+    return insert_missing_from_staging(cursor, table_name, stage_name, df.columns, key_columns)
+
+
+# Load order of each staged row; COPY leaves it out and the identity fills it
+STAGE_ORDINAL_COLUMN = "_stage_row"
+
+
+def create_staging_table(cursor, table_name):
+    """Create a temporary table shaped like `table_name`, dropped at commit"""
+    stage_name = f"{table_name}_stage"
+    cursor.execute(f"""
+        CREATE TEMP TABLE "{stage_name}"
+        (LIKE "{table_name}" INCLUDING DEFAULTS,
+         "{STAGE_ORDINAL_COLUMN}" BIGINT GENERATED BY DEFAULT AS IDENTITY)
+        ON COMMIT DROP;
+    """)
+    return stage_name
+
+
+def insert_missing_from_staging(cursor, table_name, stage_name, columns, key_columns=None):
+    """
+    Insert staged rows that are not in the target yet, then drop the stage
+
+    With key_columns only the first staged row per key (lowest ordinal) is
+    inserted.
+    """
+    cols = ', '.join([f'"{col}"' for col in columns])
+
+    if key_columns:
+        key_columns = normalize_index_spec(key_columns)
+        keys = ', '.join([f's."{col}"' for col in key_columns])
+        match = ' AND '.join([f't."{col}" = s."{col}"' for col in key_columns])
+        select_cols = ', '.join([f's."{col}"' for col in columns])
+        cursor.execute(f"""
+            INSERT INTO "{table_name}" ({cols})
+            SELECT DISTINCT ON ({keys}) {select_cols}
+            FROM "{stage_name}" s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM "{table_name}" t WHERE {match}
+            )
+            ORDER BY {keys}, s."{STAGE_ORDINAL_COLUMN}";
+        """)
+    else:
+        cursor.execute(f"""
+            INSERT INTO "{table_name}" ({cols})
+            SELECT {cols} FROM "{stage_name}"
+            EXCEPT
+            SELECT {cols} FROM "{table_name}";
+        """)
+
+    inserted = cursor.rowcount
+    cursor.execute(f'DROP TABLE "{stage_name}";')
+    return inserted
+
+
+# ----------------------------------------
+# PARALLEL PARTITIONED LOAD
+# ----------------------------------------
+
+def create_shared_staging_table(cursor, table_name):
+    """
+    UNLOGGED table shaped like `table_name` that other connections can see
+
+    Unlike create_staging_table it is not temporary, so the caller must
+    commit it before workers use it and drop it when done.
+    """
+    stage_name = f"{table_name}_pstage_{uuid.uuid4().hex[:8]}"
+    cursor.execute(f"""
+        CREATE UNLOGGED TABLE "{stage_name}"
+        (LIKE "{table_name}" INCLUDING DEFAULTS,
+         "{STAGE_ORDINAL_COLUMN}" BIGINT GENERATED BY DEFAULT AS IDENTITY);
+    """)
+    return stage_name
+
+
+def split_partitions(df, partitions):
+    """Split a frame into at most `partitions` contiguous, non-empty slices"""
+    size = max(1, -(-len(df) // max(1, partitions)))
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def copy_partition(conn_params, stage_name, df, schema=None):
+    """COPY one partition over its own connection and commit it"""
+    conn = psycopg2.connect(**conn_params)
+    try:
+        cursor = conn.cursor()
+        copy_dataframe(cursor, stage_name, df, schema=schema)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    return len(df)
+
+
+def parallel_copy_to_staging(df, stage_name, conn_params, workers, schema=None):
+    """
+    COPY `df` into `stage_name` over `workers` connections; returns rows copied
+
+    Partitions arrive interleaved, so each row carries its position in `df`
+    as the stage ordinal instead of taking the identity's next value.
+    """
+    schema = (schema or infer_schema(df)) + [ColumnSchema(STAGE_ORDINAL_COLUMN, "BIGINT", "integer")]
+    df = df.assign(**{STAGE_ORDINAL_COLUMN: np.arange(len(df), dtype="int64")})
+    partitions = split_partitions(df, workers)
+
+    with ThreadPoolExecutor(max_workers=len(partitions) or 1) as executor:
+        futures = [
+            executor.submit(copy_partition, conn_params, stage_name, partition, schema)
+            for partition in partitions
+        ]
+        # result() re-raises the first worker failure
+        return sum(future.result() for future in futures)
+
+
+def upload_dataframe_parallel(df, table_name, conn_params, workers=4, incremental=True,
+                              key_columns=None, unique_indexes=None, indexes=None, schema=None):
+    """
+    Load a frame over `workers` connections, then publish it atomically
+
+    Partitions are COPYed concurrently into a shared UNLOGGED staging table,
+    each worker committing on its own connection. Nothing reaches
+    `table_name` until a single INSERT ... SELECT from the stage (only
+    missing rows by key_columns / whole row when incremental), which runs
+    in one transaction together with the version bump and index checks, so
+    readers see either the old rows or all of the new ones. `schema` types
+    the table if this call creates it. Returns the number of rows published.
+    """
+    conn = psycopg2.connect(**conn_params)
+    cursor = conn.cursor()
+    stage_name = None
+
+    try:
+        create_table_from_df(cursor, table_name, df, schema)
+        schema = schema_for_table(cursor, table_name, df)
+        stage_name = create_shared_staging_table(cursor, table_name)
+        conn.commit()
+
+        start = time.perf_counter()
+        copied = parallel_copy_to_staging(df, stage_name, conn_params, workers, schema)
+        print(f"Staged {copied} rows over up to {workers} connections in {time.perf_counter() - start:.2f}s")
+
+        # ---------------- PUBLISH (one transaction) ----------------
+        cursor.execute(f'ANALYZE "{stage_name}";')
+        if incremental:
+            published = insert_missing_from_staging(cursor, table_name, stage_name, df.columns, key_columns)
+        else:
+            cols = ', '.join([f'"{col}"' for col in df.columns])
+            cursor.execute(f'INSERT INTO "{table_name}" ({cols}) SELECT {cols} FROM "{stage_name}";')
+            published = cursor.rowcount
+            cursor.execute(f'DROP TABLE "{stage_name}";')
+
+        if published == 0:
+            print(f"No new rows to insert for table '{table_name}'")
+        else:
+            print(f"Published {published} rows (out of {len(df)} total rows)")
+            bump_table_version(cursor, table_name)
+
+        create_indexes(cursor, table_name, unique_indexes, indexes)
+        for columns in (unique_indexes or []) + (indexes or []):
+            verify_index_scan(cursor, table_name, columns)
+
+        conn.commit()
+        stage_name = None  # dropped by the publish transaction, which is now committed
+    except Exception:
+        conn.rollback()  # also undoes a DROP of the stage inside the failed publish
+        if stage_name is not None:
+            try:
+                cursor.execute(f'DROP TABLE IF EXISTS "{stage_name}";')
+                conn.commit()
+            except psycopg2.Error as e:
+                print(f"Could not drop staging table '{stage_name}': {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Upload completed successfully for table '{table_name}'!")
+    return published
+
+
+# ----------------------------------------
+# BLUE/GREEN TABLE SWAP
+# ----------------------------------------
+
+SHADOW_SUFFIX = "_shadow"
+PREVIOUS_SUFFIX = "_previous"
+
+# Refuse to publish a reload that shrinks the live table by more than this
+SWAP_MAX_SHRINK = 0.5
+
+# How long the swap may wait for the brief exclusive lock on the live table
+SWAP_LOCK_TIMEOUT = "5s"
+
+
+def table_exists(cursor, table_name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (f'"{table_name}"',))
+    return cursor.fetchone()[0]
+
+
+def rename_table_with_indexes(cursor, old_name, new_name):
+    """Rename a table and every index named after it (see index_name)"""
+    cursor.execute(f'ALTER TABLE "{old_name}" RENAME TO "{new_name}";')
+
+    old_prefix = f"{old_name}_".lower()
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s;", (new_name,))
+    for (name,) in cursor.fetchall():
+        if name.startswith(old_prefix):
+            renamed = (f"{new_name}_".lower() + name[len(old_prefix):])[:63]
+            cursor.execute(f'ALTER INDEX "{name}" RENAME TO "{renamed}";')
+
+
+def dedupe_by_key(cursor, table_name, key_columns):
+    """Keep the first loaded row per key (like DISTINCT ON in the staging insert)"""
+    key_columns = normalize_index_spec(key_columns)
+    match = ' AND '.join([f'a."{col}" = b."{col}"' for col in key_columns])
+    cursor.execute(f"""
+        DELETE FROM "{table_name}" a
+        USING "{table_name}" b
+        WHERE {match} AND a.ctid > b.ctid;
+    """)
+    return cursor.rowcount
+
+
+def rows_after_dedupe(chunk, key_columns, seen):
+    """
+    Rows of `chunk` that dedupe_by_key keeps, counted on the source side
+
+    `seen` is a set of key hashes carried across chunks. Rows with a NULL in
+    a key column are never equal to another row, so they all count.
+    """
+    if not key_columns:
+        return len(chunk)
+    keys = chunk[list(normalize_index_spec(key_columns))]
+    has_null = keys.isna().any(axis=1).to_numpy()
+    before = len(seen)
+    seen.update(pd.util.hash_pandas_object(keys[~has_null], index=False).tolist())
+    return int(has_null.sum()) + len(seen) - before
+
+
+def validate_shadow(cursor, shadow_name, table_name, expected_rows=None, max_shrink=SWAP_MAX_SHRINK):
+    """Raise unless the shadow has the expected rows and is not much smaller than the live table"""
+    cursor.execute(f'SELECT count(*) FROM "{shadow_name}";')
+    shadow_rows = cursor.fetchone()[0]
+
+    if shadow_rows == 0:
+        raise RuntimeError(f"Shadow table {shadow_name} is empty")
+    if expected_rows is not None and shadow_rows != expected_rows:
+        raise RuntimeError(f"Shadow table {shadow_name} has {shadow_rows} rows, expected {expected_rows}")
+
+    if table_exists(cursor, table_name):
+        cursor.execute(f'SELECT count(*) FROM "{table_name}";')
+        live_rows = cursor.fetchone()[0]
+        if live_rows and shadow_rows < live_rows * (1 - max_shrink):
+            raise RuntimeError(
+                f"Reload would shrink {table_name} from {live_rows} to {shadow_rows} rows "
+                f"(more than {max_shrink:.0%}); keeping the live table"
+            )
+
+    return shadow_rows
+
+
+def swap_in_shadow(cursor, table_name, keep_previous=True):
+    """
+    Publish <table>_shadow as <table> in the current transaction
+
+    The live table becomes <table>_previous (replacing the older one). The
+    renames need an exclusive lock on the live table only for the instant
+    of the swap; lock_timeout keeps a long-running query from stalling it.
+    """
+    shadow_name = f"{table_name}{SHADOW_SUFFIX}"
+    previous_name = f"{table_name}{PREVIOUS_SUFFIX}"
+
+    cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}';")
+    cursor.execute(f'DROP TABLE IF EXISTS "{previous_name}";')
+    if table_exists(cursor, table_name):
+        rename_table_with_indexes(cursor, table_name, previous_name)
+        if not keep_previous:
+            cursor.execute(f'DROP TABLE "{previous_name}";')
+    rename_table_with_indexes(cursor, shadow_name, table_name)
+    bump_table_version(cursor, table_name)
+
+
+def build_and_swap(table_name, conn_params, load_shadow, unique_indexes=None, indexes=None,
+                   key_columns=None, expected_rows=None, max_shrink=SWAP_MAX_SHRINK,
+                   keep_previous=True):
+    """
+    Load a full snapshot into a shadow table, then swap it in atomically
+
+    load_shadow(cursor, shadow_name) creates and fills the shadow and
+    returns how many rows it should hold according to the source (source
+    rows, counted once per key when key_columns are given; see
+    rows_after_dedupe). The shadow is deduplicated on key_columns, indexed,
+    ANALYZEd and validated against that count (or `expected_rows`) and the
+    shrink guard before the rename. The live table is not touched by the
+    load, so lookups never compete with it and a failed run leaves the live
+    table as it was. Returns the number of rows published.
+    """
+    shadow_name = f"{table_name}{SHADOW_SUFFIX}"
+    conn = psycopg2.connect(**conn_params)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f'DROP TABLE IF EXISTS "{shadow_name}";')
+
+        start = time.perf_counter()
+        source_rows = load_shadow(cursor, shadow_name)
+        if key_columns:
+            duplicates = dedupe_by_key(cursor, shadow_name, key_columns)
+            if duplicates:
+                print(f"Dropped {duplicates} duplicate rows by {', '.join(normalize_index_spec(key_columns))}")
+        print(f"Loaded {shadow_name} in {time.perf_counter() - start:.2f}s")
+
+        # create_indexes ANALYZEs after building; without indexes run it here
+        create_indexes(cursor, shadow_name, unique_indexes, indexes)
+        if not (unique_indexes or indexes):
+            cursor.execute(f'ANALYZE "{shadow_name}";')
+        for columns in (unique_indexes or []) + (indexes or []):
+            verify_index_scan(cursor, shadow_name, columns)
+
+        published = validate_shadow(cursor, shadow_name, table_name,
+                                    source_rows if expected_rows is None else expected_rows, max_shrink)
+
+        # Make the shadow durable first, so the swap transaction is only renames
+        conn.commit()
+
+        swap_in_shadow(cursor, table_name, keep_previous)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        cursor.execute(f'DROP TABLE IF EXISTS "{shadow_name}";')
+        conn.commit()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Swapped {published} rows into '{table_name}'"
+          + (f" (previous version kept as '{table_name}{PREVIOUS_SUFFIX}')" if keep_previous else ""))
+    return published
+
+
+def swap_upload_dataframe(df, table_name, conn_params, unique_indexes=None, indexes=None,
+                          key_columns=None, method="copy", **swap_options):
+    """Full reload of `table_name` from `df` through a shadow table (see build_and_swap)"""
+    def load_shadow(cursor, shadow_name):
+        schema = infer_schema(df)
+        create_table_from_df(cursor, shadow_name, df, schema)
+        load_dataframe(cursor, shadow_name, df, method)
+        return rows_after_dedupe(df, key_columns, set())
+
+    return build_and_swap(table_name, conn_params, load_shadow, unique_indexes, indexes,
+                          key_columns, **swap_options)
+
+
+def swap_upload_chunks(chunks, table_name, conn_params, unique_indexes=None, indexes=None,
+                       key_columns=None, **swap_options):
+    """Full reload from an iterable of DataFrame chunks through a shadow table"""
+    def load_shadow(cursor, shadow_name):
+        expected = 0
+        seen_keys = set()
+        schema = None
+        for chunk in chunks:
+            if schema is None:
+                schema, _ = stream_table_schema(cursor, shadow_name, chunk)
+            else:
+                schema = widen_integer_columns(cursor, [shadow_name], schema, chunk)
+            copy_dataframe(cursor, shadow_name, chunk, schema=schema)
+            expected += rows_after_dedupe(chunk, key_columns, seen_keys)
+        if schema is None:
+            raise RuntimeError(f"No rows received for table '{table_name}'")
+        return expected
+
+    return build_and_swap(table_name, conn_params, load_shadow, unique_indexes, indexes,
+                          key_columns, **swap_options)
+
+
+def rollback_table_swap(table_name, conn_params):
+    """
+    Swap <table>_previous back in (the current table becomes _previous)
+
+    Running it twice restores the newer version again.
+    """
+    previous_name = f"{table_name}{PREVIOUS_SUFFIX}"
+    parked_name = f"{table_name}_parked"
+
+    conn = psycopg2.connect(**conn_params)
+    cursor = conn.cursor()
+    try:
+        if not table_exists(cursor, previous_name):
+            raise RuntimeError(f"No previous version of '{table_name}' to roll back to")
+
+        cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}';")
+        rename_table_with_indexes(cursor, table_name, parked_name)
+        rename_table_with_indexes(cursor, previous_name, table_name)
+        rename_table_with_indexes(cursor, parked_name, previous_name)
+        bump_table_version(cursor, table_name)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Rolled back '{table_name}' to its previous version")
+
+
+# ----------------------------------------
+# ROW FINGERPRINTS
+# ----------------------------------------
+
+FINGERPRINT_COLUMN = "_row_hash"
+
+
+# Stands in for every kind of NULL when keys are compared as text
+KEY_NULL = "\x00"
+
+
+def _stored_text(value):
+    return json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else str(value)
+
+
+def fingerprint_values(df):
+    """
+    `df` with object columns in the form they take in the table
+
+    Non-null values become text (dict/list as sorted JSON) and every NULL
+    becomes None, so a row of mixed-type values hashes the same in the
+    batch and when read back from a TEXT or JSONB column.
+    """
+    columns = {}
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col].dtype):
+            text = df[col].map(_stored_text, na_action="ignore").astype(object)
+            columns[col] = text.where(df[col].notna(), None)
+    return df.assign(**columns) if columns else df
+
+
+def row_fingerprints(df):
+    """Vectorized 64-bit hash of every row's values (the index is ignored)"""
+    return pd.util.hash_pandas_object(fingerprint_values(df), index=False).to_numpy().view("int64")
+
+
+def ensure_fingerprint_column(cursor, table_name):
+    cursor.execute(f'ALTER TABLE "{table_name}" ADD COLUMN IF NOT EXISTS "{FINGERPRINT_COLUMN}" BIGINT;')
+    create_indexes(cursor, table_name, indexes=[FINGERPRINT_COLUMN])
+
+
+def backfill_fingerprints(cursor, table_name, df):
+    """
+    Fill in NULL fingerprints and return how many rows were updated
+
+    Rows loaded before the fingerprint column existed (or by another
+    strategy) have no hash. They are read back, cast to the batch's column
+    types and hashed with row_fingerprints, so an unchanged row gets the
+    same fingerprint as its counterpart in `df`.
+    """
+    columns = list(df.columns)
+    cols = ', '.join([f'"{col}"' for col in columns])
+    cursor.execute(f'SELECT ctid::text, {cols} FROM "{table_name}" WHERE "{FINGERPRINT_COLUMN}" IS NULL')
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    existing = pd.DataFrame([row[1:] for row in rows], columns=columns)
+    for col in columns:
+        try:
+            existing[col] = existing[col].astype(df[col].dtype)
+        except (ValueError, TypeError):
+            pass  # cannot take the batch's type (e.g. NULLs in an int64 column), so the row will not match
+
+    stage_name = f"{table_name}_fingerprint_stage"
+    cursor.execute(f"""
+        CREATE TEMP TABLE "{stage_name}" ("row_id" TID, "fingerprint" BIGINT)
+        ON COMMIT DROP;
+    """)
+    copy_dataframe(cursor, stage_name, pd.DataFrame({
+        "row_id": [row[0] for row in rows],
+        "fingerprint": row_fingerprints(existing)
+    }))
+    cursor.execute(f"""
+        UPDATE "{table_name}" t SET "{FINGERPRINT_COLUMN}" = s."fingerprint"
+        FROM "{stage_name}" s WHERE t.ctid = s."row_id";
+    """)
+    updated = cursor.rowcount
+    cursor.execute(f'DROP TABLE "{stage_name}";')
+    return updated
+
+
+def fetch_columns_via_copy(cursor, query, columns, dtype=None):
+    """Read a query result into a DataFrame through COPY TO STDOUT (no per-row tuples)"""
+    buffer = io.StringIO()
+    cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", buffer)
+    buffer.seek(0)
+    return pd.read_csv(buffer, header=None, names=columns, dtype=dtype, keep_default_na=False, na_values=[""])
+
+
+def _number_text(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def key_text(series, numeric=False):
+    """
+    Text form of a key column that is equal for equal values on both sides
+
+    Every kind of NULL (None, NaN, NaT, pd.NA, an empty CSV field) becomes
+    KEY_NULL. With numeric=True values compare as numbers, so 1, 1.0 and
+    the "1" read back from the table are one key.
+    """
+    if numeric:
+        series = pd.to_numeric(series, errors="coerce").map(_number_text, na_action="ignore")
+    else:
+        series = series.map(_stored_text, na_action="ignore")
+    return series.astype(object).where(series.notna(), KEY_NULL).astype(str)
+
+
+def composite_key(frame, keys, numeric_keys=()):
+    """Join key columns into one text Series so multi-column keys hash quickly"""
+    key = key_text(frame[keys[0]], keys[0] in numeric_keys)
+    for col in keys[1:]:
+        key = key + "\x1f" + key_text(frame[col], col in numeric_keys)
+    return key
+
+
+def diff_by_fingerprint(cursor, table_name, df, key_columns=None):
+    """
+    Split a batch into new, changed and missing rows by comparing fingerprints
+
+    Only the fingerprint column (plus key_columns, when given) is read back
+    from the table. Returns (new_rows, changed_rows, missing_keys); the first
+    two carry the fingerprint column. Without key_columns every row whose
+    fingerprint is unknown counts as new and the other two frames are empty.
+    """
+    fingerprints = row_fingerprints(df)
+    keys = list(normalize_index_spec(key_columns)) if key_columns else []
+
+    select_cols = ', '.join([f'"{col}"' for col in keys + [FINGERPRINT_COLUMN]])
+    existing = fetch_columns_via_copy(
+        cursor,
+        f'SELECT {select_cols} FROM "{table_name}"',
+        keys + [FINGERPRINT_COLUMN],
+        dtype={col: str for col in keys}
+    )
+
+    known = existing[FINGERPRINT_COLUMN].dropna().astype("int64")
+    unchanged = pd.Series(fingerprints).isin(known).to_numpy()
+    candidates = df[~unchanged].assign(**{FINGERPRINT_COLUMN: fingerprints[~unchanged]})
+    empty = df.iloc[0:0]
+
+    if not keys:
+        return candidates, empty, empty
+
+    # Keys come back as text; numeric key columns of the batch are compared by value
+    numeric_keys = {
+        col for col in keys
+        if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)
+    }
+    existing_keys = composite_key(existing, keys, numeric_keys)
+    in_table = composite_key(candidates, keys, numeric_keys).isin(existing_keys).to_numpy()
+    missing = ~existing_keys.isin(composite_key(df, keys, numeric_keys)).to_numpy()
+    missing_keys = existing.loc[missing, keys]
+
+    return candidates[~in_table], candidates[in_table], missing_keys
+
+
+def apply_changed_rows(cursor, table_name, changed_rows, key_columns):
+    """UPDATE rows whose key exists but whose fingerprint changed"""
+    stage_name = f"{table_name}_changed_stage"
+    keys = normalize_index_spec(key_columns)
+    assignments = ', '.join([f'"{col}" = s."{col}"' for col in changed_rows.columns if col not in keys])
+    match = ' AND '.join([f't."{col}" = s."{col}"' for col in keys])
+
+    cursor.execute(f"""
+        CREATE TEMP TABLE "{stage_name}"
+        (LIKE "{table_name}" INCLUDING DEFAULTS)
+        ON COMMIT DROP;
+    """)
+    copy_dataframe(cursor, stage_name, changed_rows)
+    cursor.execute(f'UPDATE "{table_name}" t SET {assignments} FROM "{stage_name}" s WHERE {match};')
+    updated = cursor.rowcount
+    cursor.execute(f'DROP TABLE "{stage_name}";')
+    return updated
+
+
+def delete_missing_rows(cursor, table_name, missing_keys):
+    """DELETE rows whose key no longer appears in the source batch"""
+    stage_name = f"{table_name}_missing_stage"
+    keys = list(missing_keys.columns)
+    cols = ', '.join([f'"{col}"' for col in keys])
+    match = ' AND '.join([f't."{col}" = s."{col}"' for col in keys])
+
+    cursor.execute(f"""
+        CREATE TEMP TABLE "{stage_name}" ON COMMIT DROP AS
+        SELECT {cols} FROM "{table_name}" LIMIT 0;
+    """)
+    copy_dataframe(cursor, stage_name, missing_keys)
+    cursor.execute(f'DELETE FROM "{table_name}" t USING "{stage_name}" s WHERE {match};')
+    deleted = cursor.rowcount
+    cursor.execute(f'DROP TABLE "{stage_name}";')
+    return deleted
+
+
+def sync_by_fingerprint(cursor, table_name, df, key_columns=None, method="copy",
+                        update_changed=False, delete_missing=False):
+    """
+    Incremental load that touches only rows whose fingerprint changed
+
+    New rows are inserted. With key_columns, rows whose key exists but whose
+    values changed are updated when update_changed=True (skipped otherwise),
+    and table rows whose key is absent from the batch are deleted when
+    delete_missing=True. Returns the number of rows written.
+    """
+    ensure_fingerprint_column(cursor, table_name)
+    backfilled = backfill_fingerprints(cursor, table_name, df)
+    if backfilled:
+        print(f"Computed fingerprints for {backfilled} existing rows")
+    new_rows, changed_rows, missing_keys = diff_by_fingerprint(cursor, table_name, df, key_columns)
+
+    written = 0
+    if not new_rows.empty:
+        print(f"Inserting {len(new_rows)} new rows (out of {len(df)} total rows)")
+        load_dataframe(cursor, table_name, new_rows, method)
+        written += len(new_rows)
+
+    if not changed_rows.empty:
+        if update_changed:
+            updated = apply_changed_rows(cursor, table_name, changed_rows, key_columns)
+            print(f"Updated {updated} changed rows")
+            written += updated
+        else:
+            print(f"Skipped {len(changed_rows)} changed rows (pass update_changed=True to apply them)")
+
+    if delete_missing and not missing_keys.empty:
+        deleted = delete_missing_rows(cursor, table_name, missing_keys)
+        print(f"Deleted {deleted} rows no longer present in the source")
+        written += deleted
+
+    return written
+
+
+def upload_dataframe_to_postgres(df, table_name, conn_params, incremental=True,
+                                 unique_indexes=None, indexes=None, method="copy",
+                                 incremental_strategy="client", key_columns=None,
+                                 update_changed=False, delete_missing=False, workers=1,
+                                 detect_text=False):
+    """
+    Upload dataframe to PostgreSQL with optional incremental update
+
+    method="copy" streams rows with COPY FROM STDIN; method="values" uses the
+    original execute_values insert.
+
+    incremental_strategy="client" diffs against the whole table in pandas;
+    "server" stages the batch and lets Postgres insert only missing rows,
+    matched on key_columns (e.g. ["IFSC"]) or on every column;
+    "fingerprint" stores an indexed per-row hash and compares only hashes,
+    optionally updating changed rows and deleting missing ones by key
+    (update_changed / delete_missing, see sync_by_fingerprint).
+
+    unique_indexes / indexes declare key and lookup columns (a column name or
+    a tuple of names). They are created idempotently after the load and each
+    one is verified with EXPLAIN to be usable for equality lookups.
+
+    workers > 1 loads partitions over that many connections and publishes
+    them in one transaction (see upload_dataframe_parallel); the diff is
+    then always done in Postgres, as with the "server" strategy.
+
+    detect_text=True types text columns holding numbers, dates or IFSC
+    codes as such (see detect_text_columns). It only affects tables created
+    by this call; an existing table keeps its column types.
+    """
+    schema = None
+    if detect_text:
+        df, schema = detect_text_columns(df)
+
+    if workers > 1:
+        if incremental and incremental_strategy != "server":
+            print(f"Parallel upload diffs in Postgres; ignoring incremental_strategy='{incremental_strategy}'")
+        upload_dataframe_parallel(df, table_name, conn_params, workers, incremental,
+                                  key_columns, unique_indexes, indexes, schema)
+        return
+
     conn = psycopg2.connect(**conn_params)
     cursor = conn.cursor()
 
-    create_table_from_df(cursor, table_name, df)
+    create_table_from_df(cursor, table_name, df, schema)
     
-    if incremental:
+    if incremental and incremental_strategy == "fingerprint":
+        written = sync_by_fingerprint(
+            cursor, table_name, df, key_columns, method, update_changed, delete_missing
+        )
+
+        if written == 0:
+            print(f"No new rows to insert for table '{table_name}'")
+        else:
+            bump_table_version(cursor, table_name)
+    elif incremental and incremental_strategy == "server":
+        # Diff inside Postgres so client memory does not grow with the table
+        inserted = insert_new_rows_via_staging(cursor, table_name, df, key_columns)
+
+        if inserted == 0:
+            print(f"No new rows to insert for table '{table_name}'")
+        else:
+            print(f"Inserted {inserted} new rows (out of {len(df)} total rows)")
+            bump_table_version(cursor, table_name)
+    elif incremental:
         # Get existing data and find new rows only
         existing_df = get_existing_data(cursor, table_name, df)
         new_data = get_new_rows(df, existing_df)
@@ -168,10 +1416,16 @@ def upload_dataframe_to_postgres(df, table_name, conn_params, incremental=True):
             print(f"No new rows to insert for table '{table_name}'")
         else:
             print(f"Inserting {len(new_data)} new rows (out of {len(df)} total rows)")
-            insert_dataframe(cursor, table_name, new_data)
+            load_dataframe(cursor, table_name, new_data, method)
+            bump_table_version(cursor, table_name)
     else:
         # Insert all data without checking
-        insert_dataframe(cursor, table_name, df)
+        load_dataframe(cursor, table_name, df, method)
+        bump_table_version(cursor, table_name)
+
+    create_indexes(cursor, table_name, unique_indexes, indexes)
+    for columns in (unique_indexes or []) + (indexes or []):
+        verify_index_scan(cursor, table_name, columns)
 
     conn.commit()
     cursor.close()
@@ -180,6 +1434,69 @@ def upload_dataframe_to_postgres(df, table_name, conn_params, incremental=True):
     print(f"Upload completed successfully for table '{table_name}'!")
 
 
+def upload_chunks_to_postgres(chunks, table_name, conn_params, incremental=True,
+                              key_columns=None, unique_indexes=None, indexes=None):
+    """
+    Upload an iterable of DataFrame chunks in one transaction
+
+    Chunks are COPYed as they arrive, so memory is bounded by the chunk size
+    rather than by the total row count. A new table is created from the
+    first chunk (see stream_table_schema) and widened if a later chunk
+    needs it; an existing table keeps its types. With incremental=True chunks go to a staging table and only
+    missing rows (by key_columns, or whole-row) are inserted at the end.
+    Returns the number of rows received.
+    """
+    conn = psycopg2.connect(**conn_params)
+    cursor = conn.cursor()
+
+    try:
+        target = None
+        columns = None
+        received = 0
+
+        for chunk in chunks:
+            if target is None:
+                schema, created = stream_table_schema(cursor, table_name, chunk)
+                target = create_staging_table(cursor, table_name) if incremental else table_name
+                columns = list(chunk.columns)
+            elif created:
+                schema = widen_integer_columns(cursor, dict.fromkeys([table_name, target]), schema, chunk)
+
+            copy_dataframe(cursor, target, chunk, schema=schema)
+            received += len(chunk)
+
+        if received == 0:
+            print(f"No rows received for table '{table_name}'")
+            conn.rollback()
+            return 0
+
+        if incremental:
+            inserted = insert_missing_from_staging(cursor, table_name, target, columns, key_columns)
+        else:
+            inserted = received
+
+        if inserted == 0:
+            print(f"No new rows to insert for table '{table_name}'")
+        else:
+            print(f"Inserted {inserted} new rows (out of {received} rows streamed)")
+            bump_table_version(cursor, table_name)
+
+        create_indexes(cursor, table_name, unique_indexes, indexes)
+        for columns_spec in (unique_indexes or []) + (indexes or []):
+            verify_index_scan(cursor, table_name, columns_spec)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Upload completed successfully for table '{table_name}'!")
+    return received
+
+
 # ----------------------------------------
 # EXAMPLE USAGE
 # ----------------------------------------
@@ -0,0 +1,386 @@
+"""
+Workbook ingestion for the RBI IFSC file
+
+Sheets are parsed in a process pool, one sheet per task, and handed back in
+workbook order. Each worker opens the workbook read-only and parses only its
+own sheet, so each sheet is parsed once instead of the whole file being
+re-read for every pd.read_excel call. The module has no import-time side effects, which keeps
+it safe for spawn-based process pools (Windows).
+
+For bounded memory, stream_workbook_chunks() reads sheets row by row and
+yields normalized DataFrames of at most `chunk_size` rows, and prefetch()
+runs such a generator in a background thread behind a bounded queue so
+parsing overlaps loading without running ahead of it.
+
+Benchmark on a real workbook:
+    python excel_ingest.py path/to/IFSC.xlsx
+"""
+import os
+import sys
+import time
+import queue
+import itertools
+import threading
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+XLSX_EXTENSIONS = (".xlsx", ".xlsm", ".xltx", ".xltm")
+
+
+def is_xlsx(excel_path):
+    return str(excel_path).lower().endswith(XLSX_EXTENSIONS)
+
+
+def available_engines():
+    """.xlsx engines usable here, fastest first"""
+    engines = []
+    if importlib.util.find_spec("python_calamine"):
+        engines.append("calamine")  # Rust reader, pandas >= 2.2
+    if importlib.util.find_spec("openpyxl"):
+        engines.append("openpyxl")
+    return engines
+
+
+def default_engine(excel_path=None):
+    """
+    Fastest engine for `excel_path`, or None to let pandas pick one
+
+    Only .xlsx-family files get a forced engine; anything else (.xls via
+    xlrd, .ods, .xlsb) is left to pandas' detection by extension.
+    """
+    if excel_path is not None and not is_xlsx(excel_path):
+        return None
+    engines = available_engines()
+    return engines[0] if engines else None
+
+
+def list_sheets(excel_path, engine=None):
+    with pd.ExcelFile(excel_path, engine=engine) as xl_file:
+        return xl_file.sheet_names
+
+
+def read_sheet(excel_path, sheet_name, engine=None):
+    """Parse one sheet; returns (sheet_name, df, error, seconds)"""
+    start = time.perf_counter()
+    try:
+        df = pd.read_excel(excel_path, sheet_name=sheet_name, engine=engine)
+        return sheet_name, df, None, time.perf_counter() - start
+    except Exception as e:
+        return sheet_name, None, e, time.perf_counter() - start
+
+
+def iter_workbook_sheets(excel_path, engine=None, workers=None):
+    """
+    Yield (sheet_name, df, error, seconds) for every sheet, in workbook order
+
+    With workers=1 (or a single sheet) all sheets are read through one
+    ExcelFile handle in this process; otherwise sheets are parsed in a
+    process pool of up to `workers` processes. By default the pool is used
+    for openpyxl (one process per CPU) but not for calamine, which parses
+    faster than frames can be pickled back from a worker. Frames
+    are yielded as soon as they and all earlier sheets are ready, so callers
+    can stream them straight into the loader.
+    """
+    engine = engine or default_engine(excel_path)
+    sheet_names = list_sheets(excel_path, engine)
+    if workers is None:
+        workers = 1 if engine == "calamine" else os.cpu_count() or 1
+    workers = min(workers, len(sheet_names))
+
+    if workers <= 1:
+        with pd.ExcelFile(excel_path, engine=engine) as xl_file:
+            for sheet_name in sheet_names:
+                yield read_sheet(xl_file, sheet_name, engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(read_sheet, excel_path, sheet_name, engine)
+            for sheet_name in sheet_names
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def read_workbook(excel_path, engine=None, workers=None):
+    """Parse every sheet and return (combined_df, errors_by_sheet)"""
+    frames = []
+    errors = {}
+    for sheet_name, df, error, _ in iter_workbook_sheets(excel_path, engine, workers):
+        if error is not None:
+            errors[sheet_name] = error
+        else:
+            frames.append(df)
+
+    combined_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return combined_df, errors
+
+
+# ----------------------------------------
+# STREAMING (BOUNDED MEMORY)
+# ----------------------------------------
+
+def streaming_engine(excel_path):
+    """
+    Engine for stream_workbook_chunks(): openpyxl for .xlsx files
+
+    openpyxl's read-only mode is the only reader here that holds one row at
+    a time; calamine loads a sheet's cells into memory before the first row
+    comes out, which is fast but not bounded by the chunk size.
+    """
+    if is_xlsx(excel_path) and "openpyxl" in available_engines():
+        return "openpyxl"
+    return default_engine(excel_path)
+
+
+def iter_sheet_rows(excel_path, sheet_name, engine=None):
+    """
+    Yield the raw row tuples of one sheet
+
+    openpyxl streams the rows. calamine reads the whole sheet before
+    yielding, and other formats (.xls, .ods, ...) have no row reader here,
+    so their sheet is read whole by pandas first; with those engines memory
+    is bounded by the largest sheet rather than by the chunk size.
+    """
+    if engine == "calamine":
+        from python_calamine import CalamineWorkbook
+        yield from CalamineWorkbook.from_path(excel_path).get_sheet_by_name(sheet_name).iter_rows()
+        return
+
+    if engine != "openpyxl" and not is_xlsx(excel_path):
+        sheet = pd.read_excel(excel_path, sheet_name=sheet_name, header=None, engine=engine)
+        sheet = sheet.astype(object).where(sheet.notna(), None)
+        yield from sheet.itertuples(index=False, name=None)
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        yield from workbook[sheet_name].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_chunks(excel_path, sheet_name, chunk_size=50000, engine=None):
+    """Yield one sheet as raw DataFrames of at most `chunk_size` rows (first row is the header)"""
+    rows = iter_sheet_rows(excel_path, sheet_name, engine)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    columns = [
+        str(col) if col not in (None, "") else f"Unnamed: {i}"
+        for i, col in enumerate(header)
+    ]
+
+    while True:
+        batch = list(itertools.islice(rows, chunk_size))
+        if not batch:
+            return
+        yield pd.DataFrame.from_records(batch, columns=columns)
+
+
+def normalize_chunk(chunk, dtypes=None):
+    """
+    Clean a raw chunk the way pd.read_excel would
+
+    Blank cells become NaN, fully empty rows are dropped and column types are
+    inferred; a float column without blanks holding only whole numbers is
+    read as integers, as pd.read_excel does. When `dtypes` (from the first
+    chunk) is given, every column is cast to it so all chunks match the
+    table schema. An integer column that meets fractions is widened to
+    float in `dtypes` (the loader widens the table column to match); any
+    other column that cannot be cast (e.g. text in a numeric column) raises
+    ValueError naming the column, instead of failing later inside COPY.
+    """
+    chunk = chunk.replace("", np.nan).dropna(how="all").infer_objects()
+
+    # calamine returns every number as a float; pandas' reader turns whole ones back into ints
+    for col in chunk.columns:
+        values = chunk[col]
+        if pd.api.types.is_float_dtype(values.dtype) and len(values) and values.notna().all():
+            if (values == np.floor(values)).all() and values.abs().max() < 2 ** 53:
+                chunk[col] = values.astype("Int64")
+
+    if dtypes is not None:
+        for col, dtype in dtypes.items():
+            if col not in chunk.columns:
+                continue
+            if isinstance(dtype, pd.Int64Dtype) and pd.api.types.is_float_dtype(chunk[col].dtype):
+                present = chunk[col].dropna()
+                if not (present == np.floor(present)).all():
+                    dtypes[col] = dtype = np.dtype("float64")
+            if chunk[col].dtype != dtype:
+                try:
+                    chunk[col] = chunk[col].astype(dtype)
+                except (ValueError, TypeError) as e:
+                    raise ValueError(
+                        f"Column '{col}' does not match the schema from the first chunk: "
+                        f"expected {dtype}, got {chunk[col].dtype} ({e})"
+                    ) from e
+
+    return chunk.reset_index(drop=True)
+
+
+def chunk_schema(chunk):
+    """
+    Column dtypes that later chunks are cast to
+
+    Integer columns become nullable Int64, so a later chunk with blanks in
+    them (read as float) still loads as integers; columns that are entirely
+    blank are typed as text.
+    """
+    dtypes = {}
+    for col in chunk.columns:
+        if chunk[col].isna().all():
+            dtypes[col] = object
+        elif pd.api.types.is_integer_dtype(chunk[col].dtype):
+            dtypes[col] = pd.Int64Dtype()
+        else:
+            dtypes[col] = chunk[col].dtype
+    return dtypes
+
+
+def stream_workbook_chunks(excel_path, chunk_size=50000, engine=None, sheet_names=None):
+    """
+    Yield normalized chunks of every sheet, in workbook order
+
+    The column types of the first non-empty chunk become the schema for all
+    later chunks (see chunk_schema), except that integer columns are widened
+    to float when a later chunk holds fractions; a later chunk that does not
+    fit otherwise raises ValueError naming the sheet and column. Without an
+    engine, rows are read with streaming_engine().
+    """
+    engine = engine or streaming_engine(excel_path)
+    sheet_names = sheet_names or list_sheets(excel_path, engine)
+    dtypes = None
+
+    for sheet_name in sheet_names:
+        for raw_chunk in iter_sheet_chunks(excel_path, sheet_name, chunk_size, engine):
+            try:
+                chunk = normalize_chunk(raw_chunk, dtypes)
+                if chunk.empty:
+                    continue
+
+                if dtypes is None:
+                    dtypes = chunk_schema(chunk)
+                    chunk = normalize_chunk(chunk, dtypes)
+            except ValueError as e:
+                raise ValueError(f"Sheet '{sheet_name}': {e}") from e
+
+            yield chunk
+
+
+class PrefetchStats:
+    def __init__(self):
+        self.items = 0
+        self.max_queued = 0
+        self.producer_blocked = 0.0  # time parsing waited on a full queue (backpressure)
+        self.consumer_waited = 0.0   # time loading waited on an empty queue
+
+
+def prefetch(iterable, depth=2, stats=None):
+    """
+    Iterate `iterable` in a background thread, handing items over through a
+    queue of at most `depth` items
+
+    The producer blocks while the queue is full, so at most depth + 2 items
+    (queued, being produced, being consumed) are alive at once. Exceptions
+    raised by the producer are re-raised in the consumer.
+    """
+    stats = stats or PrefetchStats()
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                stats.producer_blocked += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    producer = threading.Thread(target=produce, name="prefetch", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            start = time.perf_counter()
+            item, error = items.get()
+            stats.consumer_waited += time.perf_counter() - start
+            stats.max_queued = max(stats.max_queued, items.qsize() + 1)
+
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            stats.items += 1
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def peak_memory_mb():
+    """Process memory high-water mark in MiB, or None if it cannot be read"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KiB elsewhere
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2  # Windows
+    except (ImportError, AttributeError):
+        return None
+
+
+def time_per_sheet_reads(excel_path, engine=None):
+    """The original approach: re-open and re-parse the file for every sheet"""
+    start = time.perf_counter()
+    frames = [
+        pd.read_excel(excel_path, sheet_name=sheet_name, engine=engine)
+        for sheet_name in pd.ExcelFile(excel_path, engine=engine).sheet_names
+    ]
+    pd.concat(frames, ignore_index=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python excel_ingest.py <workbook.xlsx>")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    print(f"Workbook: {path} ({len(list_sheets(path))} sheets)")
+    print(f"Engines available: {available_engines()}\n")
+
+    print(f"{'mode':<36}{'wall time':>12}")
+    for engine in available_engines():
+        print(f"{'per-sheet read_excel, ' + engine:<36}{time_per_sheet_reads(path, engine):>11.2f}s")
+
+        for workers in (1, None):
+            start = time.perf_counter()
+            read_workbook(path, engine, workers)
+            label = f"{'single handle' if workers == 1 else 'process pool'}, {engine}"
+            print(f"{label:<36}{time.perf_counter() - start:>11.2f}s")
@@ -2,158 +2,454 @@ import os
 import sys
 import time
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from contextlib import contextmanager
 import glob
+import shutil
+import hashlib
 import importlib.util
+import requests
+from browser_pool import BrowserPool
+from rbi_http import select_excel_link, fetch_excel_via_http, load_html_fixture
+from ifsc_snapshot import export_snapshot
+from excel_ingest import (
+    default_engine, streaming_engine, iter_workbook_sheets, list_sheets,
+    stream_workbook_chunks, prefetch, PrefetchStats, peak_memory_mb
+)
 
 # Import the upload function from db-connect.py
 spec = importlib.util.spec_from_file_location("db_connect", os.path.join(os.path.dirname(__file__), "db-connect.py"))
 db_connect = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(db_connect)
 upload_dataframe_to_postgres = db_connect.upload_dataframe_to_postgres
+upload_chunks_to_postgres = db_connect.upload_chunks_to_postgres
+load_manifest = db_connect.load_manifest
+save_manifest = db_connect.save_manifest
+dataframe_content_hash = db_connect.dataframe_content_hash
 
 RBI_URL = "https://website.rbi.org.in/web/rbi/ifscdetails"
 DOWNLOAD_FOLDER = os.path.abspath("downloads")
 os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
 
-print("Launching browser to RBI website...")
-
-# Configure Chrome options for download
-chrome_options = Options()
-prefs = {
-    "download.default_directory": DOWNLOAD_FOLDER,
-    "download.prompt_for_download": False,
-    "download.directory_upgrade": True,
-    "safebrowsing.enabled": True
+connection_parameters = {
+    "dbname": "automation_db",
+    "user": "postgres",
+    "password": "2606",
+    "host": "localhost",
+    "port": "5432"
 }
-chrome_options.add_experimental_option("prefs", prefs)
 
-service = Service()
-driver = webdriver.Chrome(service=service, options=chrome_options)
+table_name = "ifsc_codes"
 
-try:
-    # Navigate to RBI IFSC page
-    print(f"Opening RBI IFSC page: {RBI_URL}")
-    driver.get(RBI_URL)
-    
-    # Wait for page to load
-    wait = WebDriverWait(driver, 20)
-    
-    # Search for the Excel IFSC link (looking for link containing "Excel" or "IFSC" keywords)
-    print("Searching for Excel IFSC codes download link...")
-    time.sleep(3)  # Allow page to fully load
-    
-    # Try multiple selectors to find the Excel download link
-    excel_link = None
+# Excel parsing: unset picks the fastest installed for .xlsx (calamine, then openpyxl)
+# and leaves other formats (.xls via xlrd) to pandas
+EXCEL_ENGINE = os.getenv("EXCEL_ENGINE") or None
+EXCEL_WORKERS = int(os.getenv("EXCEL_WORKERS", "0")) or None  # None = pick per engine
+
+# FETCH_MODE: auto (HTTP, then Selenium), http or selenium
+FETCH_MODE = os.getenv("FETCH_MODE", "auto")
+RBI_HTML_FILE = os.getenv("RBI_HTML_FILE")  # saved copy of the RBI page for offline runs
+
+# Headless browser pool used by the Selenium fallback
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "20"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "1") != "0"
+
+# Explicit waits instead of fixed sleeps (seconds)
+LINK_TIMEOUT = float(os.getenv("LINK_TIMEOUT", "20"))
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", "300"))
+DOWNLOAD_POLL_INTERVAL = 0.5
+DOWNLOAD_STABLE_POLLS = 3  # unchanged size checks in a row before a download counts as done
+TEMP_DOWNLOAD_SUFFIXES = (".crdownload", ".tmp", ".part")
+
+# INGEST_MODE=stream pipes the workbook to Postgres in chunks with bounded memory
+INGEST_MODE = os.getenv("INGEST_MODE", "frame")
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "20000"))
+STREAM_QUEUE_DEPTH = int(os.getenv("STREAM_QUEUE_DEPTH", "2"))
+
+# UPLOAD_WORKERS > 1 COPYs partitions over that many connections, then publishes in one transaction
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "1"))
+
+# DETECT_TEXT_TYPES=1 types text columns holding numbers, dates or IFSC codes when
+# ifsc_codes is created (frame mode); an existing table keeps its types
+DETECT_TEXT_TYPES = os.getenv("DETECT_TEXT_TYPES", "0") == "1"
+
+# LOAD_MODE=swap reloads into a shadow table and renames it over ifsc_codes
+# (previous version kept as ifsc_codes_previous for rollback)
+LOAD_MODE = os.getenv("LOAD_MODE", "incremental")
+
+# Memory-mapped snapshot of ifsc_codes for api.py's LOOKUP_MODE=snapshot; exported only
+# when LOOKUP_MODE=snapshot or SNAPSHOT_EXPORT=1
+SNAPSHOT_EXPORT = os.getenv("SNAPSHOT_EXPORT", "1" if os.getenv("LOOKUP_MODE") == "snapshot" else "0") == "1"
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ifsc_codes.snap"))
+
+
+def file_content_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+phase_times = {}
+_browser_pool = None
+
+
+def get_browser_pool():
+    """Shared headless browser pool, created on first use"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            size=BROWSER_POOL_SIZE,
+            max_uses=BROWSER_MAX_USES,
+            headless=BROWSER_HEADLESS
+        )
+    return _browser_pool
+
+
+@contextmanager
+def timed_phase(name):
+    """Record how long a phase of the run takes"""
+    start = time.perf_counter()
     try:
-        # Look for links containing "Excel" and "IFSC" in text or href
-        links = driver.find_elements(By.TAG_NAME, "a")
-        for link in links:
-            link_text = link.text.lower()
-            href = link.get_attribute("href") or ""
-            if ("excel" in link_text or "excel" in href.lower()) and \
-               ("ifsc" in link_text or "ifsc" in href.lower()):
-                excel_link = link
-                print(f"Found link: {link.text}")
-                break
-        
-        # Alternative: look for .xlsx or .xls files
-        if not excel_link:
-            for link in links:
-                href = link.get_attribute("href") or ""
-                if ".xlsx" in href.lower() or ".xls" in href.lower():
-                    excel_link = link
-                    print(f"Found Excel file link: {link.text}")
-                    break
-    except Exception as e:
-        print(f"Error finding link: {e}")
+        yield
+    finally:
+        phase_times[name] = phase_times.get(name, 0.0) + time.perf_counter() - start
+
+
+def print_phase_times():
+    if not phase_times:
+        return
+    print(f"\n{'='*60}")
+    print("Phase timings:")
+    for name, seconds in phase_times.items():
+        print(f"  {name:<24}{seconds:>8.2f}s")
+    print(f"  {'total':<24}{sum(phase_times.values()):>8.2f}s")
+    print(f"{'='*60}")
+
+
+def export_lookup_snapshot(changed=True):
+    """Rewrite the lookup snapshot after a load (or if it does not exist yet)"""
+    if not SNAPSHOT_EXPORT or (not changed and os.path.exists(SNAPSHOT_PATH)):
+        return
+    with timed_phase("snapshot export"):
+        export_snapshot(connection_parameters, table_name, SNAPSHOT_PATH,
+                        hidden_columns={db_connect.FINGERPRINT_COLUMN})
+
+
+def find_excel_link(driver):
+    """Return the Excel IFSC download link on the page, or None"""
+    links = driver.find_elements(By.TAG_NAME, "a")
+    return select_excel_link([(link, link.text, link.get_attribute("href")) for link in links])
+
+
+def snapshot_excel_files(folder):
+    """Map each Excel file in folder to its modification time"""
+    snapshot = {}
+    for pattern in ("*.xlsx", "*.xls"):
+        for path in glob.glob(os.path.join(folder, pattern)):
+            try:
+                snapshot[path] = os.path.getmtime(path)
+            except OSError:
+                pass
+    return snapshot
+
+
+def wait_for_download(folder, before, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Block until a new or rewritten Excel file in `folder` has finished downloading
+
+    A download counts as finished when no browser temp file (.crdownload etc.)
+    is left and the candidate file sizes have not changed for
+    DOWNLOAD_STABLE_POLLS polls in a row. Raises TimeoutError after `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    last_sizes = None
+    stable_polls = 0
+
+    while time.monotonic() < deadline:
+        in_progress = [
+            name for name in os.listdir(folder)
+            if name.lower().endswith(TEMP_DOWNLOAD_SUFFIXES)
+        ]
+
+        sizes = {}
+        for path, mtime in snapshot_excel_files(folder).items():
+            if before.get(path) != mtime:
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError:
+                    pass
+
+        if sizes and not in_progress and sizes == last_sizes:
+            stable_polls += 1
+            if stable_polls >= DOWNLOAD_STABLE_POLLS:
+                return max(sizes, key=os.path.getmtime)
+        else:
+            stable_polls = 0
+
+        last_sizes = sizes
+        time.sleep(DOWNLOAD_POLL_INTERVAL)
+
+    raise TimeoutError(f"Download did not complete within {timeout:.0f}s")
+
+
+def load_workbook_streaming(excel_path):
+    """
+    Read -> normalize -> COPY the workbook chunk by chunk
+
+    Parsing runs in a background thread and hands chunks to the loader
+    through a queue of STREAM_QUEUE_DEPTH chunks, so peak memory is set by
+    STREAM_CHUNK_ROWS rather than by the size of the file.
+    """
+    engine = EXCEL_ENGINE or streaming_engine(excel_path)
+    print(f"\nStreaming Excel file to PostgreSQL "
+          f"(engine: {engine or 'pandas default'}, {STREAM_CHUNK_ROWS} rows/chunk, queue depth {STREAM_QUEUE_DEPTH})...")
+
+    stats = PrefetchStats()
+    start = time.perf_counter()
+    chunks = prefetch(
+        stream_workbook_chunks(excel_path, STREAM_CHUNK_ROWS, engine),
+        depth=STREAM_QUEUE_DEPTH,
+        stats=stats
+    )
+
+    if LOAD_MODE == "swap":
+        rows = db_connect.swap_upload_chunks(
+            chunks,
+            table_name,
+            connection_parameters,
+            key_columns=["IFSC"],
+            unique_indexes=["IFSC"],
+            indexes=[("BANK", "IFSC")]
+        )
+    else:
+        rows = upload_chunks_to_postgres(
+            chunks,
+            table_name,
+            connection_parameters,
+            incremental=True,
+            key_columns=["IFSC"],
+            unique_indexes=["IFSC"],
+            indexes=[("BANK", "IFSC")]
+        )
+
+    peak = peak_memory_mb()
+    print(f"\n{'='*60}")
+    print(f"Streamed {rows} rows in {stats.items} chunks in {time.perf_counter() - start:.2f}s")
+    print(f"Parser blocked on full queue: {stats.producer_blocked:.2f}s, "
+          f"loader waited on parser: {stats.consumer_waited:.2f}s, max queued: {stats.max_queued}")
+    print(f"Memory high-water mark: {f'{peak:.1f} MiB' if peak is not None else 'unavailable'}")
+    print(f"{'='*60}")
+
+
+def download_with_selenium(pool):
+    """Download the workbook by clicking the link in a pooled headless Chrome session"""
+    print("Getting browser session for RBI website...")
+    checkout_start = time.perf_counter()
+
+    with pool.session() as session:
+        phase_times["browser checkout"] = time.perf_counter() - checkout_start
+        driver = session.driver
+
+        # Navigate to RBI IFSC page
+        with timed_phase("page load"):
+            print(f"Opening RBI IFSC page: {RBI_URL}")
+            driver.get(RBI_URL)
+    
+        # Search for the Excel IFSC link (looking for link containing "Excel" or "IFSC" keywords)
+        with timed_phase("find link"):
+            print("Searching for Excel IFSC codes download link...")
+            wait = WebDriverWait(driver, LINK_TIMEOUT, ignored_exceptions=(StaleElementReferenceException,))
+            try:
+                # Poll until the (possibly script-rendered) link shows up
+                excel_link = wait.until(lambda d: find_excel_link(d) or False)
+            except TimeoutException:
+                raise Exception("Could not find Excel IFSC codes download link on the page")
+            print(f"Found link: {excel_link.text}")
     
-    if excel_link:
         # Click the download link
-        print("Downloading Excel file...")
-        excel_link.click()
+        with timed_phase("download"):
+            print("Downloading Excel file...")
+            existing_files = snapshot_excel_files(session.download_dir)
+            excel_link.click()
         
-        # Wait for download to complete
-        print("Waiting for download to complete...")
-        time.sleep(10)  # Give enough time for download
-        
-        # Find the most recent Excel file in downloads folder
-        excel_files = glob.glob(os.path.join(DOWNLOAD_FOLDER, "*.xlsx")) + \
-                      glob.glob(os.path.join(DOWNLOAD_FOLDER, "*.xls"))
-        
-        if excel_files:
-            # Get the most recently downloaded file
-            excel_path = max(excel_files, key=os.path.getctime)
+            # Wait until the file has landed and stopped growing
+            print("Waiting for download to complete...")
+            session_path = wait_for_download(session.download_dir, existing_files)
+
+            # Move it out of the session directory, which is wiped when the session is recycled
+            excel_path = os.path.join(DOWNLOAD_FOLDER, os.path.basename(session_path))
+            shutil.move(session_path, excel_path)
             print(f"File downloaded to: {excel_path}")
-        else:
-            raise Exception("Excel file not found in downloads folder")
-    else:
-        raise Exception("Could not find Excel IFSC codes download link on the page")
 
-finally:
-    driver.quit()
-    print("Browser closed.")
+    return excel_path
+
+
+def download_workbook(pool=None):
+    """
+    Download the RBI workbook over plain HTTP, falling back to Selenium
+
+    FETCH_MODE=auto tries HTTP first, FETCH_MODE=http never starts a browser
+    and FETCH_MODE=selenium always does. RBI_HTML_FILE replaces the live
+    page with a saved copy for offline runs.
+    """
+    if FETCH_MODE in ("auto", "http"):
+        try:
+            with timed_phase("http download"):
+                print(f"Fetching RBI IFSC page over HTTP: {RBI_URL}")
+                html = load_html_fixture(RBI_HTML_FILE) if RBI_HTML_FILE else None
+                excel_path, downloaded = fetch_excel_via_http(RBI_URL, DOWNLOAD_FOLDER, html=html)
+            print(f"File {'downloaded to' if downloaded else 'not modified, reusing'}: {excel_path}")
+            return excel_path
+        except (requests.RequestException, LookupError, OSError) as e:
+            if FETCH_MODE == "http":
+                raise
+            print(f"HTTP fast path failed ({e}), falling back to Selenium")
+
+    return download_with_selenium(pool or get_browser_pool())
+
+
+def fetch_and_load_ifsc(pool=None):
+    """
+    Download the RBI IFSC workbook and load it into Postgres
+
+    Importable entry point for schedulers running several scraping jobs:
+    pass a shared BrowserPool so the Selenium fallback reuses a warm session.
+    """
+    excel_path = download_workbook(pool)
+
+    # ---------------- CHANGE DETECTION ----------------
+    # The manifest lives in Postgres next to ifsc_codes so every runner shares it
+    with timed_phase("change detection"):
+        manifest = load_manifest(connection_parameters, table_name)
+        workbook_hash = file_content_hash(excel_path)
+
+    if manifest.get(db_connect.WORKBOOK_ITEM) == workbook_hash:
+        print(f"\nWorkbook unchanged since last load (sha256 {workbook_hash[:12]}), nothing to do.")
+        export_lookup_snapshot(changed=False)
+        return
 
-# ---------------- LOAD ALL SHEETS INTO DATAFRAMES ----------------
-print("\nLoading Excel file...")
+    manifest_updates = {db_connect.WORKBOOK_ITEM: (workbook_hash, None)}
 
-# Read all sheet names
-xl_file = pd.ExcelFile(excel_path)
-sheet_names = xl_file.sheet_names
+    if INGEST_MODE == "stream":
+        # Sheets are never held whole in streaming mode, so only the workbook hash is recorded
+        with timed_phase("stream to postgres"):
+            load_workbook_streaming(excel_path)
+        export_lookup_snapshot()
+        save_manifest(connection_parameters, table_name, manifest_updates)
+        print("Ingest manifest updated.")
+        return
 
-print(f"Found {len(sheet_names)} sheet(s): {sheet_names}")
+    # ---------------- LOAD ALL SHEETS INTO DATAFRAMES ----------------
+    engine = EXCEL_ENGINE or default_engine(excel_path)
+    print(f"\nLoading Excel file (engine: {engine or 'pandas default'})...")
 
-# ---------------- COMBINE ALL SHEETS ----------------
-print("\nCombining all sheets...")
+    sheet_names = list_sheets(excel_path, engine)
+    print(f"Found {len(sheet_names)} sheet(s): {sheet_names}")
 
-all_dataframes = []
+    # ---------------- COMBINE ALL SHEETS ----------------
+    print("\nCombining all sheets...")
 
-for sheet_name in sheet_names:
-    print(f"\nProcessing sheet: '{sheet_name}'")
+    all_dataframes = []
+    parse_start = time.perf_counter()
+
+    # Sheets may be parsed in parallel but arrive here in workbook order
+    for sheet_name, df, error, seconds in iter_workbook_sheets(excel_path, engine, EXCEL_WORKERS):
+        print(f"\nProcessing sheet: '{sheet_name}'")
     
-    try:
-        # Read the sheet
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
-        
-        print(f"Sheet has {len(df)} rows and {len(df.columns)} columns")
+        if error is not None:
+            if LOAD_MODE == "swap":
+                # A swap publishes exactly what was parsed, so a missing sheet would vanish from the table
+                raise RuntimeError(f"Sheet '{sheet_name}' failed to parse ({error}); "
+                                   f"not swapping in a table without it")
+            print(f"Error processing sheet '{sheet_name}': {error}")
+            # Do not mark the workbook as loaded, so the next run retries this sheet
+            manifest_updates.pop(db_connect.WORKBOOK_ITEM, None)
+            continue
+    
+        print(f"Sheet has {len(df)} rows and {len(df.columns)} columns (parsed in {seconds:.2f}s)")
         print(f"Columns: {list(df.columns)}")
-        
+    
+        sheet_hash = dataframe_content_hash(df)
+        manifest_updates[sheet_name] = (sheet_hash, len(df))
+        # A swap replaces the whole table, so it needs every sheet
+        if manifest.get(sheet_name) == sheet_hash and LOAD_MODE != "swap":
+            print("Sheet unchanged since last load, skipping upload")
+            continue
+    
         all_dataframes.append(df)
-        
-    except Exception as e:
-        print(f"Error processing sheet '{sheet_name}': {e}")
-        continue
 
-# Combine all sheets into one dataframe
-if all_dataframes:
-    combined_df = pd.concat(all_dataframes, ignore_index=True)
-    print(f"\n{'='*60}")
-    print(f"Combined dataframe has {len(combined_df)} rows and {len(combined_df.columns)} columns")
-    print(f"Columns: {list(combined_df.columns)}")
-    print("\nFirst 3 rows:")
-    print(combined_df.head(3))
-    print(f"{'='*60}")
-    
-    print("\nUploading to PostgreSQL...")
+    phase_times["parse"] = time.perf_counter() - parse_start
+    print(f"\nParsed workbook in {phase_times['parse']:.2f}s")
+
+    # Combine all sheets into one dataframe
+    if all_dataframes:
+        combined_df = pd.concat(all_dataframes, ignore_index=True)
+        print(f"\n{'='*60}")
+        print(f"Combined dataframe has {len(combined_df)} rows and {len(combined_df.columns)} columns")
+        print(f"Columns: {list(combined_df.columns)}")
+        print("\nFirst 3 rows:")
+        print(combined_df.head(3))
+        print(f"{'='*60}")
     
-    connection_parameters = {
-        "dbname": "automation_db",
-        "user": "postgres",
-        "password": "2606",
-        "host": "localhost",
-        "port": "5432"
-    }
+        print("\nUploading to PostgreSQL...")
     
-    table_name = "ifsc_codes"
-    upload_dataframe_to_postgres(combined_df, table_name, connection_parameters, incremental=True)
+        with timed_phase("upload"):
+            if LOAD_MODE == "swap":
+                db_connect.swap_upload_dataframe(
+                    combined_df,
+                    table_name,
+                    connection_parameters,
+                    key_columns=["IFSC"],
+                    unique_indexes=["IFSC"],
+                    indexes=[("BANK", "IFSC")]
+                )
+            else:
+                upload_dataframe_to_postgres(
+                    combined_df,
+                    table_name,
+                    connection_parameters,
+                    incremental=True,
+                    incremental_strategy="server",
+                    key_columns=["IFSC"],
+                    unique_indexes=["IFSC"],
+                    indexes=[("BANK", "IFSC")],
+                    workers=UPLOAD_WORKERS,
+                    detect_text=DETECT_TEXT_TYPES
+                )
     
-    print(f"\n{'='*60}")
-    print("All sheets combined and uploaded successfully!")
-    print(f"{'='*60}")
-else:
-    print("No data to upload")
+        print(f"\n{'='*60}")
+        print("All sheets combined and uploaded successfully!")
+        print(f"{'='*60}")
+        export_lookup_snapshot()
+    else:
+        print("No changed sheets to upload")
+        export_lookup_snapshot(changed=False)
+
+    # Record hashes only after a successful upload so a failed run is retried
+    save_manifest(connection_parameters, table_name, manifest_updates)
+    print("Ingest manifest updated.")
+
+
+def main():
+    try:
+        fetch_and_load_ifsc()
+    finally:
+        print_phase_times()
+        if _browser_pool is not None:
+            _browser_pool.close()
+
+
+if __name__ == "__main__":
+    if "--rollback" in sys.argv:
+        # Undo the last LOAD_MODE=swap reload
+        db_connect.rollback_table_swap(table_name, connection_parameters)
+        export_lookup_snapshot()
+    else:
+        main()
@@ -0,0 +1,269 @@
+"""
+Memory-mapped, read-only snapshot of ifsc_codes
+
+    export_snapshot(conn_params, "ifsc_codes", "ifsc_codes.snap")    # after each load
+    reader = SnapshotReader("ifsc_codes.snap")
+    row = reader.current().lookup("STATE BANK OF INDIA", "SBIN0000001")  # dict or None
+
+File layout (little-endian):
+
+    header    magic, format, key width, row count and section offsets
+    metadata  JSON: table, columns, data version, export time
+    keys      row count x key width bytes: IFSC, NUL-padded, sorted bytewise
+    offsets   row count + 1 uint64: where each row starts in `rows`
+    rows      one compact JSON object per row, in key order
+
+A lookup binary-searches the fixed-width keys and decodes a single row, so
+nothing is parsed at startup. The file is mapped read-only: every worker
+process mapping it shares the same page-cache pages instead of holding its
+own copy.
+
+export_snapshot() writes a temporary file and renames it over the old one,
+so readers never see a partial file. SnapshotReader notices the new file
+(by inode, size and mtime) and maps it; requests that still hold the old
+Snapshot finish against the old mapping, which is released when the last
+reference goes. On Windows a file cannot be replaced while it is mapped,
+so there the API has to be stopped for the export.
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+
+import psycopg2
+from flask.json.provider import DefaultJSONProvider
+
+MAGIC = b"IFSCSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQ")  # magic, format, key width, rows, meta/keys/offsets/rows offsets, meta length
+OFFSET = struct.Struct("<Q")
+
+VERSION_TABLE = "table_versions"
+
+
+def _align(position, boundary=8):
+    return (position + boundary - 1) // boundary * boundary
+
+
+def write_snapshot(path, columns, rows, key_column="IFSC", metadata=None):
+    """
+    Write rows (tuples in `columns` order) to `path` atomically; returns the row count
+
+    Values are encoded the way api.py's jsonify encodes a database row
+    (Flask's default JSON provider: dates as HTTP dates, Decimal as a
+    string, NaN kept), so snapshot and database lookups return the same
+    response bodies.
+    """
+    key_position = list(columns).index(key_column)
+    encoded = []
+    for row in rows:
+        key = str(row[key_position]).encode()
+        body = json.dumps(dict(zip(columns, row)), separators=(",", ":"),
+                          default=DefaultJSONProvider.default).encode()
+        encoded.append((key, body))
+    encoded.sort(key=lambda item: item[0])  # bytewise, the order lookups compare in
+
+    key_width = max((len(key) for key, _ in encoded), default=1)
+    meta = json.dumps({**(metadata or {}), "columns": list(columns), "key_column": key_column}).encode()
+
+    meta_offset = HEADER.size
+    keys_offset = _align(meta_offset + len(meta))
+    offsets_offset = _align(keys_offset + key_width * len(encoded))
+    rows_offset = offsets_offset + OFFSET.size * (len(encoded) + 1)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, key_width, len(encoded),
+                            meta_offset, keys_offset, offsets_offset, rows_offset, len(meta)))
+        f.write(meta)
+        f.write(b"\0" * (keys_offset - f.tell()))
+        f.write(b"".join(key.ljust(key_width, b"\0") for key, _ in encoded))
+        f.write(b"\0" * (offsets_offset - f.tell()))
+
+        position = 0
+        offsets = bytearray()
+        for _, body in encoded:
+            offsets += OFFSET.pack(position)
+            position += len(body)
+        offsets += OFFSET.pack(position)
+        f.write(offsets)
+        f.write(b"".join(body for _, body in encoded))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return len(encoded)
+
+
+def export_snapshot(conn_params, table_name, path, hidden_columns=(), key_column="IFSC"):
+    """
+    Export `table_name` to a snapshot file at `path`
+
+    Rows and the table's data version are read in one REPEATABLE READ
+    transaction, so the recorded version matches the rows.
+    """
+    start = time.perf_counter()
+    conn = psycopg2.connect(**conn_params)
+    try:
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        with conn.cursor() as cursor:
+            version = 0
+            try:
+                cursor.execute("SAVEPOINT read_version;")
+                cursor.execute(f'SELECT "version" FROM "{VERSION_TABLE}" WHERE "table_name" = %s', (table_name,))
+                row = cursor.fetchone()
+                version = row[0] if row else 0
+            except psycopg2.Error:
+                cursor.execute("ROLLBACK TO SAVEPOINT read_version;")  # no version table yet
+
+            cursor.execute(f'SELECT * FROM "{table_name}"')
+            names = [column.name for column in cursor.description]
+            rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    keep = [i for i, name in enumerate(names) if name not in hidden_columns]
+    columns = [names[i] for i in keep]
+    if len(keep) < len(names):
+        rows = [tuple(row[i] for i in keep) for row in rows]
+
+    count = write_snapshot(path, columns, rows, key_column, {
+        "table": table_name,
+        "version": version,
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+    })
+    print(f"Snapshot of '{table_name}' written to {path}: {count} rows, "
+          f"{os.path.getsize(path) / 1024 / 1024:.1f} MiB, {time.perf_counter() - start:.2f}s")
+    return count
+
+
+class _Keys:
+    """Sequence view of the fixed-width key section, for bisect"""
+
+    def __init__(self, mapped, offset, width, count):
+        self.mapped = mapped
+        self.offset = offset
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * self.width
+        return self.mapped[start:start + self.width]
+
+
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.stat = os.fstat(f.fileno())
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, file_format, self.key_width, self.rows, meta_offset, keys_offset,
+         self._offsets_offset, self._rows_offset, meta_length) = HEADER.unpack_from(self._mapped, 0)
+        if magic != MAGIC or file_format != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} IFSC snapshot")
+
+        self.metadata = json.loads(self._mapped[meta_offset:meta_offset + meta_length])
+        self.version = self.metadata.get("version")
+        self._keys = _Keys(self._mapped, keys_offset, self.key_width, self.rows)
+
+    def __len__(self):
+        return self.rows
+
+    def _row(self, i):
+        start, stop = struct.unpack_from("<QQ", self._mapped, self._offsets_offset + i * OFFSET.size)
+        return json.loads(self._mapped[self._rows_offset + start:self._rows_offset + stop])
+
+    def get(self, key):
+        """Every row stored under `key` (a list, usually of one)"""
+        encoded = key.encode()
+        if len(encoded) > self.key_width:
+            return []
+        padded = encoded.ljust(self.key_width, b"\0")
+
+        i = bisect.bisect_left(self._keys, padded)
+        found = []
+        while i < self.rows and self._keys[i] == padded:
+            found.append(self._row(i))
+            i += 1
+        return found
+
+    def lookup(self, bank_name, ifsc):
+        """Row matching both BANK and IFSC, as the bank-details query does, or None"""
+        for row in self.get(ifsc):
+            if row.get("BANK") == bank_name:
+                return row
+        return None
+
+
+class SnapshotReader:
+    """
+    Current Snapshot of a path that is replaced by export_snapshot()
+
+    The file is re-checked at most every `check_interval` seconds; a changed
+    file is mapped and swapped in. A broken new file is reported and the old
+    mapping keeps serving.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            self._checked = now
+            snapshot = self._snapshot
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                if snapshot is None:
+                    raise
+                return snapshot  # file briefly missing; keep serving the mapped one
+
+            if snapshot is None or (stat.st_ino, stat.st_size, stat.st_mtime_ns) != \
+                    (snapshot.stat.st_ino, snapshot.stat.st_size, snapshot.stat.st_mtime_ns):
+                try:
+                    snapshot = Snapshot(self.path)
+                    print(f"Mapped snapshot {self.path}: {len(snapshot)} rows, version {snapshot.version}")
+                except (OSError, ValueError, struct.error) as e:
+                    if self._snapshot is None:
+                        raise
+                    print(f"Could not map new snapshot {self.path}, keeping the current one: {e}")
+                    return self._snapshot
+                self._snapshot = snapshot
+            return snapshot
+
+
+if __name__ == "__main__":
+    # Lookup cost check: python ifsc_snapshot.py path/to/ifsc_codes.snap
+    import random
+    import sys
+
+    snapshot = Snapshot(sys.argv[1])
+    keys = [bytes(snapshot._keys[i]).rstrip(b"\0").decode() for i in range(0, len(snapshot), max(1, len(snapshot) // 5000))]
+    rows = [snapshot.get(key)[0] for key in keys]
+    pairs = [(row["BANK"], row["IFSC"]) for row in rows]
+    random.Random(0).shuffle(pairs)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for bank_name, ifsc in pairs:
+            assert snapshot.lookup(bank_name, ifsc) is not None
+    elapsed = time.perf_counter() - start
+    print(f"{len(snapshot)} rows, version {snapshot.version}: "
+          f"{elapsed / (20 * len(pairs)) * 1e6:.1f}us per lookup")
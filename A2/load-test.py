@@ -0,0 +1,126 @@
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+# ----------------------------------------
+# LOAD TEST FOR THE BANK DETAILS API
+# ----------------------------------------
+#
+# Compare the Flask dev server with a production WSGI server, e.g.:
+#
+#   python api.py                                   (serves on :5000)
+#   gunicorn --workers 4 --threads 8 -b :8000 wsgi:app
+#   python load-test.py --url http://localhost:5000 --url http://localhost:8000 \
+#       --pairs-file pairs.json --requests 5000 --concurrency 32
+#
+# pairs.json is a JSON list of {"bank_name": ..., "ifsc": ...} objects to
+# request; without it every request uses the --bank-name/--ifsc pair.
+
+
+def get_token(base_url, username, password):
+    response = requests.post(
+        f"{base_url}/api/login",
+        json={"username": username, "password": password},
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load_test(base_url, pairs, total_requests, concurrency, username, password):
+    """Fire `total_requests` bank-details lookups with `concurrency` threads"""
+    token = get_token(base_url, username, password)
+    headers = {"Authorization": f"Bearer {token}"}
+    local = threading.local()
+
+    def one_request(i):
+        # One keep-alive session per worker thread
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        payload = pairs[i % len(pairs)]
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/api/bank-details", json=payload, headers=headers, timeout=30)
+            status = response.status_code
+        except requests.RequestException:
+            status = None
+        return time.perf_counter() - start, status
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_request, range(total_requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "url": base_url,
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(total_requests / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "status_codes": statuses
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test /api/bank-details on one or more servers")
+    parser.add_argument("--url", action="append", required=True, help="Base URL; repeat to compare servers")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--pairs-file", help="JSON list of {bank_name, ifsc} objects")
+    parser.add_argument("--bank-name", default="ABHYUDAYA COOPERATIVE BANK LIMITED")
+    parser.add_argument("--ifsc", default="ABHY0063001")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    args = parser.parse_args()
+
+    if args.pairs_file:
+        with open(args.pairs_file) as f:
+            pairs = json.load(f)
+        random.shuffle(pairs)
+    else:
+        pairs = [{"bank_name": args.bank_name, "ifsc": args.ifsc}]
+
+    reports = []
+    for url in args.url:
+        url = url.rstrip("/")
+        print(f"\nWarming up {url} ...")
+        run_load_test(url, pairs, args.warmup, args.concurrency, args.username, args.password)
+
+        print(f"Running {args.requests} requests at concurrency {args.concurrency} ...")
+        report = run_load_test(url, pairs, args.requests, args.concurrency, args.username, args.password)
+        reports.append(report)
+        print(json.dumps(report, indent=2))
+
+    if len(reports) > 1:
+        baseline = reports[0]
+        print(f"\n{'='*60}")
+        print(f"{'URL':<32}{'req/s':>10}{'p99 ms':>10}{'speedup':>10}")
+        for report in reports:
+            speedup = report["requests_per_second"] / baseline["requests_per_second"]
+            print(f"{report['url']:<32}{report['requests_per_second']:>10}{report['p99_ms']:>10}{speedup:>9.2f}x")
+        print(f"{'='*60}")
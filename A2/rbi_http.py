@@ -0,0 +1,188 @@
+"""
+Browserless download of the RBI IFSC workbook
+
+The RBI page is fetched over plain HTTP with a pooled requests.Session, the
+Excel link is picked with the same rules the Selenium fetcher uses, and the
+file is streamed to disk with a conditional GET (ETag / Last-Modified), so an
+unchanged workbook is not downloaded again.
+
+The page source is pluggable: pass html= (a string) to
+fetch_excel_via_http() or use load_html_fixture() to work offline against a
+saved copy of the page.
+"""
+import os
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Mozilla/5.0"
+CACHE_FILE_NAME = ".http-cache.json"
+
+
+# ----------------------------------------
+# LINK MATCHING (shared with the Selenium fetcher)
+# ----------------------------------------
+
+def select_excel_link(candidates):
+    """
+    Pick the Excel IFSC link from (item, text, href) candidates
+
+    Prefers a link mentioning both "excel" and "ifsc" in its text or href,
+    then falls back to the first link pointing at an .xls/.xlsx file.
+    Text and href are compared case-insensitively.
+    """
+    candidates = [(item, (text or "").lower(), (href or "").lower()) for item, text, href in candidates]
+
+    for item, text, href in candidates:
+        if ("excel" in text or "excel" in href) and ("ifsc" in text or "ifsc" in href):
+            return item
+
+    for item, text, href in candidates:
+        if ".xlsx" in href or ".xls" in href:
+            return item
+
+    return None
+
+
+class AnchorParser(HTMLParser):
+    """Collect (href, text) for every <a> tag"""
+
+    def __init__(self):
+        super().__init__()
+        self.anchors = []
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href") or ""
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.anchors.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+
+def find_excel_link_in_html(html, base_url):
+    """Return (absolute_url, link_text) of the Excel IFSC link in a page, or None"""
+    parser = AnchorParser()
+    parser.feed(html)
+
+    anchors = [(urljoin(base_url, href), text) for href, text in parser.anchors]
+    match = select_excel_link([((url, text), text, url) for url, text in anchors])
+    return match
+
+
+def load_html_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+# ----------------------------------------
+# HTTP DOWNLOAD
+# ----------------------------------------
+
+def create_session(pool_size=4, retries=3):
+    """requests.Session with keep-alive connection pooling and retries"""
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _load_cache(folder):
+    try:
+        with open(os.path.join(folder, CACHE_FILE_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(folder, cache):
+    path = os.path.join(folder, CACHE_FILE_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _filename_from_response(response, url):
+    disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', disposition, re.IGNORECASE)
+    if match:
+        return os.path.basename(unquote(match.group(1)))
+    return os.path.basename(unquote(urlparse(url).path)) or "ifsc.xlsx"
+
+
+def download_file(session, url, folder, timeout=60, chunk_size=1024 * 1024):
+    """
+    Stream `url` into `folder` with a conditional GET
+
+    Returns (path, downloaded). When the server answers 304 Not Modified and
+    the previous copy still exists, that copy is returned with
+    downloaded=False. Files are written to a .part file and renamed into
+    place, so a partial download is never mistaken for a finished one.
+    """
+    cache = _load_cache(folder)
+    entry = cache.get(url, {})
+
+    headers = {}
+    if entry.get("path") and os.path.exists(entry["path"]):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return entry["path"], False
+        response.raise_for_status()
+
+        path = os.path.join(folder, _filename_from_response(response, url))
+        with open(path + ".part", "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+        os.replace(path + ".part", path)
+
+        cache[url] = {
+            "path": path,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        _save_cache(folder, cache)
+
+    return path, True
+
+
+def fetch_excel_via_http(page_url, folder, session=None, html=None, timeout=30):
+    """
+    Find the Excel IFSC link on `page_url` and download it without a browser
+
+    `html` overrides the page source (e.g. a saved fixture). Returns
+    (path, downloaded) or raises LookupError if the page has no matching link,
+    for instance because it is rendered by JavaScript.
+    """
+    session = session or create_session()
+
+    if html is None:
+        response = session.get(page_url, timeout=timeout)
+        response.raise_for_status()
+        html = response.text
+
+    match = find_excel_link_in_html(html, page_url)
+    if match is None:
+        raise LookupError("No Excel IFSC link found in the page HTML")
+
+    excel_url, link_text = match
+    print(f"Found link: {link_text or excel_url}")
+    return download_file(session, excel_url, folder)
@@ -0,0 +1,216 @@
+"""
+Request-level latency metrics for the Bank Details API
+
+    metrics = RequestMetrics(slow_request_ms=500)
+    metrics.install(app)                  # hooks + GET /metrics
+
+    with metrics.phase("query"):          # inside a request
+        cursor.execute(...)
+
+For every endpoint (the matched URL rule, not the raw path) it keeps a
+latency histogram of the whole request and of each named phase
+(db_connect, query, serialize, auth, ...), a counter per status code and a
+gauge of requests in flight. GET /metrics renders them in the Prometheus
+text format. Requests slower than slow_request_ms are printed with their
+phase breakdown.
+
+Recording costs a few perf_counter() calls and one short lock per request.
+Metrics are per process: under gunicorn each worker reports its own.
+"""
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+
+# Upper bounds in seconds, Prometheus-style (cumulative on output)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class _RequestState:
+    __slots__ = ("endpoint", "start", "status", "phases")
+
+    def __init__(self, endpoint, start):
+        self.endpoint = endpoint
+        self.start = start
+        self.status = 500  # kept if after_request never runs (unhandled exception)
+        self.phases = {}
+
+
+class _Phase:
+    """Context manager timing one phase (a class: cheaper than @contextmanager)"""
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.metrics.record_phase(self.name, time.perf_counter() - self.start)
+
+
+class RequestMetrics:
+    def __init__(self, slow_request_ms=0, prefix="ifsc_api"):
+        self.slow_request_ms = slow_request_ms
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._latency = {}    # (endpoint, phase) -> Histogram
+        self._statuses = {}   # (endpoint, status) -> count
+        self._in_flight = {}  # endpoint -> requests currently running
+        self._slow = 0
+
+    # ---------------- recording ----------------
+
+    def record_phase(self, name, seconds):
+        """Add time to a phase of the current request (no-op outside an instrumented request)"""
+        try:
+            phases = g._request_metrics.phases
+        except (AttributeError, RuntimeError):
+            return
+        phases[name] = phases.get(name, 0.0) + seconds
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def _before_request(self):
+        rule = request.url_rule
+        endpoint = rule.rule if rule is not None else "unmatched"
+        g._request_metrics = _RequestState(endpoint, time.perf_counter())
+        with self._lock:
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+
+    def _after_request(self, response):
+        state = g.get("_request_metrics")
+        if state is not None:
+            state.status = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        state = g.pop("_request_metrics", None)
+        if state is None:
+            return
+        elapsed = time.perf_counter() - state.start
+        endpoint = state.endpoint
+        slow = self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms
+
+        with self._lock:
+            self._in_flight[endpoint] -= 1
+            key = (endpoint, state.status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            self._observe(endpoint, "total", elapsed)
+            for name, seconds in state.phases.items():
+                self._observe(endpoint, name, seconds)
+            if slow:
+                self._slow += 1
+
+        if slow:
+            breakdown = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in state.phases.items())
+            print(f"SLOW REQUEST {request.method} {endpoint} -> {state.status} in {elapsed * 1000:.1f}ms"
+                  + (f" ({breakdown})" if breakdown else ""))
+
+    def _observe(self, endpoint, phase, seconds):
+        histogram = self._latency.get((endpoint, phase))
+        if histogram is None:
+            histogram = self._latency[(endpoint, phase)] = Histogram()
+        histogram.observe(seconds)
+
+    def install(self, app, path="/metrics"):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule(path, "metrics", self.metrics_view, methods=["GET"])
+
+    # ---------------- output ----------------
+
+    def metrics_view(self):
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+    def render(self):
+        """Prometheus text exposition format"""
+        name = self.prefix
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {name}_request_seconds Request latency by endpoint and phase")
+            lines.append(f"# TYPE {name}_request_seconds histogram")
+            for (endpoint, phase), histogram in sorted(self._latency.items()):
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_request_seconds_bucket{{{labels},le="{_format_bound(bound)}"}} {count}')
+                lines.append(f"{name}_request_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_request_seconds_count{{{labels}}} {histogram.count}")
+
+            lines.append(f"# HELP {name}_responses_total Responses by endpoint and status code")
+            lines.append(f"# TYPE {name}_responses_total counter")
+            for (endpoint, status), count in sorted(self._statuses.items()):
+                lines.append(f'{name}_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines.append(f"# HELP {name}_requests_in_flight Requests currently being handled")
+            lines.append(f"# TYPE {name}_requests_in_flight gauge")
+            for endpoint, count in sorted(self._in_flight.items()):
+                lines.append(f'{name}_requests_in_flight{{endpoint="{endpoint}"}} {count}')
+
+            lines.append(f"# HELP {name}_slow_requests_total Requests over the slow-request threshold")
+            lines.append(f"# TYPE {name}_slow_requests_total counter")
+            lines.append(f"{name}_slow_requests_total {self._slow}")
+
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    # Overhead check: a trivial route with and without the hooks
+    from flask import Flask
+
+    def build(instrumented):
+        app = Flask(__name__)
+
+        @app.route("/ping")
+        def ping():
+            return "pong"
+
+        if instrumented:
+            metrics = RequestMetrics()
+            metrics.install(app)
+        return app.test_client()
+
+    calls, rounds = 10000, 5
+    clients = {"plain": build(False), "instrumented": build(True)}
+    results = {label: float("inf") for label in clients}
+    for _ in range(rounds):
+        # Alternate the two apps and keep the best round of each to cancel out noise
+        for label, client in clients.items():
+            start = time.perf_counter()
+            for _ in range(calls):
+                client.get("/ping")
+            results[label] = min(results[label], (time.perf_counter() - start) / calls)
+
+    for label, seconds in results.items():
+        print(f"{label:<14}{seconds * 1e6:>8.1f}us per request")
+    print(f"Overhead: {(results['instrumented'] - results['plain']) * 1e6:.1f}us per request")
@@ -0,0 +1,187 @@
+"""
+In-memory search index for the Bank Details API
+
+    index = SearchIndex.from_rows(columns, rows, version)
+    page, next_cursor = index.search(ifsc="SBIN0", state="maharashtra", limit=20)
+    page, next_cursor = index.search(branch="gandi nagar", fuzzy=True, after=next_cursor)
+
+Rows are kept sorted by IFSC, so an IFSC prefix is a contiguous slice and
+keyset pagination is a bisect on the last IFSC returned (`after`). IFSC is
+expected to be unique; should a code repeat, the cursor also counts the
+rows of that code already returned ("IFSC:n"), so none is skipped. Bank,
+branch, state and city values are replaced by integer codes assigned in
+case-insensitive sorted order: a name prefix becomes a range of codes and
+every filter is one vectorized comparison over the code arrays. Fuzzy name
+matching scores distinct names by the share of the query's trigrams they
+contain (close to pg_trgm's word_similarity, so a misspelt part of a name
+still matches) through an inverted trigram index; matching rows are still
+returned in IFSC order, so pages stay stable.
+
+The index is immutable; the API builds a new one after each load and swaps
+the reference.
+"""
+import bisect
+import re
+
+import numpy as np
+
+FUZZY_THRESHOLD = 0.6  # pg_trgm's default word_similarity threshold
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold(value):
+    """Case-insensitive comparison key"""
+    return "" if value is None else str(value).casefold().strip()
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space"""
+    grams = set()
+    for word in _WORD.findall(fold(text)):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameColumn:
+    """Integer codes for one text column, ordered by the folded value"""
+
+    def __init__(self, values, fuzzy=False):
+        folded = [fold(value) for value in values]
+        self.names = sorted(set(folded))
+        lookup = {name: code for code, name in enumerate(self.names)}
+        self.codes = np.fromiter((lookup[name] for name in folded), dtype=np.int32, count=len(folded))
+        self._lookup = lookup
+        self._trigram_index = self._build_trigram_index() if fuzzy else None
+
+    def code(self, value):
+        """Code of an exact (case-insensitive) value, or -1"""
+        return self._lookup.get(fold(value), -1)
+
+    def prefix_range(self, prefix):
+        """[start, stop) of the codes whose name starts with `prefix`"""
+        prefix = fold(prefix)
+        start = bisect.bisect_left(self.names, prefix)
+        stop = bisect.bisect_left(self.names, prefix + "\U0010ffff", start)
+        return start, stop
+
+    def _build_trigram_index(self):
+        postings = {}
+        for code, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings.setdefault(gram, []).append(code)
+        return {gram: np.array(codes, dtype=np.int32) for gram, codes in postings.items()}
+
+    def similar_codes(self, text, threshold=FUZZY_THRESHOLD):
+        """Boolean array over codes: share of `text`'s trigrams found in the name >= threshold"""
+        postings = self._trigram_index
+        if postings is None:
+            raise ValueError("fuzzy matching is not enabled for this column")
+
+        grams = trigrams(text)
+        matched = [postings[gram] for gram in grams if gram in postings]
+        if not matched:
+            return np.zeros(len(self.names), dtype=bool)
+        shared = np.bincount(np.concatenate(matched), minlength=len(self.names))
+        return shared >= threshold * len(grams)
+
+
+class SearchIndex:
+    def __init__(self, columns, rows, version=None):
+        """`rows` are tuples in `columns` order and must be sorted by IFSC"""
+        self.columns = list(columns)
+        self.rows = rows
+        self.version = version
+
+        position = {name: i for i, name in enumerate(self.columns)}
+        self.ifsc = [fold(row[position["IFSC"]]).upper() for row in rows]
+        # Trigram indexes are built here, off the request path (the API builds indexes in the background)
+        self.bank = NameColumn((row[position["BANK"]] for row in rows), fuzzy=True)
+        self.branch = NameColumn((row[position["BRANCH"]] for row in rows), fuzzy=True) if "BRANCH" in position else None
+        self.state = NameColumn(row[position["STATE"]] for row in rows) if "STATE" in position else None
+        self.cities = [NameColumn(row[position[col]] for row in rows) for col in ("CITY1", "CITY2") if col in position]
+
+    @classmethod
+    def from_rows(cls, columns, rows, version=None):
+        """Build from unsorted rows (e.g. SELECT * without ORDER BY)"""
+        ifsc_position = list(columns).index("IFSC")
+        return cls(columns, sorted(rows, key=lambda row: fold(row[ifsc_position]).upper()), version)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _after_position(self, after):
+        """Position of the first row after cursor `after` ("IFSC", or "IFSC:n" past n rows of that code)"""
+        ifsc, _, seen = after.rpartition(":")
+        if not ifsc or not seen.isdigit():
+            return bisect.bisect_right(self.ifsc, fold(after).upper())
+        ifsc = fold(ifsc).upper()
+        return min(bisect.bisect_left(self.ifsc, ifsc) + int(seen), bisect.bisect_right(self.ifsc, ifsc))
+
+    def _cursor(self, position):
+        """Cursor that resumes right after the row at `position`"""
+        ifsc = self.ifsc[position]
+        if position + 1 < len(self.ifsc) and self.ifsc[position + 1] == ifsc:
+            return f"{ifsc}:{position + 1 - bisect.bisect_left(self.ifsc, ifsc)}"
+        return ifsc
+
+    def _name_mask(self, column, text, fuzzy, start, stop):
+        if fuzzy:
+            return column.similar_codes(text)[column.codes[start:stop]]
+        low, high = column.prefix_range(text)
+        codes = column.codes[start:stop]
+        return (codes >= low) & (codes < high)
+
+    def search(self, ifsc=None, bank=None, branch=None, state=None, city=None,
+               fuzzy=False, after=None, limit=20):
+        """
+        Return (rows, next_cursor) for rows matching every given criterion
+
+        ifsc, bank and branch are case-insensitive prefixes (bank and branch
+        are trigram matches when fuzzy=True); state and city are exact
+        case-insensitive matches, city against CITY1 or CITY2. Rows come in
+        IFSC order starting after the cursor `after`; next_cursor is the
+        value to pass as `after` for the next page (the last IFSC returned),
+        or None on the last page.
+        """
+        start, stop = 0, len(self.ifsc)
+        if ifsc:
+            prefix = fold(ifsc).upper()
+            start = bisect.bisect_left(self.ifsc, prefix)
+            stop = bisect.bisect_left(self.ifsc, prefix + "\U0010ffff", start)
+        if after:
+            start = max(start, self._after_position(after))
+        if start >= stop:
+            return [], None
+
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if bank:
+            narrow(self._name_mask(self.bank, bank, fuzzy, start, stop))
+        if branch:
+            if self.branch is None:
+                return [], None
+            narrow(self._name_mask(self.branch, branch, fuzzy, start, stop))
+        if state:
+            if self.state is None:
+                return [], None
+            narrow(self.state.codes[start:stop] == self.state.code(state))
+        if city:
+            in_city = np.zeros(stop - start, dtype=bool)
+            for column in self.cities:
+                in_city |= column.codes[start:stop] == column.code(city)
+            narrow(in_city)
+
+        if mask is None:
+            positions = range(start, min(stop, start + limit + 1))
+        else:
+            positions = (np.flatnonzero(mask)[:limit + 1] + start).tolist()
+
+        page = [self.rows[i] for i in positions[:limit]]
+        next_cursor = self._cursor(positions[limit - 1]) if len(positions) > limit else None
+        return page, next_cursor
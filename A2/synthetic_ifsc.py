@@ -0,0 +1,110 @@
+"""
+Synthetic RBI-shaped IFSC data for benchmarks
+
+make_rbi_frame() builds a DataFrame with the columns of the RBI IFSC
+workbook (BANK, IFSC, BRANCH, ADDRESS, CITY1, CITY2, STATE, STD CODE,
+PHONE); write_rbi_workbook() splits it over several sheets of an .xlsx the
+way the published file is. Output depends only on (rows, seed), so runs on
+different commits see identical data.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+BANKS = [
+    ("SBIN", "STATE BANK OF INDIA"), ("HDFC", "HDFC BANK"), ("ICIC", "ICICI BANK LIMITED"),
+    ("PUNB", "PUNJAB NATIONAL BANK"), ("BARB", "BANK OF BARODA"), ("CNRB", "CANARA BANK"),
+    ("UBIN", "UNION BANK OF INDIA"), ("UTIB", "AXIS BANK"), ("BKID", "BANK OF INDIA"),
+    ("IOBA", "INDIAN OVERSEAS BANK"), ("IDIB", "INDIAN BANK"), ("CBIN", "CENTRAL BANK OF INDIA"),
+    ("KKBK", "KOTAK MAHINDRA BANK LIMITED"), ("YESB", "YES BANK"), ("MAHB", "BANK OF MAHARASHTRA"),
+    ("UCBA", "UCO BANK"), ("PSIB", "PUNJAB AND SIND BANK"), ("IBKL", "IDBI BANK"),
+    ("FDRL", "FEDERAL BANK"), ("KARB", "KARNATAKA BANK LIMITED"), ("ABHY", "ABHYUDAYA COOPERATIVE BANK LIMITED"),
+]
+
+PLACES = [
+    ("MUMBAI", "MUMBAI SUBURBAN", "MAHARASHTRA", "022"), ("PUNE", "PUNE", "MAHARASHTRA", "020"),
+    ("NEW DELHI", "NEW DELHI", "DELHI", "011"), ("CHENNAI", "CHENNAI", "TAMIL NADU", "044"),
+    ("BENGALURU", "BANGALORE URBAN", "KARNATAKA", "080"), ("KOLKATA", "KOLKATA", "WEST BENGAL", "033"),
+    ("HYDERABAD", "HYDERABAD", "TELANGANA", "040"), ("AHMEDABAD", "AHMEDABAD", "GUJARAT", "079"),
+    ("JAIPUR", "JAIPUR", "RAJASTHAN", "0141"), ("LUCKNOW", "LUCKNOW", "UTTAR PRADESH", "0522"),
+    ("PATNA", "PATNA", "BIHAR", "0612"), ("BHOPAL", "BHOPAL", "MADHYA PRADESH", "0755"),
+    ("KOCHI", "ERNAKULAM", "KERALA", "0484"), ("GUWAHATI", "KAMRUP METROPOLITAN", "ASSAM", "0361"),
+]
+
+STREETS = ["MAIN ROAD", "STATION ROAD", "MG ROAD", "MARKET YARD", "CIVIL LINES", "GANDHI NAGAR",
+           "NEHRU CHOWK", "CANTONMENT", "BAZAR PETH", "RING ROAD"]
+
+RBI_COLUMNS = ["BANK", "IFSC", "BRANCH", "ADDRESS", "CITY1", "CITY2", "STATE", "STD CODE", "PHONE"]
+
+ALPHANUMERIC = np.array(list("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+
+def make_rbi_frame(rows, seed=0):
+    """Frame with the RBI workbook's columns; IFSC is unique and sorted by bank"""
+    rng = np.random.default_rng(seed)
+
+    # Large banks have many more branches, as in the real file
+    weights = 1.0 / np.arange(1, len(BANKS) + 1)
+    bank_idx = np.sort(rng.choice(len(BANKS), rows, p=weights / weights.sum()))
+    codes = np.array([code for code, _ in BANKS])[bank_idx]
+    names = np.array([name for _, name in BANKS])[bank_idx]
+
+    # Unique 6-character branch codes: distinct random serials written in base 36
+    value = rng.choice(36 ** 6, rows, replace=False)
+    branch_code = np.empty((rows, 6), dtype="<U1")
+    for position in range(5, -1, -1):
+        branch_code[:, position] = ALPHANUMERIC[value % 36]
+        value //= 36
+    ifsc = pd.Series(codes).str.cat(["0" + "".join(chars) for chars in branch_code])
+
+    place_idx = rng.integers(0, len(PLACES), rows)
+    places = pd.DataFrame(PLACES, columns=["CITY1", "CITY2", "STATE", "STD CODE"]).iloc[place_idx].reset_index(drop=True)
+    street = np.array(STREETS)[rng.integers(0, len(STREETS), rows)]
+    building = rng.integers(1, 999, rows)
+    pin = rng.integers(110001, 855999, rows)
+
+    phone = rng.integers(2_000_000, 9_999_999, rows).astype("float64")
+    phone[rng.random(rows) < 0.15] = np.nan  # many branches publish no phone number
+
+    return pd.DataFrame({
+        "BANK": names,
+        "IFSC": ifsc,
+        "BRANCH": [f"{city} {street_name}" for city, street_name in zip(places["CITY1"], street)],
+        "ADDRESS": [f"{number}, {street_name}, {city}, {state} - {code}"
+                    for number, street_name, city, state, code in
+                    zip(building, street, places["CITY1"], places["STATE"], pin)],
+        "CITY1": places["CITY1"],
+        "CITY2": places["CITY2"],
+        "STATE": places["STATE"],
+        "STD CODE": places["STD CODE"],
+        "PHONE": phone
+    })[RBI_COLUMNS]
+
+
+def write_rbi_workbook(path, rows=170000, sheets=3, seed=0):
+    """Write make_rbi_frame(rows, seed) split over `sheets` sheets; returns the frame"""
+    from openpyxl import Workbook
+
+    df = make_rbi_frame(rows, seed)
+    workbook = Workbook(write_only=True)
+    for number, part in enumerate(np.array_split(np.arange(rows), sheets), start=1):
+        sheet = workbook.create_sheet(f"Sheet{number}")
+        sheet.append(RBI_COLUMNS)
+        frame = df.iloc[part]
+        for row in frame.itertuples(index=False):
+            sheet.append([None if isinstance(value, float) and np.isnan(value) else value for value in row])
+
+    tmp_path = path + ".tmp.xlsx"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return df
+
+
+def cached_rbi_workbook(folder, rows=170000, sheets=3, seed=0):
+    """Path of the synthetic workbook for (rows, sheets, seed), generated once"""
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"rbi_synthetic_{rows}x{sheets}_seed{seed}.xlsx")
+    if not os.path.exists(path):
+        write_rbi_workbook(path, rows, sheets, seed)
+    return path
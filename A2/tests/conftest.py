@@ -0,0 +1,66 @@
+import os
+import sys
+import uuid
+import importlib.util
+
+import psycopg2
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+A2 = os.path.dirname(HERE)
+sys.path.insert(0, A2)
+
+
+def load_script(name, filename):
+    """Import a hyphenated script (e.g. db-connect.py) as a module"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(A2, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def db_connect():
+    return load_script("db_connect", "db-connect.py")
+
+
+@pytest.fixture(scope="session")
+def conn_params():
+    """Connection to the database in DB_* (tests skip when it is unreachable)"""
+    params = {
+        "dbname": os.getenv("DB_NAME", "automation_db"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", "2606"),
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": os.getenv("DB_PORT", "5432")
+    }
+    try:
+        psycopg2.connect(connect_timeout=3, **params).close()
+    except psycopg2.Error as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+    return params
+
+
+@pytest.fixture
+def table_name(conn_params):
+    """A unique table name, dropped (with leftovers sharing its prefix) after the test"""
+    name = f"test_{uuid.uuid4().hex[:8]}"
+    yield name
+
+    conn = psycopg2.connect(**conn_params)
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT tablename FROM pg_tables WHERE tablename LIKE %s", (name + "%",))
+        for (table,) in cursor.fetchall():
+            cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+    conn.commit()
+    conn.close()
+
+
+def fetch_all(conn_params, query, params=None):
+    conn = psycopg2.connect(**conn_params)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    finally:
+        conn.close()
@@ -0,0 +1,69 @@
+import json
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+
+import api
+
+
+@pytest.fixture
+def client():
+    return api.app.test_client()
+
+
+@pytest.fixture
+def headers():
+    token = jwt.encode({"user": "test", "exp": datetime.utcnow() + timedelta(hours=1)},
+                       api.JWT_SECRET_KEY, algorithm=api.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("body", [[{"bank_name": "BANK A", "ifsc": "AAAA0000001"}], "items", 7, None])
+def test_non_object_body_is_rejected(client, headers, body):
+    response = client.post("/api/bank-details/batch", json=body, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json["error"] == "Request body must be JSON with a non-empty 'items' list"
+
+
+def test_stream_reports_failure_after_results(client, headers, monkeypatch):
+    def failing_results(items):
+        yield {"index": 0, "bank_name": items[0][0], "ifsc": items[0][1], "found": False}
+        raise RuntimeError("Database connection failed")
+
+    monkeypatch.setattr(api, "iter_batch_results", failing_results)
+    items = [{"bank_name": "BANK A", "ifsc": f"AAAA000000{i}"} for i in range(2)]
+
+    response = client.post("/api/bank-details/batch", json={"items": items, "stream": True}, headers=headers)
+    document = json.loads(response.get_data(as_text=True))
+
+    assert document["success"] is False
+    assert document["error"] == "Database connection failed"
+    assert len(document["results"]) == 1
+
+
+def test_stream_reports_success_at_the_end(client, headers, monkeypatch):
+    def results(items):
+        for index, (bank_name, ifsc) in enumerate(items):
+            yield {"index": index, "bank_name": bank_name, "ifsc": ifsc, "found": False}
+
+    monkeypatch.setattr(api, "iter_batch_results", results)
+    items = [{"bank_name": "BANK A", "ifsc": f"AAAA000000{i}"} for i in range(3)]
+
+    response = client.post("/api/bank-details/batch", json={"items": items, "stream": True}, headers=headers)
+    document = json.loads(response.get_data(as_text=True))
+
+    assert document["success"] is True
+    assert document["count"] == 3
+    assert "error" not in document
+
+
+@pytest.mark.parametrize("stream", ["false", "true", 1, None])
+def test_stream_flag_must_be_boolean(client, headers, stream):
+    body = {"items": [{"bank_name": "BANK A", "ifsc": "AAAA0000001"}], "stream": stream}
+
+    response = client.post("/api/bank-details/batch", json=body, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json["error"] == "'stream' must be true or false"
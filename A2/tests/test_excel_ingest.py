@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from conftest import fetch_all
+from excel_ingest import available_engines, default_engine, stream_workbook_chunks
+
+
+def write_workbook(path, rows, header=("IFSC", "STD CODE")):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+# Chunks of 3 rows: the blank STD CODE only appears in the second chunk
+ROWS = [("AAAA0000001", 22), ("AAAA0000002", 20), ("AAAA0000003", 11),
+        ("AAAA0000004", 44), ("AAAA0000005", None), ("AAAA0000006", 80)]
+
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_integer_column_with_blanks_in_later_chunk_stays_integer(tmp_path, engine):
+    path = write_workbook(tmp_path / "ifsc.xlsx", ROWS)
+
+    chunks = list(stream_workbook_chunks(path, chunk_size=3, engine=engine))
+
+    assert len(chunks) == 2
+    assert all(isinstance(chunk["STD CODE"].dtype, pd.Int64Dtype) for chunk in chunks)
+    assert chunks[1]["STD CODE"].tolist() == [44, pd.NA, 80]
+
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_incompatible_later_chunk_raises_schema_error(tmp_path, engine):
+    rows = ROWS[:3] + [("AAAA0000004", "n/a"), ("AAAA0000005", 5), ("AAAA0000006", 6)]
+    path = write_workbook(tmp_path / "ifsc.xlsx", rows)
+
+    with pytest.raises(ValueError, match="Sheet 'Sheet1': Column 'STD CODE'"):
+        list(stream_workbook_chunks(path, chunk_size=3, engine=engine))
+
+
+# Whole numbers in the first chunk only: the column is float in pd.read_excel
+RATES = [("AAAA0000001", 1), ("AAAA0000002", 2), ("AAAA0000003", 3),
+         ("AAAA0000004", 2.5), ("AAAA0000005", 4), ("AAAA0000006", None)]
+
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_fractions_in_later_chunk_widen_to_float(tmp_path, engine):
+    path = write_workbook(tmp_path / "ifsc.xlsx", RATES, header=("IFSC", "RATE"))
+
+    chunks = list(stream_workbook_chunks(path, chunk_size=3, engine=engine))
+
+    assert chunks[1]["RATE"].dtype == "float64"
+    assert chunks[1]["RATE"].tolist()[:2] == [2.5, 4.0]
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_streamed_load_widens_columns_created_from_first_chunk(tmp_path, db_connect, conn_params,
+                                                               table_name, incremental):
+    rows = [(ifsc, rate, 2345678) for ifsc, rate in RATES[:-1]] + [("AAAA0000006", 5, 9876543210)]
+    path = write_workbook(tmp_path / "ifsc.xlsx", rows, header=("IFSC", "RATE", "PHONE"))
+
+    db_connect.upload_chunks_to_postgres(stream_workbook_chunks(path, chunk_size=3), table_name,
+                                         conn_params, incremental=incremental, key_columns=["IFSC"])
+
+    types = dict(fetch_all(conn_params, """
+        SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s
+    """, (table_name,)))
+    assert types["RATE"] == "double precision"
+    assert types["PHONE"] == "bigint"
+    assert fetch_all(conn_params, f'SELECT "RATE", "PHONE" FROM "{table_name}" WHERE "IFSC" = %s',
+                     ("AAAA0000006",)) == [(5.0, 9876543210)]
+
+
+def test_frame_load_into_table_created_by_stream(tmp_path, db_connect, conn_params, table_name):
+    path = write_workbook(tmp_path / "ifsc.xlsx", ROWS[:3])
+    db_connect.upload_chunks_to_postgres(stream_workbook_chunks(path, chunk_size=3), table_name,
+                                         conn_params, key_columns=["IFSC"])
+
+    # Blanks make pandas read STD CODE as float; the table column is BIGINT
+    frame = pd.DataFrame({"IFSC": ["AAAA0000004", "AAAA0000005"], "STD CODE": [44.0, None]})
+    db_connect.upload_dataframe_to_postgres(frame, table_name, conn_params, incremental_strategy="server",
+                                            key_columns=["IFSC"])
+
+    assert fetch_all(conn_params, f'SELECT "STD CODE" FROM "{table_name}" ORDER BY "IFSC"') == \
+        [(22,), (20,), (11,), (44,), (None,)]
+
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_streamed_load_with_blanks_in_later_chunk(tmp_path, engine, db_connect, conn_params, table_name):
+    path = write_workbook(tmp_path / "ifsc.xlsx", ROWS)
+
+    received = db_connect.upload_chunks_to_postgres(
+        stream_workbook_chunks(path, chunk_size=3, engine=engine), table_name, conn_params, incremental=False
+    )
+
+    assert received == 6
+    column_type = fetch_all(conn_params, """
+        SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = 'STD CODE'
+    """, (table_name,))
+    assert column_type[0][0] in ("integer", "bigint")
+    rows = fetch_all(conn_params, f'SELECT "IFSC", "STD CODE" FROM "{table_name}" ORDER BY "IFSC"')
+    assert rows == [(ifsc, code) for ifsc, code in ROWS]
+
+
+@pytest.mark.parametrize("name", ["IFSC.xls", "IFSC.ods", "IFSC.xlsb"])
+def test_non_xlsx_files_are_left_to_pandas(name):
+    # pandas picks the engine by extension, e.g. xlrd for .xls
+    assert default_engine(name) is None
+
+
+def test_xlsx_files_get_the_fastest_engine():
+    assert default_engine("IFSC.XLSX") == (available_engines() or [None])[0]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import fetch_all
+
+
+def ifsc_frame():
+    return pd.DataFrame({
+        "BANK": ["BANK A", "BANK A", "BANK B"],
+        "IFSC": ["AAAA0000001", "AAAA0000002", "BBBB0000001"],
+        "BRANCH": ["PUNE", None, "MUMBAI"],
+        "STD CODE": [20, 22, 11],
+        "PHONE": [2345678.0, np.nan, 8765432.0]
+    })
+
+
+@pytest.fixture
+def table_loaded_before_fingerprints(db_connect, conn_params, table_name):
+    """A table filled by a plain load, i.e. without the fingerprint column"""
+    db_connect.upload_dataframe_to_postgres(ifsc_frame(), table_name, conn_params, incremental=False)
+    return table_name
+
+
+def row_count(conn_params, table_name):
+    return fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}"')[0][0]
+
+
+def test_first_run_without_key_inserts_nothing(db_connect, conn_params, table_loaded_before_fingerprints):
+    table_name = table_loaded_before_fingerprints
+
+    db_connect.upload_dataframe_to_postgres(ifsc_frame(), table_name, conn_params,
+                                            incremental_strategy="fingerprint")
+
+    assert row_count(conn_params, table_name) == 3
+    nulls = fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}" WHERE "_row_hash" IS NULL')
+    assert nulls[0][0] == 0
+
+
+def test_existing_rows_are_not_reported_as_changed(db_connect, conn_params, table_loaded_before_fingerprints, capsys):
+    table_name = table_loaded_before_fingerprints
+    df = ifsc_frame()
+    df.loc[2, "BRANCH"] = "MUMBAI FORT"  # the only real change
+
+    for _ in range(2):
+        db_connect.upload_dataframe_to_postgres(df, table_name, conn_params, incremental_strategy="fingerprint",
+                                                key_columns=["IFSC"], update_changed=True)
+
+    output = capsys.readouterr().out
+    assert "Updated 1 changed rows" in output
+    assert output.count("changed rows") == 1  # the second run finds nothing to do
+    assert row_count(conn_params, table_name) == 3
+    assert fetch_all(conn_params, f'SELECT "BRANCH" FROM "{table_name}" WHERE "IFSC" = %s',
+                     ("BBBB0000001",)) == [("MUMBAI FORT",)]
+
+
+def test_unchanged_float_keys_are_recognized(db_connect, conn_params, table_name, capsys):
+    frame = pd.DataFrame({"ID": [1.0, 2.0, np.nan], "NAME": ["A", "B", "C"]})
+
+    for _ in range(2):
+        db_connect.upload_dataframe_to_postgres(frame, table_name, conn_params, incremental_strategy="fingerprint",
+                                                key_columns=["ID", "NAME"], update_changed=True,
+                                                delete_missing=True)
+
+    output = capsys.readouterr().out
+    assert "Deleted" not in output
+    assert "changed rows" not in output
+    assert row_count(conn_params, table_name) == 3
+
+
+def test_new_row_with_null_in_key_is_inserted(db_connect, conn_params, table_name, capsys):
+    first = pd.DataFrame({"ID": ["X1", "X2"], "NAME": [None, "B"]}, dtype=object)
+    second = pd.DataFrame({"ID": ["X1", "X2", "X3"], "NAME": [None, "B", None]}, dtype=object)
+
+    for frame in (first, second):
+        db_connect.upload_dataframe_to_postgres(frame, table_name, conn_params, incremental_strategy="fingerprint",
+                                                key_columns=["ID", "NAME"], update_changed=True)
+
+    assert "changed rows" not in capsys.readouterr().out
+    assert row_count(conn_params, table_name) == 3
+
+
+def test_backfilled_mixed_text_column_matches_batch(db_connect, conn_params, table_name, capsys):
+    df = pd.DataFrame({"IFSC": ["AAAA0000001", "AAAA0000002", "AAAA0000003"],
+                       "NOTE": [5, "closed", np.nan]}, dtype=object)
+    db_connect.upload_dataframe_to_postgres(df, table_name, conn_params, incremental=False)
+
+    db_connect.upload_dataframe_to_postgres(df, table_name, conn_params, incremental_strategy="fingerprint",
+                                            key_columns=["IFSC"], update_changed=True)
+
+    output = capsys.readouterr().out
+    assert "changed rows" not in output
+    assert "Inserting" not in output
+    assert row_count(conn_params, table_name) == 3
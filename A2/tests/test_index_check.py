@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+
+def test_non_text_index_columns_are_verified(db_connect, conn_params, table_name):
+    df = pd.DataFrame({
+        "IFSC": ["AAAA0000001", "AAAA0000002"],
+        "STD CODE": [22, 20],
+        "OPENED": pd.to_datetime(["2024-01-05", "2023-12-31"])
+    })
+
+    db_connect.upload_dataframe_to_postgres(df, table_name, conn_params, incremental=False,
+                                            unique_indexes=["IFSC"], indexes=[("STD CODE", "OPENED")])
+
+
+def test_missing_index_on_integer_column_is_reported(db_connect, conn_params, table_name):
+    df = pd.DataFrame({"IFSC": ["AAAA0000001"], "STD CODE": [22]})
+    db_connect.upload_dataframe_to_postgres(df, table_name, conn_params, incremental=False)
+
+    conn = db_connect.psycopg2.connect(**conn_params)
+    try:
+        with conn.cursor() as cursor, pytest.raises(RuntimeError, match="sequential scan"):
+            db_connect.verify_index_scan(cursor, table_name, "STD CODE")
+    finally:
+        conn.close()
@@ -0,0 +1,35 @@
+import pandas as pd
+import psycopg2
+import pytest
+
+from conftest import fetch_all
+
+
+def stage_tables(conn_params, table_name):
+    return fetch_all(conn_params, "SELECT tablename FROM pg_tables WHERE tablename LIKE %s",
+                     (f"{table_name}_pstage_%",))
+
+
+def test_failed_publish_drops_the_stage(db_connect, conn_params, table_name):
+    # Duplicate IFSCs make the unique index fail after the stage was dropped in the publish transaction
+    df = pd.DataFrame({
+        "BANK": ["BANK A"] * 4,
+        "IFSC": ["AAAA0000001", "AAAA0000001", "AAAA0000002", "AAAA0000003"]
+    })
+
+    with pytest.raises(psycopg2.errors.UniqueViolation):
+        db_connect.upload_dataframe_parallel(df, table_name, conn_params, workers=2, incremental=False,
+                                             unique_indexes=["IFSC"])
+
+    assert stage_tables(conn_params, table_name) == []
+    assert fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}"') == [(0,)]
+
+
+def test_parallel_upload_publishes_all_rows(db_connect, conn_params, table_name):
+    df = pd.DataFrame({"BANK": ["BANK A"] * 10, "IFSC": [f"AAAA{i:07d}" for i in range(10)]})
+
+    published = db_connect.upload_dataframe_parallel(df, table_name, conn_params, workers=3,
+                                                     unique_indexes=["IFSC"])
+
+    assert published == 10
+    assert stage_tables(conn_params, table_name) == []
@@ -0,0 +1,33 @@
+from search_index import SearchIndex
+
+COLUMNS = ["BANK", "IFSC", "BRANCH"]
+
+
+def page_through(index, limit, **criteria):
+    rows, after = [], None
+    while True:
+        page, after = index.search(after=after, limit=limit, **criteria)
+        rows.extend(page)
+        if after is None:
+            return rows
+
+
+def test_pages_do_not_skip_rows_sharing_an_ifsc():
+    rows = [("BANK A", "AAAA0000001", "PUNE")] + \
+           [("BANK A", "AAAA0000002", f"BRANCH {i}") for i in range(5)] + \
+           [("BANK A", "AAAA0000003", "MUMBAI")]
+    index = SearchIndex.from_rows(COLUMNS, rows)
+
+    for limit in (1, 2, 3):
+        assert sorted(page_through(index, limit)) == sorted(rows)
+        assert sorted(page_through(index, limit, ifsc="AAAA0000002")) == sorted(rows[1:6])
+
+
+def test_cursor_of_unique_codes_is_the_ifsc():
+    rows = [("BANK A", f"AAAA000000{i}", "PUNE") for i in range(4)]
+    index = SearchIndex.from_rows(COLUMNS, rows)
+
+    page, after = index.search(limit=2)
+
+    assert after == "AAAA0000001"
+    assert index.search(after=after, limit=2)[0] == rows[2:]
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+
+import api
+from ifsc_snapshot import SnapshotReader, export_snapshot
+
+
+@pytest.fixture
+def lookup_table(db_connect, conn_params, table_name):
+    conn = db_connect.psycopg2.connect(**conn_params)
+    with conn, conn.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE "{table_name}" ("BANK" TEXT, "IFSC" TEXT, "OPENED" TIMESTAMP, "SINCE" DATE,
+                                         "FEE" NUMERIC(10, 2), "RATE" DOUBLE PRECISION,
+                                         "STD CODE" INTEGER, "NOTE" TEXT);
+            INSERT INTO "{table_name}" VALUES
+                ('BANK A', 'AAAA0000001', '2024-01-05 10:30:00', '2020-02-29', 12.50, 'NaN', 22, NULL),
+                ('BANK A', 'AAAA0000002', NULL, NULL, NULL, 1.25, NULL, 'Ünïcode');
+        """)
+    conn.close()
+    return table_name
+
+
+def lookup(client, headers, ifsc):
+    response = client.post("/api/bank-details", json={"bank_name": "BANK A", "ifsc": ifsc}, headers=headers)
+    return response.status_code, response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize("ifsc", ["AAAA0000001", "AAAA0000002", "AAAA0000009"])
+def test_snapshot_and_database_responses_match(conn_params, lookup_table, tmp_path, monkeypatch, ifsc):
+    path = str(tmp_path / "lookup.snap")
+    export_snapshot(conn_params, lookup_table, path)
+    monkeypatch.setattr(api, "TABLE_NAME", lookup_table)
+    monkeypatch.setattr(api, "snapshot_reader", SnapshotReader(path))
+    api.ifsc_cache.clear()
+
+    client = api.app.test_client()
+    token = jwt.encode({"user": "test", "exp": datetime.utcnow() + timedelta(hours=1)},
+                       api.JWT_SECRET_KEY, algorithm=api.JWT_ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    monkeypatch.setattr(api, "LOOKUP_MODE", "db")
+    from_database = lookup(client, headers, ifsc)
+    monkeypatch.setattr(api, "LOOKUP_MODE", "snapshot")
+    from_snapshot = lookup(client, headers, ifsc)
+
+    assert from_snapshot == from_database
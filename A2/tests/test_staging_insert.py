@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from conftest import fetch_all
+
+
+def duplicated_frame(rows=3000, keys=50):
+    """Every key repeated; BRANCH records which copy it is, in frame order"""
+    return pd.DataFrame({
+        "BANK": ["BANK A"] * rows,
+        "IFSC": [f"AAAA{i % keys:07d}" for i in range(rows)],
+        "BRANCH": [f"COPY {i // keys}" for i in range(rows)]
+    })
+
+
+def branches(conn_params, table_name):
+    return {row[0] for row in fetch_all(conn_params, f'SELECT DISTINCT "BRANCH" FROM "{table_name}"')}
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_first_row_per_key_wins(db_connect, conn_params, table_name, workers):
+    db_connect.upload_dataframe_to_postgres(duplicated_frame(), table_name, conn_params,
+                                            incremental_strategy="server", key_columns=["IFSC"],
+                                            workers=workers)
+
+    assert fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}"') == [(50,)]
+    assert branches(conn_params, table_name) == {"COPY 0"}
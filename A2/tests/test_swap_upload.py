@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from conftest import fetch_all
+
+
+def frame(codes):
+    return pd.DataFrame({"BANK": ["BANK A"] * len(codes), "IFSC": codes})
+
+
+def test_duplicates_across_chunks_match_source_count(db_connect, conn_params, table_name):
+    chunks = [frame(["AAAA0000001", "AAAA0000002"]), frame(["AAAA0000002", "AAAA0000003", None])]
+
+    published = db_connect.swap_upload_chunks(iter(chunks), table_name, conn_params,
+                                              key_columns=["IFSC"], keep_previous=False)
+
+    assert published == 4  # three distinct keys plus the NULL key, which is never a duplicate
+    assert fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}"') == [(4,)]
+
+
+def test_shadow_short_of_source_is_not_published(db_connect, conn_params, table_name):
+    db_connect.swap_upload_dataframe(frame(["AAAA0000001", "AAAA0000002"]), table_name, conn_params,
+                                     keep_previous=False)
+    source = frame(["BBBB0000001", "BBBB0000002", "BBBB0000003"])
+
+    def load_shadow(cursor, shadow_name):
+        # Loses the last row on the way in, but reports what the source had
+        schema = db_connect.infer_schema(source)
+        db_connect.create_table_from_df(cursor, shadow_name, source, schema)
+        db_connect.copy_dataframe(cursor, shadow_name, source.iloc[:-1], schema=schema)
+        return len(source)
+
+    with pytest.raises(RuntimeError, match="has 2 rows, expected 3"):
+        db_connect.build_and_swap(table_name, conn_params, load_shadow, keep_previous=False)
+
+    assert fetch_all(conn_params, f'SELECT "IFSC" FROM "{table_name}" ORDER BY 1') == \
+        [("AAAA0000001",), ("AAAA0000002",)]
@@ -0,0 +1,56 @@
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import fetch_all
+
+
+@pytest.mark.parametrize("values", [["1.2.3", "4.5.6"], ["1/2", "3/4"], ["10-12", "3-7"]])
+def test_versions_fractions_and_ranges_stay_text(db_connect, values):
+    column = db_connect.infer_column_schema(pd.Series(values * 10, name="X"), detect_text=True)
+
+    assert column.pg_type == "TEXT"
+
+
+@pytest.mark.parametrize("values", [["2024-01-05", "2023-12-31"], ["05/01/2024", "31/12/2023"]])
+def test_real_dates_become_timestamps(db_connect, values):
+    column = db_connect.infer_column_schema(pd.Series(values * 10, name="X"), detect_text=True)
+
+    assert column.pg_type == "TIMESTAMP"
+
+
+def test_dict_outside_the_type_sample_is_written_as_json(db_connect):
+    df = pd.DataFrame({"X": ["a", "b", "c", "d", "e", {"k": 1}]})
+
+    schema = db_connect.infer_schema(df, sample_size=2)
+    buffer = db_connect.build_column_buffer(df, schema)
+
+    assert schema[0].pg_type == "TEXT"
+    assert buffer.records()[-1] == (json.dumps({"k": 1}),)
+
+
+def detected_frame():
+    return pd.DataFrame({
+        "IFSC": ["AAAA0000001", "AAAA0000002"],
+        "STD CODE": ["22", "20"],
+        "MICR": ["040002001", "040002002"],
+        "OPENED": ["2024-01-05", "2023-12-31"]
+    })
+
+
+@pytest.mark.parametrize("strategy", ["client", "server", "fingerprint"])
+def test_upload_with_text_detection(db_connect, conn_params, table_name, strategy):
+    for _ in range(2):
+        db_connect.upload_dataframe_to_postgres(detected_frame(), table_name, conn_params,
+                                                incremental_strategy=strategy, key_columns=["IFSC"],
+                                                detect_text=True)
+
+    types = dict(fetch_all(conn_params, """
+        SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s
+    """, (table_name,)))
+    assert types["IFSC"] == "character varying"
+    assert types["STD CODE"] == "integer"
+    assert types["MICR"] == "text"  # zero-padded codes stay text
+    assert types["OPENED"] == "timestamp without time zone"
+    assert fetch_all(conn_params, f'SELECT count(*) FROM "{table_name}"') == [(2,)]
@@ -0,0 +1,68 @@
+"""
+Production WSGI entry point for the Bank Details API
+
+The Flask development server started by `python api.py` handles one request
+at a time. For production, serve the same `app` object with a multi-worker
+WSGI server instead; endpoints and JSON responses are unchanged.
+
+Linux / macOS (gunicorn, N processes x M threads):
+    gunicorn --workers 4 --threads 8 --bind 0.0.0.0:8000 wsgi:app
+
+Windows (waitress, one process with M threads):
+    waitress-serve --threads 16 --listen 0.0.0.0:8000 wsgi:app
+    or: python wsgi.py
+
+Each worker process creates its own connection pool lazily on first use.
+Size DB_POOL_MAX so that workers x DB_POOL_MAX stays below Postgres'
+max_connections, and give each worker at least as many pool slots as threads.
+
+With gunicorn --preload this module is imported once in the master and the
+workers are forked from it. The connections opened by the startup checks
+below are closed again before the module finishes importing, so no worker
+inherits a database socket; each opens its own pool on first use. The search
+index built at startup is shared copy-on-write until the next reload, after
+which each worker builds its own. Without --preload every worker runs the
+startup checks itself.
+
+On import the lookup query plan is checked with EXPLAIN, and startup fails if
+ifsc_codes has no index covering (BANK, IFSC). With LOOKUP_MODE=snapshot the
+plan check is skipped and the snapshot file is mapped instead: it is mapped
+read-only, so all workers share its pages in the OS page cache, and a new
+export is picked up without a restart. The in-memory index behind
+/api/search is built at the same time, so the first search does not wait
+for it.
+"""
+import os
+
+from api import app, db_pool, DB_POOL_MAX, LOOKUP_MODE, verify_lookup_plan, get_search_index, snapshot_reader
+
+if LOOKUP_MODE == "snapshot":
+    snapshot_reader.current()  # fail at startup if the snapshot is missing or invalid
+else:
+    verify_lookup_plan()
+
+try:
+    get_search_index()
+except Exception as e:
+    print(f"Search index not built at startup (built on first search): {e}")
+finally:
+    # Never hand pooled connections to forked workers (gunicorn --preload)
+    db_pool.close()
+
+application = app  # some servers look for "application" by default
+
+
+if __name__ == '__main__':
+    host = os.getenv("API_HOST", "0.0.0.0")
+    port = int(os.getenv("API_PORT", "8000"))
+    threads = int(os.getenv("API_THREADS", str(DB_POOL_MAX)))
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress is not installed. Install it with: pip install waitress")
+        print("or run: gunicorn --workers 4 --threads 8 --bind 0.0.0.0:8000 wsgi:app")
+        raise SystemExit(1)
+
+    print(f"Starting Bank Details API (waitress, {threads} threads) on http://{host}:{port}")
+    serve(app, host=host, port=port, threads=threads)